@@ -1,5 +1,5 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Request
+from fastapi.responses import FileResponse, StreamingResponse, Response
 from models.schemas import (
     EvaluateTopicalRequest,
     LiveStartRequest, LiveStartResponse,
@@ -11,12 +11,16 @@ from models.schemas import (
     CompanionEndRequest, CompanionEndResponse,
 )
 import os
+import json
+import asyncio
 import httpx
 import tempfile
 import logging
 from pathlib import Path
+from config.settings import Settings
 
 router = APIRouter()
+settings = Settings()
 logger = logging.getLogger(__name__)
 
 REPORTS_DIR = Path(__file__).parent.parent / "reports" / "generated"
@@ -33,6 +37,12 @@ def _save_pdf(pdf_bytes_io, pdf_filename: str) -> None:
         logger.warning(f"Failed to save PDF {pdf_filename}: {e}")
 
 
+def _level_metrics(results: dict) -> dict:
+    """Word counts per CEFR level, reported only when a CEFR lexicon is installed."""
+    levels = results.get("vocabulary_levels")
+    return {"vocabulary_levels": levels} if levels is not None else {}
+
+
 @router.get("/report/{filename}")
 async def download_report(filename: str):
     path = REPORTS_DIR / filename
@@ -44,6 +54,57 @@ async def download_report(filename: str):
         filename=filename,
     )
 
+def _byte_range(range_header: str | None, total: int) -> tuple[int, int] | None:
+    """(start, end) inclusive for a single `bytes=` range, or None when the header should be ignored.
+
+    Per RFC 9110, a missing, multi-range or malformed header (including end < start) means the
+    full body is sent. The range returned is unsatisfiable when start >= total (e.g. `bytes=-0`).
+    """
+    if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+        return None
+    start_s, sep, end_s = range_header[len("bytes="):].strip().partition("-")
+    if not sep or not (start_s or end_s) or not all(part.isdigit() for part in (start_s, end_s) if part):
+        return None
+    if not start_s:
+        # Suffix range: the last N bytes, all of them if N exceeds the size
+        return max(0, total - int(end_s)), total - 1
+    start = int(start_s)
+    if end_s and int(end_s) < start:
+        return None
+    return start, min(int(end_s), total - 1) if end_s else total - 1
+
+
+@router.get("/evaluation/{evaluation_id}/words/{word_index}/clip")
+async def get_word_clip(evaluation_id: str, word_index: int, request: Request):
+    """Replay one word of an evaluated recording as WAV, sliced from the stored session audio.
+
+    Supports ETag/If-None-Match and single `bytes=` ranges; other Range headers get the full clip.
+    """
+    from services.clip_store import get_word_clip as _get_word_clip
+
+    clip = _get_word_clip(evaluation_id, word_index)
+    if clip is None:
+        raise HTTPException(status_code=404, detail="Clip not found or expired.")
+    wav_bytes, etag = clip
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": f"private, max-age={settings.CLIP_STORE_TTL_SECONDS}",
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    total = len(wav_bytes)
+    byte_range = _byte_range(request.headers.get("range"), total)
+    if byte_range is not None:
+        start, end = byte_range
+        if start >= total:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{total}"})
+        headers["Content-Range"] = f"bytes {start}-{end}/{total}"
+        return Response(content=wav_bytes[start:end + 1], status_code=206, media_type="audio/wav", headers=headers)
+
+    return Response(content=wav_bytes, media_type="audio/wav", headers=headers)
+
 async def _cleanup_audio_file(path: str):
     try:
         if os.path.exists(path):
@@ -52,84 +113,196 @@ async def _cleanup_audio_file(path: str):
     except Exception as e:
         logger.warning(f"Failed to delete temporary file {path}: {e}")
 
+
+async def _download_audio(audio_url: str) -> tuple[str, bytes]:
+    """Download a user's audio to a temp file. Returns (tmp_path, audio_bytes)."""
+    # Preserve the original extension so PyAV detects the container format correctly
+    audio_url_path = audio_url.split("?")[0]
+    ext = os.path.splitext(audio_url_path)[-1] or ".m4a"
+    async with httpx.AsyncClient() as client:
+        try:
+            response = await client.get(audio_url, timeout=30.0)
+        except httpx.RequestError as e:
+            raise HTTPException(status_code=400, detail=f"Network error while downloading audio: {str(e)}")
+    if response.status_code != 200:
+        raise HTTPException(status_code=400, detail=f"Failed to download audio. Status: {response.status_code}")
+    audio_bytes = response.content
+    with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
+        tmp.write(audio_bytes)
+    return tmp.name, audio_bytes
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _stream_turn(session_id: str, session: dict, tmp_audio_path: str, audio_bytes: bytes, stream_reply):
+    """Stream partial transcripts as SSE, then the reply sentence by sentence as Gemini writes it.
+
+    `stream_reply(context)` yields reply chunks; the assembled reply is recorded on the session
+    once it is complete.
+    """
+    from services.audio_utils import decode_audio_pcm, transcribe_audio_stream
+    from services.session_store import add_turn
+    from pipelines.turn_features import schedule_turn_features
+
+    segments = []
+    try:
+        pcm = await asyncio.get_running_loop().run_in_executor(None, decode_audio_pcm, tmp_audio_path)
+        async for seg in transcribe_audio_stream(pcm, audio_bytes):
+            segments.append(seg)
+            transcript = " ".join(getattr(s, "text", "") for s in segments).strip()
+            yield _sse("transcript", {"text": seg.text.strip(), "transcript": transcript})
+
+        if not segments:
+            yield _sse("error", {"detail": "No speech detected in audio."})
+            return
+
+        user_text = " ".join(getattr(seg, "text", "") for seg in segments).strip()
+        turn_segments = add_turn(session_id, role="user", text=user_text, segments=segments, pcm=pcm)
+        schedule_turn_features(session, turn_segments)
+
+        reply_parts = []
+        async for chunk in stream_reply(session["context"]):
+            reply_parts.append(chunk)
+            yield _sse("reply_chunk", {"text": chunk, "index": len(reply_parts) - 1})
+        reply = " ".join(reply_parts)
+        add_turn(session_id, role="system", text=reply)
+
+        logger.info(f"Streamed turn {session['turn_number']} for session {session_id}")
+        yield _sse("reply", {
+            "system_message": reply,
+            "user_transcript": user_text,
+            "turn_number": session["turn_number"],
+        })
+    except Exception as e:
+        logger.error(f"Error in streamed turn: {e}", exc_info=True)
+        yield _sse("error", {"detail": "An unexpected error occurred."})
+
+class _TurnStreamResponse(StreamingResponse):
+    """SSE response for a streamed turn that deletes the turn's temp upload however it ends.
+
+    The generator's own cleanup would never run if the client disconnected before the body
+    started, and Starlette skips background tasks on a disconnect.
+    """
+
+    def __init__(self, content, tmp_audio_path: str):
+        super().__init__(content, media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+        self.tmp_audio_path = tmp_audio_path
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await _cleanup_audio_file(self.tmp_audio_path)
+
+async def _restore_clip_audio(response_data: dict, tmp_audio_path: str):
+    """Re-register a cached evaluation's audio when the clip store no longer has it.
+
+    The clip store is in memory with its own TTL and size cap, while cached responses can
+    outlive it (or a restart); without this their clip URLs would 404.
+    """
+    from services.clip_store import has_evaluation, save_evaluation_audio
+    from services.audio_utils import decode_audio_pcm
+    evaluation_id = response_data.get("evaluation_id")
+    if not evaluation_id or has_evaluation(evaluation_id):
+        return
+    loop = asyncio.get_running_loop()
+    pcm = await loop.run_in_executor(None, decode_audio_pcm, tmp_audio_path)
+    await loop.run_in_executor(None, lambda: save_evaluation_audio(pcm, response_data.get("_clip_spans", []), evaluation_id=evaluation_id))
+    logger.info(f"Re-registered clip audio for cached evaluation {evaluation_id}")
+
+async def _evaluate_topical(name: str, tmp_audio_path: str, audio_bytes: bytes) -> dict:
+    from services.audio_utils import decode_audio_pcm, transcribe_audio_cached
+
+    # Decode once; Whisper, pause analysis and pronunciation all share this array
+    pcm = await asyncio.get_running_loop().run_in_executor(None, decode_audio_pcm, tmp_audio_path)
+
+    # Transcribe audio
+    logger.info("Starting transcription...")
+    segments = await transcribe_audio_cached(pcm, audio_bytes)
+    if not segments:
+        logger.warning("No speech detected in audio.")
+        raise HTTPException(status_code=400, detail="No speech detected in audio")
+    logger.info("Transcription completed.")
+
+    duration_seconds = segments[-1].end if segments else 0
+
+    # Run pipeline
+    logger.info("Running evaluation pipeline...")
+    from pipelines.topical_speech import topical_speech_pipeline
+    results = await topical_speech_pipeline(
+        name=name,
+        pcm=pcm,
+        segments=segments,
+        duration_seconds=duration_seconds
+    )
+
+    # Save PDF to disk so it can be downloaded via /report/{filename}
+    _save_pdf(results.get("pdf_bytes_io"), results.get("pdf_filename"))
+
+    # Format response contract
+    response_data = {
+        "scores": {
+            "overall": results["overall_score"],
+            "grammar": results["grammar_score"],
+            "vocabulary": results["vocabulary_score"],
+            "fluency": results["fluency_score"],
+            "pronunciation": results["pronunciation_score"],
+            "filler_words": results["filler_score"]
+        },
+        "feedback": {
+            "improved_lines": results["improved_lines"],
+            "mispronounced_words": results["mispronounced_words"],
+            "summary_points": results["summary_points"]
+        },
+        "metrics": {
+            "words_per_minute": results["words_per_minute"],
+            "word_count": results["word_count"],
+            "pause_count": results["pause_count"],
+            "filler_words_data": results["filler_words_data"],
+            "fluency_over_time": results["fluency_over_time"],
+            **_level_metrics(results),
+        },
+        "transcription": " ".join([getattr(seg, "text", "") for seg in segments]),
+        "pdf_filename": results.get("pdf_filename"),
+        "evaluation_id": results.get("evaluation_id"),
+        "warnings": [],
+        # Kept with the cached response so the clip audio can be re-registered on a later hit
+        "_clip_spans": results.get("word_spans", []),
+    }
+
+    if not results.get("pdf_filename"):
+        response_data["warnings"].append("PDF report generation failed, but scores are available.")
+    return response_data
+
+
 @router.post("/evaluate/topical")
 async def evaluate_topical(request: EvaluateTopicalRequest, background_tasks: BackgroundTasks):
     logger.info(f"Received evaluation request for: {request.name}")
+    from core.scoring import SCORING_VERSION
+    from core.cefr_lexicon import lexicon_id
+    from services.result_cache import evaluation_cache, audio_cache_key
+    from services.llm import set_llm_deadline
+    set_llm_deadline(settings.LLM_EVALUATION_DEADLINE_SECONDS)
+
     tmp_audio_path = None
     try:
-        # Preserve original extension so Whisper detects the format correctly
-        audio_url_path = request.audio_url.split("?")[0]
-        ext = os.path.splitext(audio_url_path)[-1] or ".m4a"
-        with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp_audio_file:
-            tmp_audio_path = tmp_audio_file.name
-            logger.info(f"Downloading audio to {tmp_audio_path}...")
-            async with httpx.AsyncClient() as client:
-                try:
-                    response = await client.get(request.audio_url, timeout=30.0)
-                    if response.status_code != 200:
-                        raise HTTPException(status_code=400, detail=f"Failed to download audio. Status: {response.status_code}")
-                    tmp_audio_file.write(response.content)
-                except httpx.RequestError as e:
-                    raise HTTPException(status_code=400, detail=f"Network error while downloading audio: {str(e)}")
-            tmp_audio_file.close() 
-            
-        # Transcribe audio
-        logger.info("Starting transcription...")
-        from services.audio_utils import transcribe_audio_async
-        segments = await transcribe_audio_async(tmp_audio_path)
-        if not segments:
-            logger.warning("No speech detected in audio.")
-            raise HTTPException(status_code=400, detail="No speech detected in audio")
-        logger.info("Transcription completed.")
-        
-        duration_seconds = segments[-1].end if segments else 0
-        
-        # Run pipeline
-        logger.info("Running evaluation pipeline...")
-        from pipelines.topical_speech import topical_speech_pipeline
-        results = await topical_speech_pipeline(
-            name=request.name,
-            audio_path=tmp_audio_path,
-            segments=segments,
-            duration_seconds=duration_seconds
+        tmp_audio_path, audio_bytes = await _download_audio(request.audio_url)
+
+        # Retries of the same upload (same bytes, name and model/scoring versions) reuse the
+        # stored result (the CEFR lexicon is part of the key too); identical requests arriving
+        # together share one evaluation.
+        cache_key = audio_cache_key(audio_bytes, "topical", request.name, settings.WHISPER_MODEL, SCORING_VERSION, lexicon_id())
+        response_data = await evaluation_cache.get_or_compute(
+            cache_key, lambda: _evaluate_topical(request.name, tmp_audio_path, audio_bytes)
         )
-        
-        # Save PDF to disk so it can be downloaded via /report/{filename}
-        _save_pdf(results.get("pdf_bytes_io"), results.get("pdf_filename"))
-
-        # Format response contract
-        response_data = {
-            "scores": {
-                "overall": results["overall_score"],
-                "grammar": results["grammar_score"],
-                "vocabulary": results["vocabulary_score"],
-                "fluency": results["fluency_score"],
-                "pronunciation": results["pronunciation_score"],
-                "filler_words": results["filler_score"]
-            },
-            "feedback": {
-                "improved_lines": results["improved_lines"],
-                "mispronounced_words": results["mispronounced_words"],
-                "summary_points": results["summary_points"]
-            },
-            "metrics": {
-                "words_per_minute": results["words_per_minute"],
-                "word_count": results["word_count"],
-                "pause_count": results["pause_count"],
-                "filler_words_data": results["filler_words_data"],
-                "fluency_over_time": results["fluency_over_time"],
-            },
-            "transcription": " ".join([getattr(seg, "text", "") for seg in segments]),
-            "pdf_filename": results.get("pdf_filename"),
-            "warnings": []
-        }
-        
-        if not results.get("pdf_filename"):
-            response_data["warnings"].append("PDF report generation failed, but scores are available.")
+        await _restore_clip_audio(response_data, tmp_audio_path)
+        response_data = {k: v for k, v in response_data.items() if k != "_clip_spans"}
 
         logger.info(f"Evaluation request for {request.name} processed successfully.")
         return response_data
-        
+
     except HTTPException as he:
         raise he
     except Exception as e:
@@ -147,14 +320,17 @@ async def evaluate_topical(request: EvaluateTopicalRequest, background_tasks: Ba
 @router.post("/live/start", response_model=LiveStartResponse)
 async def live_start(request: LiveStartRequest):
     """Start a Live conversation session. Returns a session_id and the system's opening line."""
+    from services.llm import set_llm_deadline
+    set_llm_deadline(settings.LLM_START_DEADLINE_SECONDS)
     if not (1 <= request.duration_minutes <= 5):
         raise HTTPException(status_code=400, detail="duration_minutes must be between 1 and 5.")
 
     from services.session_store import create_session, add_turn
-    from services.llm import generate_live_opening
+    from services.llm import generate_live_opening, new_conversation_context, LIVE_PERSONA
+    from services.opening_pool import take_opening, LIVE_POOL
 
-    session_id = create_session(request.name, request.duration_minutes)
-    opening = generate_live_opening()
+    session_id = create_session(request.name, request.duration_minutes, new_conversation_context(LIVE_PERSONA))
+    opening = take_opening(LIVE_POOL) or await generate_live_opening()
     add_turn(session_id, role="system", text=opening)
 
     logger.info(f"Live session started: {session_id} for {request.name}")
@@ -164,6 +340,8 @@ async def live_start(request: LiveStartRequest):
 @router.post("/live/turn", response_model=LiveTurnResponse)
 async def live_turn(request: LiveTurnRequest, background_tasks: BackgroundTasks):
     """Submit a user audio turn. Returns the transcription and system's reply."""
+    from services.llm import set_llm_deadline
+    set_llm_deadline(settings.LLM_TURN_DEADLINE_SECONDS)
     from services.session_store import get_session, add_turn, is_expired
 
     session = get_session(request.session_id)
@@ -176,29 +354,21 @@ async def live_turn(request: LiveTurnRequest, background_tasks: BackgroundTasks)
 
     tmp_audio_path = None
     try:
-        # Preserve original extension so Whisper and pydub detect the format correctly
-        audio_url_path = request.audio_url.split("?")[0]
-        ext = os.path.splitext(audio_url_path)[-1] or ".m4a"
-
-        with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
-            tmp_audio_path = tmp.name
-            async with httpx.AsyncClient() as client:
-                response = await client.get(request.audio_url, timeout=30.0)
-                if response.status_code != 200:
-                    raise HTTPException(status_code=400, detail=f"Failed to download audio. Status: {response.status_code}")
-                audio_bytes = response.content
-                tmp.write(audio_bytes)
-
-        from services.audio_utils import transcribe_audio_async
-        segments = await transcribe_audio_async(tmp_audio_path)
+        tmp_audio_path, audio_bytes = await _download_audio(request.audio_url)
+
+        from services.audio_utils import decode_audio_pcm, transcribe_audio_cached
+        from pipelines.turn_features import schedule_turn_features
+        pcm = await asyncio.get_running_loop().run_in_executor(None, decode_audio_pcm, tmp_audio_path)
+        segments = await transcribe_audio_cached(pcm, audio_bytes)
         if not segments:
             raise HTTPException(status_code=400, detail="No speech detected in audio.")
 
         user_text = " ".join(getattr(seg, "text", "") for seg in segments).strip()
-        add_turn(request.session_id, role="user", text=user_text, segments=segments, audio_bytes=audio_bytes)
+        turn_segments = add_turn(request.session_id, role="user", text=user_text, segments=segments, pcm=pcm)
+        schedule_turn_features(session, turn_segments)
 
         from services.llm import generate_live_reply
-        reply = generate_live_reply(session["turns"])
+        reply = await generate_live_reply(session["context"])
         add_turn(request.session_id, role="system", text=reply)
 
         logger.info(f"Live turn {session['turn_number']} for session {request.session_id}")
@@ -218,9 +388,39 @@ async def live_turn(request: LiveTurnRequest, background_tasks: BackgroundTasks)
             background_tasks.add_task(_cleanup_audio_file, tmp_audio_path)
 
 
+@router.post("/live/turn/stream")
+async def live_turn_stream(request: LiveTurnRequest):
+    """Streaming variant of /live/turn.
+
+    Emits server-sent events: `transcript` for each decoded segment, `reply_chunk` for each
+    sentence of the reply as it streams from Gemini (ready for TTS), then a final `reply`
+    (same fields as LiveTurnResponse) once the turn is recorded, or `error`.
+    """
+    from services.llm import set_llm_deadline
+    set_llm_deadline(settings.LLM_TURN_DEADLINE_SECONDS)
+    from services.session_store import get_session, is_expired
+    from services.llm import stream_live_reply
+
+    session = get_session(request.session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found.")
+    if session["ended"]:
+        raise HTTPException(status_code=400, detail="Session has already ended.")
+    if is_expired(request.session_id):
+        raise HTTPException(status_code=400, detail="Session time has expired. Please call /live/end.")
+
+    tmp_audio_path, audio_bytes = await _download_audio(request.audio_url)
+    return _TurnStreamResponse(
+        _stream_turn(request.session_id, session, tmp_audio_path, audio_bytes, stream_live_reply),
+        tmp_audio_path,
+    )
+
+
 @router.post("/live/end", response_model=LiveEndResponse)
 async def live_end(request: LiveEndRequest):
     """End the Live session and return the full evaluation report."""
+    from services.llm import set_llm_deadline
+    set_llm_deadline(settings.LLM_EVALUATION_DEADLINE_SECONDS)
     from services.session_store import get_session, end_session, delete_session
 
     session = get_session(request.session_id)
@@ -264,9 +464,11 @@ async def live_end(request: LiveEndRequest):
                 "pause_count": results["pause_count"],
                 "filler_words_data": results["filler_words_data"],
                 "fluency_over_time": results["fluency_over_time"],
+                **_level_metrics(results),
             },
             transcription=results["full_text"],
             pdf_filename=results.get("pdf_filename"),
+            evaluation_id=results.get("evaluation_id"),
             warnings=[] if results.get("pdf_filename") else ["PDF report generation failed, but scores are available."],
         )
 
@@ -296,22 +498,25 @@ async def get_scenarios():
 @router.post("/companion/start", response_model=CompanionStartResponse)
 async def companion_start(request: CompanionStartRequest):
     """Start a Companion session with a specific scenario/role."""
+    from services.llm import set_llm_deadline
+    set_llm_deadline(settings.LLM_START_DEADLINE_SECONDS)
     if not (1 <= request.duration_minutes <= 5):
         raise HTTPException(status_code=400, detail="duration_minutes must be between 1 and 5.")
 
-    from services.llm import get_scenario, generate_companion_opening
+    from services.llm import get_scenario, generate_companion_opening, new_conversation_context
+    from services.opening_pool import take_opening
     from services.session_store import create_session, add_turn
 
     scenario = get_scenario(request.scenario_id)
     if not scenario:
         raise HTTPException(status_code=404, detail=f"Scenario '{request.scenario_id}' not found.")
 
-    session_id = create_session(request.name, request.duration_minutes)
+    session_id = create_session(request.name, request.duration_minutes, new_conversation_context(scenario["system_persona"]))
     # Store scenario on the session so turns can access it
     from services.session_store import get_session
     get_session(session_id)["scenario"] = scenario
 
-    opening = generate_companion_opening(scenario)
+    opening = take_opening(scenario["id"]) or await generate_companion_opening(scenario)
     add_turn(session_id, role="system", text=opening)
 
     logger.info(f"Companion session started: {session_id}, scenario: {request.scenario_id}")
@@ -326,6 +531,8 @@ async def companion_start(request: CompanionStartRequest):
 @router.post("/companion/turn", response_model=CompanionTurnResponse)
 async def companion_turn(request: CompanionTurnRequest, background_tasks: BackgroundTasks):
     """Submit a user audio turn in a Companion session."""
+    from services.llm import set_llm_deadline
+    set_llm_deadline(settings.LLM_TURN_DEADLINE_SECONDS)
     from services.session_store import get_session, add_turn, is_expired
 
     session = get_session(request.session_id)
@@ -340,29 +547,21 @@ async def companion_turn(request: CompanionTurnRequest, background_tasks: Backgr
 
     tmp_audio_path = None
     try:
-        # Preserve original extension so Whisper and pydub detect the format correctly
-        audio_url_path = request.audio_url.split("?")[0]
-        ext = os.path.splitext(audio_url_path)[-1] or ".m4a"
-
-        with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
-            tmp_audio_path = tmp.name
-            async with httpx.AsyncClient() as client:
-                response = await client.get(request.audio_url, timeout=30.0)
-                if response.status_code != 200:
-                    raise HTTPException(status_code=400, detail=f"Failed to download audio. Status: {response.status_code}")
-                audio_bytes = response.content
-                tmp.write(audio_bytes)
-
-        from services.audio_utils import transcribe_audio_async
-        segments = await transcribe_audio_async(tmp_audio_path)
+        tmp_audio_path, audio_bytes = await _download_audio(request.audio_url)
+
+        from services.audio_utils import decode_audio_pcm, transcribe_audio_cached
+        from pipelines.turn_features import schedule_turn_features
+        pcm = await asyncio.get_running_loop().run_in_executor(None, decode_audio_pcm, tmp_audio_path)
+        segments = await transcribe_audio_cached(pcm, audio_bytes)
         if not segments:
             raise HTTPException(status_code=400, detail="No speech detected in audio.")
 
         user_text = " ".join(getattr(seg, "text", "") for seg in segments).strip()
-        add_turn(request.session_id, role="user", text=user_text, segments=segments, audio_bytes=audio_bytes)
+        turn_segments = add_turn(request.session_id, role="user", text=user_text, segments=segments, pcm=pcm)
+        schedule_turn_features(session, turn_segments)
 
         from services.llm import generate_companion_reply
-        reply = generate_companion_reply(session["scenario"], session["turns"])
+        reply = await generate_companion_reply(session["context"])
         add_turn(request.session_id, role="system", text=reply)
 
         logger.info(f"Companion turn {session['turn_number']} for session {request.session_id}")
@@ -382,9 +581,36 @@ async def companion_turn(request: CompanionTurnRequest, background_tasks: Backgr
             background_tasks.add_task(_cleanup_audio_file, tmp_audio_path)
 
 
+@router.post("/companion/turn/stream")
+async def companion_turn_stream(request: CompanionTurnRequest):
+    """Streaming variant of /companion/turn. Emits the same events as /live/turn/stream."""
+    from services.llm import set_llm_deadline
+    set_llm_deadline(settings.LLM_TURN_DEADLINE_SECONDS)
+    from services.session_store import get_session, is_expired
+    from services.llm import stream_companion_reply
+
+    session = get_session(request.session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found.")
+    if session["ended"]:
+        raise HTTPException(status_code=400, detail="Session has already ended.")
+    if is_expired(request.session_id):
+        raise HTTPException(status_code=400, detail="Session time has expired. Please call /companion/end.")
+    if "scenario" not in session:
+        raise HTTPException(status_code=400, detail="Session is not a Companion session.")
+
+    tmp_audio_path, audio_bytes = await _download_audio(request.audio_url)
+    return _TurnStreamResponse(
+        _stream_turn(request.session_id, session, tmp_audio_path, audio_bytes, stream_companion_reply),
+        tmp_audio_path,
+    )
+
+
 @router.post("/companion/end", response_model=CompanionEndResponse)
 async def companion_end(request: CompanionEndRequest):
     """End the Companion session and return the full evaluation report."""
+    from services.llm import set_llm_deadline
+    set_llm_deadline(settings.LLM_EVALUATION_DEADLINE_SECONDS)
     from services.session_store import get_session, end_session, delete_session
 
     session = get_session(request.session_id)
@@ -428,9 +654,11 @@ async def companion_end(request: CompanionEndRequest):
                 "pause_count": results["pause_count"],
                 "filler_words_data": results["filler_words_data"],
                 "fluency_over_time": results["fluency_over_time"],
+                **_level_metrics(results),
             },
             transcription=results["full_text"],
             pdf_filename=results.get("pdf_filename"),
+            evaluation_id=results.get("evaluation_id"),
             warnings=[] if results.get("pdf_filename") else ["PDF report generation failed, but scores are available."],
         )
 
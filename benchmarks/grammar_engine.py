@@ -0,0 +1,112 @@
+"""Benchmark the single-pass grammar engine against the previous per-pattern / per-sentence approach.
+
+Run from the repository root:
+
+    python -m benchmarks.grammar_engine [--sizes 1000 10000 100000] [--repeat 3]
+
+The pattern scan is timed on its own, and the full check (tokenize, tag, scan) when the
+NLTK tokenizer and tagger data are installed.
+"""
+import argparse
+import random
+import re
+import time
+
+from core.grammar import _ERROR_RULES, scan_patterns
+
+_SENTENCES = [
+    "I is going to the market tomorrow morning.",
+    "She really likes the new apartment near the river.",
+    "They was late because the train was delayed again.",
+    "We discussed a interesting idea during the meeting.",
+    "My brother did finished his homework before dinner.",
+    "It was more easier than I expected, to be honest.",
+    "So, like, the the weather has been really nice lately.",
+    "Their is a small cafe on the corner of the street.",
+    "You know, I don't want nothing from the store today.",
+    "The project deadline was moved to the end of the month.",
+    "He always helps his neighbours with the garden.",
+    "Honestly the best part of the trip was the food.",
+]
+
+# The rules as they were: one compiled pattern per rule, with the original capturing groups
+_LEGACY_PATTERNS = [
+    re.compile(re.sub(r"\(\?P<repeated>(.*?)\)\\s\+\(\?P=repeated\)", r"(\1)\\s+\\1", pattern).replace("(?:", "("), re.IGNORECASE)
+    for pattern, _ in _ERROR_RULES.values()
+]
+
+
+def make_transcript(words: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    parts, count = [], 0
+    while count < words:
+        sentence = rng.choice(_SENTENCES)
+        parts.append(sentence)
+        count += len(sentence.split())
+    return " ".join(parts)
+
+
+def legacy_pattern_errors(text: str) -> int:
+    return sum(len(pattern.findall(text)) for pattern in _LEGACY_PATTERNS)
+
+
+def scanner_pattern_errors(text: str) -> int:
+    return len(scan_patterns(text))
+
+
+def legacy_full(text: str) -> int:
+    import nltk
+    errors = legacy_pattern_errors(text)
+    for sentence in nltk.sent_tokenize(text):
+        words = nltk.word_tokenize(sentence)
+        if len(words) < 2:
+            continue
+        tags = [tag for _, tag in nltk.pos_tag(words)]
+        if len(words) > 3:
+            errors += not any(t.startswith("VB") or t == "MD" for t in tags)
+            errors += not any(t.startswith("NN") or t in ("PRP", "PRP$", "WP") for t in tags)
+    return errors
+
+
+def engine_full(text: str) -> int:
+    from core.document import analyze_text
+    from core.grammar import grammar_errors_from_doc
+    return len(grammar_errors_from_doc(analyze_text(text)))
+
+
+def best_of(fn, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _row(label: str, words: int, before: float, after: float):
+    print(f"{label:<14}{words:>9}{before * 1000:>13.1f}{after * 1000:>13.1f}{before / after:>9.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    try:
+        engine_full("Warm up the tokenizer and tagger.")
+        full = True
+    except LookupError:
+        print("NLTK tokenizer/tagger data not installed, timing the pattern scan only\n")
+        full = False
+
+    print(f"{'stage':<14}{'words':>9}{'before (ms)':>13}{'after (ms)':>13}{'speedup':>10}")
+    for words in args.sizes:
+        text = make_transcript(words)
+        _row("patterns", words, best_of(legacy_pattern_errors, text, args.repeat), best_of(scanner_pattern_errors, text, args.repeat))
+        if full:
+            _row("full check", words, best_of(legacy_full, text, args.repeat), best_of(engine_full, text, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
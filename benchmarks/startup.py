@@ -0,0 +1,83 @@
+"""Benchmark service startup: cold import of the app, NLP resource loading, and the first scoring request.
+
+Run from the repository root:
+
+    python -m benchmarks.startup [--runs 3]
+
+Each run is a fresh interpreter, so imports and model loads are cold. "preloaded" loads the
+NLP resources the way the lifespan does before the first request; "lazy" lets the first
+request load them. Whisper and Gemini are not involved.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+_TRANSCRIPT = (
+    "So, I went to the market yesterday and it was, like, really busy. "
+    "They was selling a interesting new kind of apple that I never seen before. "
+    "You know, I think I will go back there next week with my sister."
+)
+
+_PROBE = """
+import json, time
+t0 = time.perf_counter()
+import main
+t1 = time.perf_counter()
+preload = {preload}
+load_error = None
+if preload:
+    from core.nlp_resources import load_nlp_resources
+    try:
+        load_nlp_resources()
+    except LookupError as e:
+        load_error = str(e)
+t2 = time.perf_counter()
+first = second = None
+if load_error is None:
+    from core.document import analyze_text
+    from core.grammar import grammar_score_from_doc
+    from core.vocabulary import vocabulary_score_from_doc
+    from core.speech_eval import local_filler_verdicts_from_doc
+    def score(text):
+        doc = analyze_text(text)
+        return grammar_score_from_doc(doc), vocabulary_score_from_doc(doc), local_filler_verdicts_from_doc(doc)
+    try:
+        t3 = time.perf_counter(); score({transcript!r}); t4 = time.perf_counter(); score({transcript!r}); t5 = time.perf_counter()
+        first, second = t4 - t3, t5 - t4
+    except LookupError as e:
+        load_error = str(e)
+print(json.dumps({{"import": t1 - t0, "load": t2 - t1, "first": first, "second": second, "error": load_error}}))
+"""
+
+
+def run_once(preload: bool) -> dict:
+    probe = _PROBE.format(preload=preload, transcript=_TRANSCRIPT)
+    out = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def _ms(values: list) -> str:
+    values = [v for v in values if v is not None]
+    return f"{statistics.median(values) * 1000:>10.0f}" if values else f"{'-':>10}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'mode':<11}{'import':>10}{'load':>10}{'1st req':>10}{'2nd req':>10}{'import→1st':>12}   (median ms of {args.runs} runs)")
+    for preload in (True, False):
+        runs = [run_once(preload) for _ in range(args.runs)]
+        errors = {r["error"] for r in runs if r["error"]}
+        totals = [r["import"] + r["load"] + r["first"] if r["first"] is not None else None for r in runs]
+        print(f"{'preloaded' if preload else 'lazy':<11}{_ms([r['import'] for r in runs])}{_ms([r['load'] for r in runs])}"
+              f"{_ms([r['first'] for r in runs])}{_ms([r['second'] for r in runs])}{_ms(totals):>12}")
+        for error in errors:
+            print(f"  {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,76 @@ class Settings(BaseSettings):
     BATCH_SIZE: int = 16
     COMPUTE_TYPE: str = "int8"
     WHISPER_MODEL: str = "base"
+    WHISPER_LANGUAGE: str = "en"
+
+    # ASR request coalescing: concurrent transcriptions are grouped into micro-batches
+    ASR_BATCHING_ENABLED: bool = True
+    ASR_MAX_BATCH_SIZE: int = 8
+    ASR_MAX_WAIT_MS: int = 50
+
+    # ASR worker processes; each loads WHISPER_MODEL at startup. 0 keeps transcription in the API process.
+    ASR_POOL_SIZE: int = 1
+    ASR_CPU_THREADS: int = 0  # per worker; 0 splits os.cpu_count() evenly across the pool
+    ASR_NUM_WORKERS: int = 1
+
+    # Content-addressed cache for transcriptions and topical evaluations (keyed by audio hash)
+    RESULT_CACHE_MAX_ITEMS: int = 256
+    RESULT_CACHE_DB_PATH: Optional[str] = None  # e.g. "cache/results.sqlite3"; unset keeps the cache in memory only
+    RESULT_CACHE_MAX_DB_MB: int = 512
+
+    # Session audio kept after an evaluation so word clips can be replayed on demand
+    CLIP_STORE_TTL_SECONDS: int = 3600
+    CLIP_STORE_MAX_EVALUATIONS: int = 100
+    CLIP_STORE_MAX_MB: int = 256  # evaluated audio plus cached clips
+    CLIP_CACHE_MAX_ITEMS: int = 512
+
+    # Filler candidates are classified in one Gemini call, split only past this many prompt tokens
+    FILLER_BATCH_TOKEN_BUDGET: int = 4000
+
+    # Async Gemini calls: max in flight per worker process, and per-call timeout
+    LLM_MAX_CONCURRENCY: int = 16
+    LLM_TIMEOUT_SECONDS: float = 30.0
+
+    # Gemini call policy: per-request deadlines, retries, hedged replies and a circuit breaker
+    LLM_START_DEADLINE_SECONDS: float = 8.0
+    LLM_TURN_DEADLINE_SECONDS: float = 20.0
+    LLM_EVALUATION_DEADLINE_SECONDS: float = 90.0
+    LLM_MAX_RETRIES: int = 2
+    LLM_RETRY_BASE_MS: int = 250
+    LLM_HEDGE_REPLIES: bool = True
+    LLM_HEDGE_DELAY_MS: int = 2000
+    LLM_BREAKER_WINDOW: int = 20
+    LLM_BREAKER_MIN_CALLS: int = 10
+    LLM_BREAKER_ERROR_RATE: float = 0.5
+    LLM_BREAKER_COOLDOWN_SECONDS: float = 30.0
+
+    # Cache for repeated Gemini prompts (stored alongside the result cache); TTL per call type
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_VARIANTS: int = 5  # distinct opening lines kept per prompt and sampled at random
+    LLM_CACHE_TTL_OPENING_SECONDS: int = 86400
+    LLM_CACHE_TTL_HINTS_SECONDS: int = 604800
+    LLM_CACHE_TTL_FILLER_SECONDS: int = 2592000
+
+    # Opening lines kept ready per scenario (and for live mode) so session start skips Gemini; 0 disables
+    OPENING_POOL_SIZE: int = 3
+    OPENING_POOL_RETRY_SECONDS: int = 30
+
+    # Conversation reply prompts: persona prefix + summary of older turns + recent turns within a token budget
+    CONVERSATION_TOKEN_BUDGET: int = 1500
+    CONVERSATION_SUMMARY_TOKENS: int = 300
+    CONVERSATION_RECENT_TURNS: int = 6
+    LLM_PERSONA_CACHE: bool = False  # provider-side context caching of persona prefixes, where Gemini accepts them
+    LLM_PERSONA_CACHE_TTL_SECONDS: int = 3600
+
+    # Compiled CEFR lexicon (python -m core.cefr_lexicon); unset uses data/cefr_lexicon.idx.
+    # While required, a missing index keeps /ready at 503; turn off to score without CEFR levels
+    CEFR_INDEX_PATH: Optional[str] = None
+    CEFR_LEXICON_REQUIRED: bool = True
+
+    # Startup warm-up run before /ready reports ready; comma-separated subset of
+    # audio, plots, pdf, llm, asr (the NLP resources always load)
+    WARMUP_ENABLED: bool = True
+    WARMUP_COMPONENTS: str = "audio,plots,pdf,llm,asr"
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,215 @@
+"""CEFR level lookups backed by a compact, memory-mapped index.
+
+No lexicon ships with the repository. An openly licensed CEFR word list, as a CSV of
+`word,level` rows (or CEFR-J's `headword,...,CEFR` columns), is compiled at build time into a
+sorted table of fixed-width lowercase UTF-8 words followed by one level byte per word
+(1 = A1 ... 6 = C2):
+
+    python -m core.cefr_lexicon [--csv data/cefr_lexicon.csv] [--out data/cefr_lexicon.idx]
+
+Workers map the file read-only on first use, so the table lives once in the page cache and
+lookups are binary searches over it (numpy searchsorted) for a whole token list at a time.
+Without an index, lexicon_available() is False and CEFR levels are not reported; unless
+CEFR_LEXICON_REQUIRED is turned off, /ready then stays 503 so the gap can't go unnoticed.
+"""
+import argparse
+import csv
+import logging
+import struct
+import threading
+from pathlib import Path
+from config.settings import Settings
+
+settings = Settings()
+logger = logging.getLogger(__name__)
+
+CEFR_LEVELS = ("A1", "A2", "B1", "B2", "C1", "C2")
+LEVEL_CODES = {level: code for code, level in enumerate(CEFR_LEVELS, start=1)}
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+DEFAULT_CSV = DATA_DIR / "cefr_lexicon.csv"
+DEFAULT_INDEX = DATA_DIR / "cefr_lexicon.idx"
+
+_MAGIC = b"CEFRIDX1"
+_HEADER = struct.Struct("<8sHxxI")  # magic, word width, word count
+_MAX_WIDTH = 32
+
+_lock = threading.Lock()
+_index = None  # (words, levels), numpy arrays sorted by word; () once no index was found
+
+
+def read_lexicon_csv(path: Path) -> dict[str, int]:
+    """word -> level code; multi-word entries are skipped and a word listed twice keeps its lowest level.
+
+    Spelling variants listed as one headword ("colour/color") are entered separately.
+    """
+    lexicon = {}
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            headword = row.get("word") or row.get("headword") or ""
+            code = LEVEL_CODES.get((row.get("level") or row.get("CEFR") or "").strip().upper())
+            if code is None:
+                continue
+            for word in headword.lower().split("/"):
+                word = word.strip()
+                if not word or " " in word or len(word.encode("utf-8")) > _MAX_WIDTH:
+                    continue
+                lexicon[word] = min(code, lexicon.get(word, code))
+    return lexicon
+
+
+def _compile(lexicon: dict[str, int]):
+    import numpy as np
+    keys = sorted(word.encode("utf-8") for word in lexicon)
+    width = max((len(k) for k in keys), default=1)
+    words = np.array(keys, dtype=f"S{width}")
+    levels = np.array([lexicon[k.decode("utf-8")] for k in keys], dtype=np.uint8)
+    return words, levels
+
+
+def build_index(csv_path: Path = DEFAULT_CSV, out_path: Path = DEFAULT_INDEX) -> int:
+    """Compile the lexicon CSV into the binary index; returns the number of words."""
+    words, levels = _compile(read_lexicon_csv(csv_path))
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, words.dtype.itemsize, len(words)))
+        f.write(words.tobytes())
+        f.write(levels.tobytes())
+    return len(words)
+
+
+def _map_index(path: Path):
+    import numpy as np
+    with open(path, "rb") as f:
+        magic, width, count = _HEADER.unpack(f.read(_HEADER.size))
+    if magic != _MAGIC:
+        raise ValueError(f"{path} is not a CEFR lexicon index")
+    if count == 0:
+        return np.array([], dtype="S1"), np.array([], dtype=np.uint8)
+    words = np.memmap(path, dtype=f"S{width}", mode="r", offset=_HEADER.size, shape=(count,))
+    levels = np.memmap(path, dtype=np.uint8, mode="r", offset=_HEADER.size + width * count, shape=(count,))
+    return words, levels
+
+
+def _get_index():
+    """The mapped index, or None when no (non-empty) index has been built."""
+    global _index
+    if _index is None:
+        with _lock:
+            if _index is None:
+                index_path = _index_path()
+                _index = _map_index(index_path) if index_path.exists() else ()
+                if _index and len(_index[0]):
+                    logger.info(f"CEFR lexicon loaded: {len(_index[0])} words")
+                else:
+                    _index = ()
+                    log = logger.error if settings.CEFR_LEXICON_REQUIRED else logger.warning
+                    log(f"No CEFR lexicon at {index_path}, vocabulary levels and the C1/C2 bonus are not scored")
+    return _index or None
+
+
+def _index_path() -> Path:
+    return Path(settings.CEFR_INDEX_PATH) if settings.CEFR_INDEX_PATH else DEFAULT_INDEX
+
+
+def lexicon_available() -> bool:
+    return _get_index() is not None
+
+
+def lexicon_status() -> dict:
+    """For /ready: "ready" is False while a required lexicon is missing."""
+    index = _get_index()
+    error = None
+    if index is None:
+        error = f"CEFR lexicon index {_index_path()} not found; build it with python -m core.cefr_lexicon"
+    return {
+        "ready": index is not None or not settings.CEFR_LEXICON_REQUIRED,
+        "required": settings.CEFR_LEXICON_REQUIRED,
+        "words": len(index[0]) if index is not None else 0,
+        "error": error,
+    }
+
+
+def lexicon_id() -> str:
+    """Identifies the installed lexicon in cache keys, so results scored without it (or with another) aren't reused."""
+    index = _get_index()
+    return f"cefr{len(index[0])}" if index is not None else "nocefr"
+
+
+def _lookup(keys: list[str]):
+    """Level code of each key (0 if unlisted or no lexicon is installed), with one vectorized binary search."""
+    import numpy as np
+    index = _get_index()
+    if not keys or index is None:
+        return np.zeros(len(keys), dtype=np.uint8)
+    words, levels = index
+    width = words.dtype.itemsize
+    # Keys longer than the table's width can't be in it; blank them rather than truncate into a false match
+    encoded = [k.encode("utf-8") for k in keys]
+    probe = np.array([k if len(k) <= width else b"" for k in encoded], dtype=words.dtype)
+    pos = np.minimum(np.searchsorted(words, probe), len(words) - 1)
+    found = (words[pos] == probe) & (probe != b"")
+    return np.where(found, levels[pos], 0).astype(np.uint8)
+
+
+def _lemma_candidates(word: str) -> list[str]:
+    """Base forms to try for an inflected word, most likely first (plurals, -ed, -ing, -er/-est, -ly)."""
+    candidates = []
+    if word.endswith("ies") and len(word) > 4:
+        candidates.append(word[:-3] + "y")
+    if word.endswith("es") and len(word) > 3:
+        candidates.append(word[:-2])
+    if word.endswith("s") and not word.endswith("ss") and len(word) > 2:
+        candidates.append(word[:-1])
+    for suffix in ("ing", "ed", "est", "er"):
+        if word.endswith(suffix) and len(word) > len(suffix) + 2:
+            stem = word[:-len(suffix)]
+            if stem.endswith("i"):
+                candidates.append(stem[:-1] + "y")        # happier -> happy
+            candidates.append(stem)                       # walked -> walk
+            candidates.append(stem + "e")                 # used -> use
+            if len(stem) > 2 and stem[-1] == stem[-2]:
+                candidates.append(stem[:-1])              # stopped -> stop
+    if word.endswith("ly") and len(word) > 4:
+        candidates.append(word[:-2])
+        if word.endswith("ily"):
+            candidates.append(word[:-3] + "y")
+    return candidates
+
+
+def token_levels(tokens: list[str]):
+    """CEFR level code (1-6, 0 if unlisted) of each lowercase token, trying base forms for misses."""
+    import numpy as np
+    levels = _lookup(tokens)
+    misses = np.flatnonzero(levels == 0)
+    if not len(misses):
+        return levels
+
+    candidates, owners = [], []
+    for i in misses:
+        for candidate in _lemma_candidates(tokens[i]):
+            candidates.append(candidate)
+            owners.append(i)
+    if not candidates:
+        return levels
+    candidate_levels = _lookup(candidates)
+    hits = candidate_levels > 0
+    # First listed base form wins for each token
+    hit_owners, first = np.unique(np.asarray(owners)[hits], return_index=True)
+    levels[hit_owners] = candidate_levels[hits][first]
+    return levels
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the CEFR lexicon CSV into the lookup index")
+    parser.add_argument("--csv", type=Path, default=DEFAULT_CSV)
+    parser.add_argument("--out", type=Path, default=DEFAULT_INDEX)
+    args = parser.parse_args()
+    if not args.csv.exists():
+        parser.error(f"{args.csv} not found; see the README for an openly licensed CEFR word list")
+    count = build_index(args.csv, args.out)
+    print(f"Wrote {count} words to {args.out} ({args.out.stat().st_size} bytes)")
+
+
+if __name__ == "__main__":
+    main()
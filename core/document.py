@@ -0,0 +1,72 @@
+from typing import NamedTuple
+
+
+class AnalyzedDocument(NamedTuple):
+    """A transcript tokenized and POS-tagged once, shared by the grammar, vocabulary and filler scorers.
+
+    Per-sentence lists are parallel: tokens[i][j] has the lowercase form lower[i][j], the tag
+    tags[i][j] (empty when built with tag=False) and the character offset offsets[i][j]
+    within sentences[i] (-1 if the tokenizer rewrote it, e.g. quotes).
+    """
+    text: str
+    sentences: list[str]
+    sentence_offsets: list[int]  # start of each sentence in text, -1 if it could not be located
+    tokens: list[list[str]]
+    lower: list[list[str]]
+    tags: list[list[str]]
+    offsets: list[list[int]]
+    word_count: int  # whitespace-separated words, the denominator of the filler percentage
+
+    def lower_tokens(self) -> list[str]:
+        return [token for sentence in self.lower for token in sentence]
+
+    def tagged(self, index: int) -> list[tuple[str, str, int]]:
+        """(token, tag, char_offset) for every token of sentence `index`."""
+        return list(zip(self.tokens[index], self.tags[index], self.offsets[index]))
+
+
+# word_tokenize rewrites double quotes as `` and ''
+_QUOTE_TOKENS = {"``": '"', "''": '"'}
+
+
+def _token_offsets(sentence: str, tokens: list[str]) -> list[int]:
+    offsets, cursor = [], 0
+    for token in tokens:
+        start = sentence.find(token, cursor)
+        if start < 0 and token in _QUOTE_TOKENS:
+            start = sentence.find(_QUOTE_TOKENS[token], cursor)
+            token = _QUOTE_TOKENS[token]
+        offsets.append(start)
+        if start >= 0:
+            cursor = start + len(token)
+    return offsets
+
+
+def analyze_text(text: str, tag: bool = True) -> AnalyzedDocument:
+    """Split `text` into sentences and tokens and tag them, each in a single pass over the text."""
+    import nltk
+    from core.nlp_resources import sentence_tokenizer, pos_tagger
+    if not text or not text.strip():
+        return AnalyzedDocument(text or "", [], [], [], [], [], [], 0)
+
+    sentences = sentence_tokenizer().tokenize(text)
+    sentence_offsets, cursor = [], 0
+    for sentence in sentences:
+        start = text.find(sentence, cursor)
+        sentence_offsets.append(start)
+        if start >= 0:
+            cursor = start + len(sentence)
+
+    # preserve_line: the sentences are already split, don't run the sentence tokenizer again
+    tokens = [nltk.word_tokenize(sentence, preserve_line=True) for sentence in sentences]
+    tags = [[t for _, t in tagged] for tagged in pos_tagger().tag_sents(tokens)] if tag else [[] for _ in tokens]
+    return AnalyzedDocument(
+        text=text,
+        sentences=sentences,
+        sentence_offsets=sentence_offsets,
+        tokens=tokens,
+        lower=[[token.lower() for token in sentence] for sentence in tokens],
+        tags=tags,
+        offsets=[_token_offsets(sentence, sentence_tokens) for sentence, sentence_tokens in zip(sentences, tokens)],
+        word_count=len(text.split()),
+    )
@@ -1,10 +1,27 @@
+def segment_gaps(segments: list):
+    """Return (gap_starts, gap_ends) arrays for the gaps between consecutive segments."""
+    import numpy as np
+    if len(segments) < 2:
+        return np.empty(0), np.empty(0)
+    gap_starts = np.fromiter((float(seg.end) for seg in segments[:-1]), dtype=np.float64, count=len(segments) - 1)
+    gap_ends = np.fromiter((float(seg.start) for seg in segments[1:]), dtype=np.float64, count=len(segments) - 1)
+    return gap_starts, gap_ends
+
+def word_gaps(segments: list):
+    """Return (gap_starts, gap_ends) arrays for the gaps between consecutive words, across segments."""
+    import numpy as np
+    words = [w for seg in segments for w in (seg.words or [])]
+    if len(words) < 2:
+        return np.empty(0), np.empty(0)
+    gap_starts = np.fromiter((float(w.end) for w in words[:-1]), dtype=np.float64, count=len(words) - 1)
+    gap_ends = np.fromiter((float(w.start) for w in words[1:]), dtype=np.float64, count=len(words) - 1)
+    return gap_starts, gap_ends
+
 def detect_pauses(segments: list, threshold: float = 0.6) -> list[tuple[float, float, float]]:
-    pauses = []
-    for i in range(1, len(segments)):
-        gap = float(segments[i].start) - float(segments[i - 1].end)
-        if gap > threshold:
-            pauses.append((segments[i - 1].end, segments[i].start, gap))
-    return pauses
+    gap_starts, gap_ends = segment_gaps(segments)
+    durations = gap_ends - gap_starts
+    keep = durations > threshold
+    return list(zip(gap_starts[keep].tolist(), gap_ends[keep].tolist(), durations[keep].tolist()))
 
 def calculate_wpm(words: list[str], total_time_sec: float) -> float:
     if total_time_sec == 0:
@@ -1,100 +1,145 @@
+import bisect
 import re
-import nltk
-from nltk.tokenize import sent_tokenize, word_tokenize
+from typing import NamedTuple
 
-# Ensure required NLTK data is available
-for resource in ['punkt', 'punkt_tab', 'averaged_perceptron_tagger', 'averaged_perceptron_tagger_eng']:
-    try:
-        nltk.data.find(f'tokenizers/{resource}' if 'punkt' in resource else f'taggers/{resource}')
-    except LookupError:
-        nltk.download(resource, quiet=True)
 
+class GrammarError(NamedTuple):
+    type: str            # e.g. 'subject-verb agreement'
+    start: int           # character span in the document text
+    end: int
+    sentence_index: int  # -1 if the span could not be placed in a sentence
 
-# Common grammar error patterns (regex-based heuristics)
-_ERROR_PATTERNS = [
+
+# Common grammar error patterns (regex-based heuristics): rule name -> (pattern, error type).
+# They are scanned together in one pass, so inner groups are non-capturing and the
+# repeated-word backreference refers to its own named group.
+_ERROR_RULES = {
     # Subject-verb agreement
-    (r'\b(I|we|they|you)\s+(is|was|has)\b', 'subject-verb agreement'),
-    (r'\b(he|she|it)\s+(are|were|have)\b', 'subject-verb agreement'),
-    (r'\b(everybody|everyone|nobody|someone|anyone)\s+(are|were|have)\b', 'subject-verb agreement'),
+    'sva_plural_subject': (r'\b(?:I|we|they|you)\s+(?:is|was|has)\b', 'subject-verb agreement'),
+    'sva_singular_subject': (r'\b(?:he|she|it)\s+(?:are|were|have)\b', 'subject-verb agreement'),
+    'sva_indefinite_pronoun': (r'\b(?:everybody|everyone|nobody|someone|anyone)\s+(?:are|were|have)\b', 'subject-verb agreement'),
     # Double negatives
-    (r"\b(don't|doesn't|didn't|won't|can't|couldn't|wouldn't|shouldn't)\s+\w*\s*\b(no|nothing|nobody|nowhere|neither)\b", 'double negative'),
+    'double_negative': (r"\b(?:don't|doesn't|didn't|won't|can't|couldn't|wouldn't|shouldn't)\s+\w*\s*\b(?:no|nothing|nobody|nowhere|neither)\b", 'double negative'),
     # Repeated words
-    (r'\b(\w+)\s+\1\b', 'repeated word'),
+    'repeated_word': (r'\b(?P<repeated>\w+)\s+(?P=repeated)\b', 'repeated word'),
     # a/an misuse
-    (r'\ba\s+[aeiouAEIOU]\w+', 'a/an misuse'),
-    (r'\ban\s+[^aeiouAEIOU\s]\w+', 'a/an misuse'),
+    'a_before_vowel': (r'\ba\s+[aeiouAEIOU]\w+', 'a/an misuse'),
+    'an_before_consonant': (r'\ban\s+[^aeiouAEIOU\s]\w+', 'a/an misuse'),
     # Common confused words
-    (r'\btheir\s+(is|was|are|were)\b', 'confused word (their/there)'),
-    (r'\byour\s+(is|was|are|were|welcome)\b', 'confused word (your/you\'re)'),
-    (r'\bits\s+(a\s+)?(is|was|are|were)\b', 'confused word (its/it\'s)'),
+    'their_there': (r'\btheir\s+(?:is|was|are|were)\b', 'confused word (their/there)'),
+    'your_youre': (r'\byour\s+(?:is|was|are|were|welcome)\b', 'confused word (your/you\'re)'),
+    'its_its': (r'\bits\s+(?:a\s+)?(?:is|was|are|were)\b', 'confused word (its/it\'s)'),
     # Missing verb after subject pronouns
-    (r'\b(I|he|she|we|they)\s+(very|really|also|never|always|often)\s+(very|really|also|never|always|often)\b', 'missing verb'),
+    'missing_verb': (r'\b(?:I|he|she|we|they)\s+(?:very|really|also|never|always|often)\s+(?:very|really|also|never|always|often)\b', 'missing verb'),
     # Incorrect past tense
-    (r'\bdid\s+\w+ed\b', 'incorrect past tense after did'),
+    'did_past_tense': (r'\bdid\s+\w+ed\b', 'incorrect past tense after did'),
     # Double comparatives/superlatives
-    (r'\bmore\s+\w+er\b', 'double comparative'),
-    (r'\bmost\s+\w+est\b', 'double superlative'),
-]
+    'double_comparative': (r'\bmore\s+\w+er\b', 'double comparative'),
+    'double_superlative': (r'\bmost\s+\w+est\b', 'double superlative'),
+}
 
-_COMPILED_PATTERNS = [(re.compile(p, re.IGNORECASE), desc) for p, desc in _ERROR_PATTERNS]
+# One zero-width match per word start where any rule matches, with every rule in its own
+# optional lookahead, so overlapping errors from different rules are all reported. Every rule
+# starts with \b; checking once that a word starts here (and stripping each rule's own \b)
+# lets the scan skip every other position, and the guard alternation (its named groups renamed
+# so they don't clash) skips the words no rule matches before any lookahead is tried.
+_RULE_BODIES = {name: pattern[2:] for name, (pattern, _) in _ERROR_RULES.items()}
+_ERROR_SCANNER = re.compile(
+    r"\b(?=\w)(?="
+    + "|".join(re.sub(r"\(\?P([<=])(\w+)", r"(?P\1any_\2", body) for body in _RULE_BODIES.values())
+    + ")"
+    + "".join(f"(?=(?P<{name}>{body}))?" for name, body in _RULE_BODIES.items()),
+    re.IGNORECASE,
+)
 
+_VERB_TAGS = {'VB', 'VBD', 'VBG', 'VBN', 'VBP', 'VBZ', 'MD'}
+_NOUN_TAGS = {'NN', 'NNS', 'NNP', 'NNPS', 'PRP', 'PRP$', 'WP'}
 
-def _count_pattern_errors(text: str) -> int:
-    """Count grammar errors detected by regex patterns."""
-    error_count = 0
-    for pattern, _ in _COMPILED_PATTERNS:
-        matches = pattern.findall(text)
-        error_count += len(matches)
-    return error_count
 
+def _sentence_index(sentence_starts: list[int], position: int) -> int:
+    return bisect.bisect_right(sentence_starts, position) - 1
 
-def _check_sentence_structure(sentences: list[str]) -> int:
-    """Check for basic sentence structure issues using POS tagging."""
-    errors = 0
-    for sent in sentences:
-        words = word_tokenize(sent)
-        if len(words) < 2:
-            continue
-        try:
-            tagged = nltk.pos_tag(words)
-        except Exception:
+
+def scan_patterns(text: str) -> list[tuple[str, int, int]]:
+    """(rule, start, end) of every heuristic pattern match, in one scan of the text.
+
+    Different rules may overlap; matches of the same rule don't (as with re.findall per rule).
+    """
+    matches = []
+    rule_ends = dict.fromkeys(_ERROR_RULES, 0)
+    for match in _ERROR_SCANNER.finditer(text):
+        for rule in _ERROR_RULES:
+            start, end = match.span(rule)
+            if start < 0 or start < rule_ends[rule]:
+                continue
+            rule_ends[rule] = end
+            matches.append((rule, start, end))
+    return matches
+
+
+def _pattern_errors(doc) -> list[GrammarError]:
+    sentence_starts = [start if start >= 0 else 0 for start in doc.sentence_offsets]
+    return [
+        GrammarError(_ERROR_RULES[rule][1], start, end, _sentence_index(sentence_starts, start))
+        for rule, start, end in scan_patterns(doc.text)
+    ]
+
+
+def _structure_errors(doc) -> list[GrammarError]:
+    """Sentences of more than three tokens without a verb, or without a noun or pronoun, from the document's POS tags."""
+    errors = []
+    for index, (words, pos_tags) in enumerate(zip(doc.tokens, doc.tags)):
+        if len(words) <= 3:
             continue
+        start = doc.sentence_offsets[index]
+        end = start + len(doc.sentences[index]) if start >= 0 else -1
+        if not any(tag in _VERB_TAGS for tag in pos_tags):
+            errors.append(GrammarError('missing verb in sentence', start, end, index))
+        if not any(tag in _NOUN_TAGS for tag in pos_tags):
+            errors.append(GrammarError('missing subject or object', start, end, index))
+    return errors
 
-        # Check if sentence has at least one verb
-        pos_tags = [tag for _, tag in tagged]
-        verb_tags = {'VB', 'VBD', 'VBG', 'VBN', 'VBP', 'VBZ', 'MD'}
-        has_verb = any(tag in verb_tags for tag in pos_tags)
 
-        # Check if sentence has at least one noun or pronoun
-        noun_tags = {'NN', 'NNS', 'NNP', 'NNPS', 'PRP', 'PRP$', 'WP'}
-        has_noun = any(tag in noun_tags for tag in pos_tags)
+def grammar_errors_from_doc(doc) -> list[GrammarError]:
+    """All grammar errors in an analyzed document, ordered by position."""
+    if not doc.sentences:
+        return []
+    return sorted(_pattern_errors(doc) + _structure_errors(doc), key=lambda e: (e.start, e.end))
 
-        if not has_verb and len(words) > 3:
-            errors += 1
-        if not has_noun and len(words) > 3:
-            errors += 1
 
-    return errors
+def grammar_errors(text: str) -> list[GrammarError]:
+    from core.document import analyze_text
+    return grammar_errors_from_doc(analyze_text(text))
 
 
-def grammar_score(text: str) -> tuple[int, float]:
+def grammar_error_counts_from_doc(doc) -> tuple[int, int]:
+    """Return (total_errors, num_sentences) for an analyzed document; counts from several texts can be summed."""
+    return len(grammar_errors_from_doc(doc)), len(doc.sentences)
+
+
+def grammar_error_counts(text: str) -> tuple[int, int]:
+    from core.document import analyze_text
+    return grammar_error_counts_from_doc(analyze_text(text))
+
+
+def grammar_score_from_counts(total_errors: int, num_sentences: int) -> float:
+    error_rate = total_errors / max(1, num_sentences)
+    grammar_score_value = max(0, 100 - error_rate * 20)  # Same tunable scaling as before
+    return round(grammar_score_value, 2)
+
+
+def grammar_score_from_doc(doc) -> tuple[int, float]:
     """Score grammar using nltk-based heuristic analysis.
 
     Returns (error_count, score) where score is 0-100.
     """
-    if not text or not text.strip():
+    if not doc.sentences:
         return 0, 100.0
 
-    sentences = sent_tokenize(text)
-    num_sentences = max(1, len(sentences))
-
-    # Count errors from regex patterns
-    pattern_errors = _count_pattern_errors(text)
+    total_errors, num_sentences = grammar_error_counts_from_doc(doc)
+    return total_errors, grammar_score_from_counts(total_errors, num_sentences)
 
-    # Count errors from sentence structure analysis
-    structure_errors = _check_sentence_structure(sentences)
 
-    total_errors = pattern_errors + structure_errors
-    error_rate = total_errors / num_sentences
-    grammar_score_value = max(0, 100 - error_rate * 20)  # Same tunable scaling as before
-    return total_errors, round(grammar_score_value, 2)
+def grammar_score(text: str) -> tuple[int, float]:
+    from core.document import analyze_text
+    return grammar_score_from_doc(analyze_text(text))
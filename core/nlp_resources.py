@@ -0,0 +1,79 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# nltk.data path -> package name, for the data NLTK 3.9's sent_tokenize/word_tokenize and
+# pos_tag use. The Dockerfile bakes these in; keep the two lists in sync.
+REQUIRED_NLTK_DATA = {
+    "tokenizers/punkt_tab/english/": "punkt_tab",
+    "taggers/averaged_perceptron_tagger_eng/": "averaged_perceptron_tagger_eng",
+}
+
+_lock = threading.Lock()
+_sentence_tokenizer = None
+_tagger = None
+_load_seconds: float | None = None
+_error: str | None = None
+
+
+def missing_nltk_data() -> list[str]:
+    """Packages of REQUIRED_NLTK_DATA not found on the NLTK data path. Never touches the network."""
+    import nltk
+    missing = []
+    for path, package in REQUIRED_NLTK_DATA.items():
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            missing.append(package)
+    return missing
+
+
+def load_nlp_resources():
+    """Verify the bundled NLTK data and load the sentence tokenizer and POS tagger, once per process.
+
+    Raises LookupError naming the missing packages; nothing is downloaded at runtime.
+    """
+    global _sentence_tokenizer, _tagger, _load_seconds, _error
+    if _tagger is not None:
+        return
+    with _lock:
+        if _tagger is not None:
+            return
+        start = time.perf_counter()
+        missing = missing_nltk_data()
+        if missing:
+            _error = f"NLTK data missing: {', '.join(missing)} (install with: python -m nltk.downloader {' '.join(missing)})"
+            raise LookupError(_error)
+        from nltk.tokenize.punkt import PunktTokenizer
+        from nltk.tag.perceptron import PerceptronTagger
+        _sentence_tokenizer = PunktTokenizer("english")
+        _tagger = PerceptronTagger()
+        _load_seconds = round(time.perf_counter() - start, 3)
+        _error = None
+        logger.info(f"NLP resources loaded in {_load_seconds}s")
+
+
+def sentence_tokenizer():
+    """The shared Punkt sentence tokenizer (loaded on first use if startup didn't)."""
+    load_nlp_resources()
+    return _sentence_tokenizer
+
+
+def pos_tagger():
+    """The shared perceptron POS tagger (loaded on first use if startup didn't)."""
+    load_nlp_resources()
+    return _tagger
+
+
+def nlp_ready() -> bool:
+    return _tagger is not None
+
+
+def nlp_resources_status() -> dict:
+    return {
+        "ready": nlp_ready(),
+        "load_seconds": _load_seconds,
+        "error": _error,
+    }
@@ -1,3 +1,6 @@
+# Bump whenever scoring logic changes so cached evaluations are not reused across versions
+SCORING_VERSION = "4"
+
 def overall_score_f(grammar: float, vocab: float, fluency: float, pronunciation: float, filler_percent: float) -> float:
     filler_penalty = max(0, 100 - filler_percent)
     return round((grammar + vocab + fluency + pronunciation + filler_penalty) / 5.0, 2)
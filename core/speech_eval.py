@@ -1,52 +1,269 @@
+import logging
 import re
-import io
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
 
 def extract_word_and_text(segments: list) -> tuple[list[str], str]:
     words = [w.word.strip() for seg in segments for w in seg.words]
     full_text = " ".join(words)
     return words, full_text
 
-def analyze_pauses_for_fillers(audio_buffer: io.BytesIO, segments: list, pause_threshold: float = 0.3, energy_threshold: int = 250) -> tuple[list[tuple[float, float, float]], int]:
-    from pydub import AudioSegment
-    audio_buffer.seek(0) # Reset buffer to start
-    audio = AudioSegment.from_file(audio_buffer) # Load from buffer
-    silent_pauses = []
-    vocalized_filler_count = 0
-    if not segments or len(segments) < 2:
-        return [], 0
-    for i in range(1, len(segments)):
-        gap_start = float(segments[i - 1].end)
-        gap_end = float(segments[i].start)
-        gap_duration = gap_end - gap_start
-        if gap_duration > pause_threshold:
-            start_ms = int(gap_start * 1000)
-            end_ms = int(gap_end * 1000)
-            gap_audio = audio[start_ms:end_ms]
-            if gap_audio.rms > energy_threshold:
-                vocalized_filler_count += 1
-            else:
-                silent_pauses.append((gap_start, gap_end, gap_duration))
-    return silent_pauses, vocalized_filler_count
-
-def advanced_filler_analysis(full_text: str, vocalized_filler_count: int) -> tuple[dict, float]:
-    import nltk
-    from services.llm import is_filler_in_context
-    POTENTIAL_FILLERS = {"like", "so", "right", "you know", "basically", "actually"}
-    sentences = nltk.sent_tokenize(full_text)
-    contextual_filler_count = 0
+class PauseAnalysis(NamedTuple):
+    silent_pauses: list[tuple[float, float, float]]       # segment-level (start, end, duration)
+    vocalized_fillers: int                                # segment-level gaps with speech energy
+    word_silent_pauses: list[tuple[float, float, float]]  # word-level (start, end, duration)
+    word_vocalized_fillers: int
+
+
+def gap_rms(pcm, gap_starts, gap_ends):
+    """RMS (16-bit amplitude scale) of every [start, end) span in seconds.
+
+    Only the gap samples are read, as views of `pcm`: the cost is proportional to the total
+    gap length, with no allocation over the rest of the audio. Empty spans measure 0.
+    """
+    import numpy as np
+    from services.audio_utils import SAMPLE_RATE
+    i0 = np.clip((np.asarray(gap_starts) * SAMPLE_RATE).astype(np.int64), 0, len(pcm))
+    i1 = np.clip((np.asarray(gap_ends) * SAMPLE_RATE).astype(np.int64), 0, len(pcm))
+    rms = np.zeros(len(i0), dtype=np.float64)
+    for i, (start, end) in enumerate(zip(i0.tolist(), i1.tolist())):
+        if end > start:
+            gap = pcm[start:end]
+            rms[i] = np.sqrt(np.dot(gap, gap) / (end - start))
+    return rms * 32768
+
+
+def analyze_pauses(audio, segments: list, pause_threshold: float = 0.3, energy_threshold: int = 250,
+                   offset: float = 0.0) -> PauseAnalysis:
+    """Find silent pauses and vocalized fillers between segments and between words in one pass.
+
+    Gaps longer than `pause_threshold` seconds are vocalized fillers (uh/um) when their RMS
+    exceeds `energy_threshold`, otherwise silent pauses. `offset` is the time on the segments'
+    timeline at which `audio` starts, when it is a slice; pauses are reported on that timeline.
+    """
+    import numpy as np
+    from core.fluency import segment_gaps, word_gaps
+    from services.audio_utils import decode_audio_pcm
+
+    seg_starts, seg_ends = segment_gaps(segments)
+    word_starts, word_ends = word_gaps(segments)
+    starts = np.concatenate([seg_starts, word_starts])
+    ends = np.concatenate([seg_ends, word_ends])
+    durations = ends - starts
+    is_pause = durations > pause_threshold
+    if not is_pause.any():
+        return PauseAnalysis([], 0, [], 0)
+
+    rms = gap_rms(decode_audio_pcm(audio), starts - offset, ends - offset)
+    vocalized = is_pause & (rms > energy_threshold)
+    silent = is_pause & ~vocalized
+
+    def _pauses(mask) -> list[tuple[float, float, float]]:
+        idx = np.flatnonzero(mask)
+        return list(zip(starts[idx].tolist(), ends[idx].tolist(), durations[idx].tolist()))
+
+    n_seg = len(seg_starts)
+    return PauseAnalysis(
+        silent_pauses=_pauses(np.r_[silent[:n_seg], np.zeros(len(word_starts), dtype=bool)]),
+        vocalized_fillers=int(vocalized[:n_seg].sum()),
+        word_silent_pauses=_pauses(np.r_[np.zeros(n_seg, dtype=bool), silent[n_seg:]]),
+        word_vocalized_fillers=int(vocalized[n_seg:].sum()),
+    )
+
+
+def analyze_pauses_for_fillers(audio, segments: list, pause_threshold: float = 0.3, energy_threshold: int = 250) -> tuple[list[tuple[float, float, float]], int]:
+    """Segment-level (silent_pauses, vocalized_filler_count); see analyze_pauses."""
+    analysis = analyze_pauses(audio, segments, pause_threshold, energy_threshold)
+    return analysis.silent_pauses, analysis.vocalized_fillers
+
+POTENTIAL_FILLERS = {"like", "so", "right", "you know", "basically", "actually"}
+
+# Local verdicts at least this confident are final; the rest are sent to Gemini when it is available
+LOCAL_FILLER_CONFIDENCE = 0.8
+# A silence this long (seconds) right before or after a candidate is a hint that it is a filler
+FILLER_PAUSE_SECONDS = 0.3
+
+_SENTENCE_END = {"", ".", "?", "!"}
+# Tokens are word_tokenize's, so contractions arrive split ("it's" -> "it", "'s")
+_BE_FORMS = {"is", "was", "were", "are", "am", "be", "been", "being", "'s", "'m", "'re"}
+_LIKE_VERBS = {"look", "looks", "looked", "looking", "feel", "feels", "felt", "feeling", "sound", "sounds", "sounded",
+               "seem", "seems", "seemed", "would", "'d", "just", "much", "something", "anything", "nothing"}
+_SO_LITERAL_NEXT = {"that", "much", "many", "far", "long", "on", "forth", "called"}
+_RIGHT_LITERAL_NEXT = {"now", "away", "here", "there", "after", "before", "back", "next", "then", "side", "hand", "answer", "thing", "way", "time"}
+_YOU_KNOW_LITERAL_NEXT = {"what", "how", "that", "where", "why", "who", "when", "if", "whether", "the", "a", "an",
+                          "him", "her", "them", "it", "this", "about", "me", "us"}
+
+def find_filler_candidates_from_doc(doc) -> list[dict]:
+    """Every occurrence of a potential filler phrase, as {"sentence", "sentence_index", "phrase", "offset", "text_offset"}.
+
+    `offset` is the position within the sentence, `text_offset` within the document text (-1
+    if the sentence could not be located).
+    """
+    candidates = []
+    for index, (sentence, sentence_start) in enumerate(zip(doc.sentences, doc.sentence_offsets)):
+        for phrase in POTENTIAL_FILLERS:
+            for match in re.finditer(r"\b" + re.escape(phrase) + r"\b", sentence, re.IGNORECASE):
+                candidates.append({
+                    "sentence": sentence,
+                    "sentence_index": index,
+                    "phrase": phrase,
+                    "offset": match.start(),
+                    "text_offset": sentence_start + match.start() if sentence_start >= 0 else -1,
+                })
+    return candidates
+
+def extract_word_timings(segments: list) -> list[tuple[float, float]]:
+    """(start, end) of every word, aligned with the words of extract_word_and_text."""
+    return [(float(w.start), float(w.end)) for seg in segments for w in seg.words]
+
+def _adjacent_pauses(candidate: dict, full_text: str, word_timings: list[tuple[float, float]] | None) -> tuple[float, float]:
+    """Silence (seconds) just before and just after the candidate phrase, from the word timestamps."""
+    if not word_timings or candidate["text_offset"] < 0:
+        return 0.0, 0.0
+    # full_text is the words joined by single spaces, so the word index is the number of spaces before
+    first = full_text.count(" ", 0, candidate["text_offset"])
+    last = first + len(candidate["phrase"].split()) - 1
+    if last >= len(word_timings):
+        return 0.0, 0.0
+    before = word_timings[first][0] - word_timings[first - 1][1] if first > 0 else 0.0
+    after = word_timings[last + 1][0] - word_timings[last][1] if last + 1 < len(word_timings) else 0.0
+    return max(before, 0.0), max(after, 0.0)
+
+def filler_probability(phrase: str, tokens: list[tuple[str, str, int]], index: int, pause_before: float = 0.0, pause_after: float = 0.0) -> float:
+    """Estimate how likely the phrase starting at tokens[index] is a filler rather than meaningful.
+
+    Uses the POS tags and surroundings of the phrase (sentence-initial, comma-bounded,
+    collocations such as "right now" or "looks like") plus pauses around it in the audio.
+    """
+    n = len(phrase.split())
+    word, tag, _ = tokens[index]
+    prev_word, prev_tag, _ = tokens[index - 1] if index > 0 else ("", "", 0)
+    next_word, next_tag, _ = tokens[index + n] if index + n < len(tokens) else ("", "", 0)
+    prev_word, next_word = prev_word.lower(), next_word.lower()
+
+    initial = index == 0
+    comma_before = prev_word == ","
+    comma_after = next_word == ","
+    final = next_word in _SENTENCE_END
+    bounded = (initial or comma_before) and (comma_after or final)
+
+    p = 0.4
+    if phrase == "like":
+        if prev_word in _LIKE_VERBS or tag.startswith("VB") or prev_tag in ("PRP", "MD", "TO"):
+            p = 0.1
+        elif comma_before and comma_after:
+            p = 0.95
+        elif bounded:
+            p = 0.85
+        elif prev_word in _BE_FORMS or next_tag == "CD":
+            p = 0.8
+        elif prev_tag.startswith("NN") and next_tag in ("DT", "NN", "NNS", "PRP$"):
+            p = 0.25
+    elif phrase == "so":
+        if next_word in _SO_LITERAL_NEXT or prev_word in ("and", "or", "not", "do", "did", "think", "hope"):
+            p = 0.1
+        elif next_tag.startswith("JJ") or next_tag.startswith("RB"):
+            p = 0.15
+        elif initial and comma_after:
+            p = 0.85
+        elif bounded:
+            p = 0.8
+        elif comma_before:
+            p = 0.25
+        elif initial:
+            p = 0.55
+    elif phrase == "right":
+        if next_word in _RIGHT_LITERAL_NEXT or next_tag.startswith("NN"):
+            p = 0.1
+        elif next_word == "?" or (comma_before and final):
+            p = 0.85
+        elif initial and comma_after:
+            p = 0.85
+        elif prev_tag.startswith("VB") or prev_tag == "DT" or prev_word in _BE_FORMS:
+            p = 0.15
+    elif phrase == "you know":
+        if next_word in _YOU_KNOW_LITERAL_NEXT or next_tag.startswith("NN"):
+            p = 0.15
+        elif bounded:
+            p = 0.9
+        elif comma_before or comma_after:
+            p = 0.8
+    elif phrase in ("basically", "actually"):
+        if comma_before and comma_after:
+            p = 0.9
+        elif initial and comma_after:
+            p = 0.85
+        elif initial or final:
+            p = 0.6
+        elif next_tag.startswith("JJ") or next_tag.startswith("VB"):
+            p = 0.3
+
+    if max(pause_before, pause_after) >= FILLER_PAUSE_SECONDS and 0.15 < p < 0.9:
+        p = min(p + 0.15, 0.9)
+    return p
+
+def classify_filler_candidates_from_doc(doc, candidates: list[dict], word_timings: list[tuple[float, float]] | None = None) -> list[tuple[bool, float]]:
+    """Local (is_filler, confidence) for every candidate of `doc`, from POS tags, position and pauses."""
+    tagged = {}
+    verdicts = []
+    for candidate in candidates:
+        sentence_index = candidate["sentence_index"]
+        if sentence_index not in tagged:
+            tagged[sentence_index] = doc.tagged(sentence_index)
+        tokens = tagged[sentence_index]
+        index = next((i for i, (_, _, start) in enumerate(tokens) if start == candidate["offset"]), None)
+        if index is None:
+            verdicts.append((False, 0.0))
+            continue
+        pause_before, pause_after = _adjacent_pauses(candidate, doc.text, word_timings)
+        p = filler_probability(candidate["phrase"], tokens, index, pause_before, pause_after)
+        verdicts.append((p >= 0.5, max(p, 1 - p)))
+    return verdicts
+
+def local_filler_verdicts_from_doc(doc, word_timings: list[tuple[float, float]] | None = None) -> list[dict]:
+    """Filler candidates of the document, each with its local "is_filler" verdict and "confidence"."""
+    candidates = find_filler_candidates_from_doc(doc)
+    if candidates:
+        for candidate, (is_filler, confidence) in zip(candidates, classify_filler_candidates_from_doc(doc, candidates, word_timings)):
+            candidate["is_filler"] = is_filler
+            candidate["confidence"] = confidence
+    return candidates
+
+async def resolve_filler_counts(candidates: list[dict]) -> dict[str, int]:
+    """Count the fillers among locally classified candidates.
+
+    Only candidates below LOCAL_FILLER_CONFIDENCE are sent to Gemini, and the local verdict
+    stands whenever Gemini gives no answer.
+    """
+    from services.llm import classify_fillers_batch
+    verdicts = [candidate["is_filler"] for candidate in candidates]
+    ambiguous = [i for i, candidate in enumerate(candidates) if candidate["confidence"] < LOCAL_FILLER_CONFIDENCE]
+    if ambiguous:
+        for i, is_filler in zip(ambiguous, await classify_fillers_batch([candidates[i] for i in ambiguous])):
+            if is_filler is not None:
+                verdicts[i] = is_filler
+    if candidates:
+        logger.info(f"Filler candidates: {len(candidates)}, resolved locally: {len(candidates) - len(ambiguous)}, ambiguous: {len(ambiguous)}")
+
     filler_details = {}
+    for candidate, is_filler in zip(candidates, verdicts):
+        if is_filler:
+            filler_details[candidate["phrase"]] = filler_details.get(candidate["phrase"], 0) + 1
+    return filler_details
 
-    for phrase in POTENTIAL_FILLERS:
-        for sentence in sentences:
-            if re.search(r"\b" + re.escape(phrase) + r"\b", sentence, re.IGNORECASE):
-                if is_filler_in_context(sentence, phrase):
-                    contextual_filler_count += 1
-                    filler_details[phrase] = filler_details.get(phrase, 0) + 1
-    
-    total_fillers = contextual_filler_count + vocalized_filler_count
+def filler_summary(contextual_details: dict[str, int], vocalized_filler_count: int, total_words: int) -> tuple[dict, float]:
+    """Combine contextual and vocalized filler counts into (filler_details, filler_percent)."""
+    filler_details = dict(contextual_details)
+    total_fillers = sum(contextual_details.values()) + vocalized_filler_count
     if vocalized_filler_count > 0:
         filler_details["uh/um (vocalized)"] = vocalized_filler_count
 
-    total_words = len(full_text.split())
     filler_percent = round(100 * total_fillers / max(1, total_words), 2)
     return filler_details, filler_percent
+
+async def advanced_filler_analysis(full_text: str, vocalized_filler_count: int, word_timings: list[tuple[float, float]] | None = None) -> tuple[dict, float]:
+    from core.document import analyze_text
+    doc = analyze_text(full_text)
+    contextual = await resolve_filler_counts(local_filler_verdicts_from_doc(doc, word_timings))
+    return filler_summary(contextual, vocalized_filler_count, doc.word_count)
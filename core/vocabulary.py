@@ -1,34 +1,56 @@
-import nltk
 from lexical_diversity import lex_div as ld
 
-nltk.download('punkt', quiet=True)
-nltk.download('stopwords', quiet=True)
-
-cefr_wordlist = {
-    'A1': set([
-        'about', 'above', 'actor', 'apple', 'area', 'arm', 'ask', 'at', 'aunt', 'away'
-    ]),
-    'A2': set([
-        'ability', 'accept', 'accident', 'adult', 'advice', 'afraid', 'airplane', 'allow'
-    ]),
-    'B1': set([
-        'absolutely', 'academic', 'according', 'achieve', 'act', 'active', 'actual', 'addition'
-    ]),
-    'B2': set([
-        'abandon', 'abstract', 'academic', 'access', 'accurate', 'adapt', 'adjust', 'advocate'
-    ]),
-    'C1': set([]),
-    'C2': set([])
-}
+# Distinct C1/C2 words add up to this many points on top of the type-token ratio
+MAX_ADVANCED_BONUS = 10
+
+def vocabulary_tokens_from_doc(doc) -> list[str]:
+    return doc.lower_tokens()
+
+def vocabulary_tokens(text: str) -> list[str]:
+    from core.document import analyze_text
+    return vocabulary_tokens_from_doc(analyze_text(text, tag=False))
+
+def vocabulary_profile(tokens: list[str]) -> dict:
+    """Vocabulary score with its parts: type-token ratio, C1/C2 bonus and word counts per CEFR level.
+
+    Levels come from the CEFR lexicon index (core.cefr_lexicon); only alphabetic tokens are
+    counted, and words not in the lexicon are counted as "unlisted". Without an installed
+    lexicon the score is the type-token ratio alone and "cefr_levels" is None.
+    """
+    from core.cefr_lexicon import CEFR_LEVELS, lexicon_available, token_levels
+    import numpy as np
+    if not lexicon_available():
+        ttr_score = round(ld.ttr(tokens) * 100, 2) if tokens else 0.0
+        return {"score": min(100, ttr_score), "ttr": ttr_score, "advanced_bonus": 0, "cefr_levels": None}
+
+    words = [token for token in tokens if token.isalpha()]
+    levels = token_levels(words) if words else np.zeros(0, dtype=np.uint8)
+    counts = np.bincount(levels, minlength=len(CEFR_LEVELS) + 1)
+    cefr_levels = {level: int(counts[code]) for code, level in enumerate(CEFR_LEVELS, start=1)}
+    cefr_levels["unlisted"] = int(counts[0])
 
-def vocabulary_score(text: str) -> float:
-    tokens = nltk.word_tokenize(text.lower())
     if not tokens:
-        return 0.0
+        return {"score": 0.0, "ttr": 0.0, "advanced_bonus": 0, "cefr_levels": cefr_levels}
     ttr_score = round(ld.ttr(tokens) * 100, 2)
 
-    advanced_words = [word for word in tokens if word in cefr_wordlist.get('C1', []) or word in cefr_wordlist.get('C2', [])]
-    bonus = min(10, len(set(advanced_words)))
+    advanced_words = {word for word, level in zip(words, levels) if level >= 5}
+    bonus = min(MAX_ADVANCED_BONUS, len(advanced_words))
 
-    vocab_score_value = min(100, ttr_score + bonus)
-    return vocab_score_value
+    return {
+        "score": min(100, ttr_score + bonus),
+        "ttr": ttr_score,
+        "advanced_bonus": bonus,
+        "cefr_levels": cefr_levels,
+    }
+
+def vocabulary_score_from_tokens(tokens: list[str]) -> float:
+    return vocabulary_profile(tokens)["score"]
+
+def vocabulary_profile_from_doc(doc) -> dict:
+    return vocabulary_profile(vocabulary_tokens_from_doc(doc))
+
+def vocabulary_score_from_doc(doc) -> float:
+    return vocabulary_score_from_tokens(vocabulary_tokens_from_doc(doc))
+
+def vocabulary_score(text: str) -> float:
+    return vocabulary_score_from_tokens(vocabulary_tokens(text))
@@ -3,6 +3,7 @@ import os
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from api.routes import router
 from config.settings import Settings
@@ -19,7 +20,33 @@ async def lifespan(app: FastAPI):
         logger.warning("Missing critical env vars: %s — AI features will be disabled", missing)
     else:
         logger.info("All critical env vars loaded (GOOGLE_API_KEY is set)")
+
+    from services.llm import init_llm, shutdown_llm
+    init_llm()
+
+    # Maps the index, and logs an error when a required lexicon is missing
+    from core.cefr_lexicon import lexicon_status
+    lexicon_status()
+
+    from services.opening_pool import start_opening_pool, stop_opening_pool
+    start_opening_pool()
+
+    from services.asr_pool import start_pool, shutdown_pool
+    try:
+        await start_pool()
+    except Exception as e:
+        logger.error(f"Whisper model preload failed, it will be loaded on first request: {e}")
+
+    # NLP resources, plots, PDF, a dummy transcription...; /ready stays 503 until it is done
+    from services.warmup import start_warmup, stop_warmup
+    start_warmup()
     yield
+    from services.asr_scheduler import shutdown_scheduler
+    await stop_warmup()
+    await stop_opening_pool()
+    await shutdown_scheduler()
+    shutdown_pool()
+    await shutdown_llm()
 
 
 app = FastAPI(title="Voke AI Speech Evaluation API", version="1.1.0", lifespan=lifespan)
@@ -40,6 +67,39 @@ def root():
 async def health_check():
     return {"status": "ok"}
 
+@app.get("/ready")
+async def readiness_check():
+    """200 once the startup warm-up has finished and the NLP resources and CEFR lexicon are loaded, 503 until then."""
+    from core.nlp_resources import nlp_resources_status
+    from core.cefr_lexicon import lexicon_status
+    from services.warmup import warmup_finished, warmup_status
+    nlp = nlp_resources_status()
+    cefr = lexicon_status()
+    ready = nlp["ready"] and cefr["ready"] and warmup_finished()
+    return JSONResponse(
+        {"ready": ready, "nlp": nlp, "cefr_lexicon": cefr, "warmup": warmup_status()},
+        status_code=200 if ready else 503,
+    )
+
+@app.get("/metrics")
+async def metrics():
+    from services.asr_scheduler import get_scheduler
+    from services.result_cache import transcription_cache, evaluation_cache
+    from services.llm import llm_cache_stats, llm_call_stats
+    from services.opening_pool import opening_pool_stats
+    from services.clip_store import clip_store_stats
+    return {
+        "asr": get_scheduler().stats(),
+        "result_cache": {
+            "transcriptions": transcription_cache.stats(),
+            "evaluations": evaluation_cache.stats(),
+        },
+        "llm": llm_call_stats(),
+        "llm_cache": llm_cache_stats(),
+        "opening_pool": opening_pool_stats(),
+        "clip_store": clip_store_stats(),
+    }
+
 app.include_router(router)
 
 if __name__ == "__main__":
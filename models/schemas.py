@@ -44,6 +44,7 @@ class LiveEndResponse(BaseModel):
     metrics: dict
     transcription: str
     pdf_filename: Optional[str] = None
+    evaluation_id: Optional[str] = None
     warnings: list[str] = []
 
 # Companion mode schemas
@@ -79,4 +80,14 @@ class CompanionEndResponse(BaseModel):
     metrics: dict
     transcription: str
     pdf_filename: Optional[str] = None
+    evaluation_id: Optional[str] = None
     warnings: list[str] = []
+
+# Gemini structured output schemas
+class LineImprovement(BaseModel):
+    index: int  # position of the transcript segment
+    improved: str
+
+class SessionFeedback(BaseModel):
+    improvements: list[LineImprovement]
+    summary_points: list[str]
@@ -1,55 +1,52 @@
-import io
-import os
-import shutil
+import asyncio
+
 
 async def live_conversation_pipeline(name: str, session: dict):
     """Evaluate the full Live conversation after the session ends.
 
-    Audio chunks from each turn are stored as individual valid WAV files.
-    We concatenate them via pydub so the combined buffer is a valid audio file.
+    Each turn's audio was decoded on arrival and appended to the session's PCM buffer, with
+    segment timestamps already on that shared timeline. Grammar, vocabulary, filler, pause
+    and pronunciation inputs were extracted per turn in the background while the
+    conversation went on, so here they are only aggregated. The feedback call, plots and clip
+    encoding then run concurrently (CPU work in the default executor) ahead of the PDF.
     """
-    from core.speech_eval import extract_word_and_text, analyze_pauses_for_fillers, advanced_filler_analysis
-    from core.grammar import grammar_score
-    from core.vocabulary import vocabulary_score
-    from core.fluency import fluency_score_f, compute_wpm_over_time
-    from core.pronunciation import extract_word_audio_clips, pronunciation_score_f, find_mispronounced_words, WORD_CLIPS_TEMP_DIR
+    from core.speech_eval import extract_word_and_text, filler_summary
+    from core.grammar import grammar_score_from_counts
+    from core.vocabulary import vocabulary_profile
+    from core.fluency import fluency_score_f
+    from core.pronunciation import pronunciation_score_f, find_mispronounced_words
     from core.scoring import overall_score_f, cefr_score
-    from services.llm import improve_fluency_by_line, generate_report_summary_text
-    from services.visualization import plot_pentagon, plot_fluency_curve
+    from services.llm import generate_session_feedback
+    from services.visualization import plot_pentagon
     from reports.pdf_generator import generate_report
-    from pydub import AudioSegment
+    from pipelines.turn_features import collect_turn_features, aggregate_turn_features
+    from pipelines.stages import fluency_curve, save_word_clips
 
     segments = session["segments_all"]
     if not segments:
         return None
 
-    # Concatenate audio chunks into one valid AudioSegment, then export to a buffer
-    combined_segment = None
-    for chunk_bytes in session["audio_chunks"]:
-        seg = AudioSegment.from_file(io.BytesIO(chunk_bytes))
-        combined_segment = seg if combined_segment is None else combined_segment + seg
-
-    if combined_segment is None:
+    if not len(session["audio"]):
         return None
+    pcm = session["audio"].view()
+    loop = asyncio.get_running_loop()
 
-    combined_buffer = io.BytesIO()
-    combined_segment.export(combined_buffer, format="wav")
-    combined_audio_bytes = combined_buffer.getvalue()
-
+    features = aggregate_turn_features(await collect_turn_features(session))
     words, full_text = extract_word_and_text(segments)
     duration_seconds = segments[-1].end if segments else 0
 
-    silent_pauses, vocalized_fillers = analyze_pauses_for_fillers(io.BytesIO(combined_audio_bytes), segments)
-    wpm = (len(words) / (duration_seconds / 60.0)) if duration_seconds > 0 else 0
+    silent_pauses = features["silent_pauses"]
+    wpm = (features["word_count"] / (duration_seconds / 60.0)) if duration_seconds > 0 else 0
 
-    filler_data, filler_percent = advanced_filler_analysis(full_text, vocalized_fillers)
+    filler_data, filler_percent = filler_summary(features["contextual_fillers"], features["vocalized_fillers"], features["text_word_count"])
 
-    grammar_errs, grammar_score_val = grammar_score(full_text)
-    vocab_score = vocabulary_score(full_text)
+    grammar_score_val = grammar_score_from_counts(features["grammar_errors"], features["sentence_count"]) if features["sentence_count"] else 100.0
+    vocab_profile = await loop.run_in_executor(None, vocabulary_profile, features["vocab_tokens"])
+    vocab_score = vocab_profile["score"]
     fluency_score = fluency_score_f(wpm, silent_pauses, duration_seconds)
 
-    clips = extract_word_audio_clips(io.BytesIO(combined_audio_bytes), segments)
-    pronunciation_score = pronunciation_score_f(clips)
+    word_spans = features["word_spans"]
+    pronunciation_score = pronunciation_score_f(word_spans)
 
     overall_score = overall_score_f(grammar_score_val, vocab_score, fluency_score, pronunciation_score, filler_percent)
     filler_score = int(filler_percent)
@@ -62,29 +59,26 @@ async def live_conversation_pipeline(name: str, session: dict):
     filler_cefr = cefr_score(filler_score)
 
     segments_dict = [{"text": getattr(seg, "text", "")} for seg in segments]
-    improved_lines = improve_fluency_by_line(segments_dict)
-
-    mispronounced = find_mispronounced_words(clips)
-
-    pentagon_plot_base64 = plot_pentagon([
-        grammar_score_val,
-        vocab_score,
-        fluency_score,
-        pronunciation_score,
-        max(0, 100 - filler_percent)
-    ])
-
-    time_points, wpm_values = compute_wpm_over_time(segments, total_time=duration_seconds)
-    fluency_plot_base64 = plot_fluency_curve(time_points, wpm_values)
-
-    summary_points = generate_report_summary_text(
-        transcript=full_text,
-        overall_score=overall_score,
-        grammar_score=grammar_score_val,
-        vocabulary_score=vocab_score,
-        fluency_score=fluency_score,
-        pronunciation_score=pronunciation_score,
-        filler_word_score=filler_score
+    (improved_lines, summary_points), pentagon_plot_base64, (time_points, wpm_values, fluency_plot_base64), (evaluation_id, mispronounced) = await asyncio.gather(
+        generate_session_feedback(
+            segments_dict,
+            transcript=full_text,
+            overall_score=overall_score,
+            grammar_score=grammar_score_val,
+            vocabulary_score=vocab_score,
+            fluency_score=fluency_score,
+            pronunciation_score=pronunciation_score,
+            filler_word_score=filler_score
+        ),
+        loop.run_in_executor(None, plot_pentagon, [
+            grammar_score_val,
+            vocab_score,
+            fluency_score,
+            pronunciation_score,
+            max(0, 100 - filler_percent)
+        ]),
+        loop.run_in_executor(None, fluency_curve, segments, duration_seconds),
+        loop.run_in_executor(None, save_word_clips, pcm, word_spans, find_mispronounced_words(word_spans)),
     )
 
     summary_html = "<ul>" + "".join(f"<li>{p}</li>" for p in summary_points) + "</ul>"
@@ -106,29 +100,24 @@ async def live_conversation_pipeline(name: str, session: dict):
         for t, w in zip(time_points, wpm_values)
     ]
 
-    try:
-        return {
-            "pdf_bytes_io": pdf_bytes_io,
-            "pdf_filename": pdf_filename,
-            "overall_score": overall_score,
-            "grammar_score": grammar_score_val,
-            "vocabulary_score": vocab_score,
-            "fluency_score": fluency_score,
-            "pronunciation_score": pronunciation_score,
-            "filler_score": filler_score,
-            "improved_lines": improved_lines,
-            "mispronounced_words": mispronounced,
-            "summary_points": summary_points,
-            "words_per_minute": round(wpm, 1),
-            "word_count": len(words),
-            "pause_count": len(silent_pauses),
-            "filler_words_data": filler_data,
-            "fluency_over_time": fluency_over_time,
-            "full_text": full_text,
-        }
-    finally:
-        if os.path.exists(WORD_CLIPS_TEMP_DIR):
-            try:
-                shutil.rmtree(WORD_CLIPS_TEMP_DIR)
-            except Exception as e:
-                print(f"Error cleaning up word clips: {e}")
+    return {
+        "pdf_bytes_io": pdf_bytes_io,
+        "pdf_filename": pdf_filename,
+        "overall_score": overall_score,
+        "grammar_score": grammar_score_val,
+        "vocabulary_score": vocab_score,
+        "vocabulary_levels": vocab_profile["cefr_levels"],
+        "fluency_score": fluency_score,
+        "pronunciation_score": pronunciation_score,
+        "filler_score": filler_score,
+        "improved_lines": improved_lines,
+        "mispronounced_words": mispronounced,
+        "evaluation_id": evaluation_id,
+        "summary_points": summary_points,
+        "words_per_minute": round(wpm, 1),
+        "word_count": features["word_count"],
+        "pause_count": len(silent_pauses),
+        "filler_words_data": filler_data,
+        "fluency_over_time": fluency_over_time,
+        "full_text": full_text,
+    }
@@ -0,0 +1,19 @@
+"""Report stages shared by the topical and conversation pipelines; all run in executor threads."""
+
+
+def fluency_curve(segments: list, duration_seconds: float) -> tuple[list[float], list[float], str]:
+    """WPM over time and its plot, as (time_points, wpm_values, plot_base64)."""
+    from core.fluency import compute_wpm_over_time
+    from services.visualization import plot_fluency_curve
+    time_points, wpm_values = compute_wpm_over_time(segments, total_time=duration_seconds)
+    return time_points, wpm_values, plot_fluency_curve(time_points, wpm_values)
+
+
+def save_word_clips(pcm, word_spans: list, mispronounced: list[tuple[str, int]]) -> tuple[str, list[tuple[str, str]]]:
+    """Store the evaluation audio for clip replay; returns (evaluation_id, [(word, clip_url)])."""
+    from core.pronunciation import materialize_word_clips
+    from services.clip_store import save_evaluation_audio, clip_url
+    # Only the flagged words get their audio encoded up front; any other word is sliced on demand
+    word_clips = materialize_word_clips(pcm, word_spans, [index for _, index in mispronounced])
+    evaluation_id = save_evaluation_audio(pcm, word_spans, word_clips)
+    return evaluation_id, [(word, clip_url(evaluation_id, index)) for word, index in mispronounced]
@@ -1,39 +1,113 @@
-import os
-import shutil
-import io
+import asyncio
 
-async def topical_speech_pipeline(name: str, audio_path: str, segments: list, duration_seconds: float):
-    from core.speech_eval import extract_word_and_text, analyze_pauses_for_fillers, advanced_filler_analysis
-    from core.grammar import grammar_score
-    from core.vocabulary import vocabulary_score
-    from core.fluency import fluency_score_f, compute_wpm_over_time
-    from core.pronunciation import extract_word_audio_clips, pronunciation_score_f, find_mispronounced_words, WORD_CLIPS_TEMP_DIR
+
+async def topical_speech_pipeline(name: str, pcm, segments: list, duration_seconds: float):
+    """Score a topical recording.
+
+    `pcm` is the upload decoded once to 16 kHz mono float32; Whisper has already consumed it,
+    and pause analysis and pronunciation work on slices of the same array.
+
+    Independent stages run concurrently: CPU-bound scorers and plots in the default executor,
+    Gemini calls on the event loop. The fluency curve overlaps the whole scoring chain; the
+    feedback call (line improvements and summary), pentagon plot and PDF wait on the scores.
+    """
+    from core.document import analyze_text
+    from core.speech_eval import extract_word_and_text, extract_word_timings, analyze_pauses_for_fillers, local_filler_verdicts_from_doc, resolve_filler_counts, filler_summary
+    from core.grammar import grammar_score_from_doc
+    from core.vocabulary import vocabulary_profile_from_doc
+    from core.fluency import fluency_score_f
+    from core.pronunciation import extract_word_spans, pronunciation_score_f, find_mispronounced_words
     from core.scoring import overall_score_f, cefr_score
-    from services.llm import improve_fluency_by_line, generate_report_summary_text
-    from services.visualization import plot_pentagon, plot_fluency_curve
+    from services.llm import generate_session_feedback
+    from services.visualization import plot_pentagon
     from reports.pdf_generator import generate_report
+    from pipelines.stages import fluency_curve, save_word_clips
 
+    loop = asyncio.get_running_loop()
     words, full_text = extract_word_and_text(segments)
-
-    # Read audio content once into an in-memory buffer
-    with open(audio_path, "rb") as f:
-        audio_content = f.read()
-    
-    # Pass separate BytesIO objects to avoid state sharing/interference
-    silent_pauses, vocalized_fillers = analyze_pauses_for_fillers(io.BytesIO(audio_content), segments)
     wpm = (len(words) / (segments[-1].end / 60.0)) if segments and segments[-1].end > 0 else 0
-    
-    filler_data, filler_percent = advanced_filler_analysis(full_text, vocalized_fillers)
+    segments_dict = [{"text": getattr(seg, "text", "")} for seg in segments]
 
-    grammar_errs, grammar_score_val = grammar_score(full_text)
-    vocab_score = vocabulary_score(full_text)
-    fluency_score = fluency_score_f(wpm, silent_pauses, duration_seconds)
-    
-    clips = extract_word_audio_clips(io.BytesIO(audio_content), segments)
-    pronunciation_score = pronunciation_score_f(clips)
-    
-    overall_score = overall_score_f(grammar_score_val, vocab_score, fluency_score, pronunciation_score, filler_percent)
-    filler_score = int(filler_percent)
+    async def _text_scores() -> tuple:
+        # Tokenized and tagged once; grammar, vocabulary and filler scoring share the document
+        doc = await loop.run_in_executor(None, analyze_text, full_text)
+        candidates, grammar_result, vocab_profile = await asyncio.gather(
+            loop.run_in_executor(None, local_filler_verdicts_from_doc, doc, extract_word_timings(segments)),
+            loop.run_in_executor(None, grammar_score_from_doc, doc),
+            loop.run_in_executor(None, vocabulary_profile_from_doc, doc),
+        )
+        return await resolve_filler_counts(candidates), grammar_result, vocab_profile, doc.word_count
+
+    async def _scored() -> dict:
+        (silent_pauses, vocalized_fillers), (contextual_fillers, (_, grammar_score_val), vocab_profile, text_word_count), word_spans = await asyncio.gather(
+            loop.run_in_executor(None, analyze_pauses_for_fillers, pcm, segments),
+            _text_scores(),
+            loop.run_in_executor(None, extract_word_spans, segments),
+        )
+        filler_data, filler_percent = filler_summary(contextual_fillers, vocalized_fillers, text_word_count)
+        vocab_score = vocab_profile["score"]
+        fluency_score = fluency_score_f(wpm, silent_pauses, duration_seconds)
+        pronunciation_score = pronunciation_score_f(word_spans)
+        overall_score = overall_score_f(grammar_score_val, vocab_score, fluency_score, pronunciation_score, filler_percent)
+        filler_score = int(filler_percent)
+
+        (improved_lines, summary_points), pentagon_plot_base64, (evaluation_id, mispronounced) = await asyncio.gather(
+            generate_session_feedback(
+                segments_dict,
+                transcript=full_text,
+                overall_score=overall_score,
+                grammar_score=grammar_score_val,
+                vocabulary_score=vocab_score,
+                fluency_score=fluency_score,
+                pronunciation_score=pronunciation_score,
+                filler_word_score=filler_score
+            ),
+            loop.run_in_executor(None, plot_pentagon, [
+                grammar_score_val,
+                vocab_score,
+                fluency_score,
+                pronunciation_score,
+                max(0, 100 - filler_percent)
+            ]),
+            loop.run_in_executor(None, save_word_clips, pcm, word_spans, find_mispronounced_words(word_spans)),
+        )
+        return {
+            "silent_pauses": silent_pauses,
+            "filler_data": filler_data,
+            "grammar_score": grammar_score_val,
+            "vocab_score": vocab_score,
+            "vocab_levels": vocab_profile["cefr_levels"],
+            "fluency_score": fluency_score,
+            "pronunciation_score": pronunciation_score,
+            "overall_score": overall_score,
+            "filler_score": filler_score,
+            "improved_lines": improved_lines,
+            "summary_points": summary_points,
+            "pentagon_plot_base64": pentagon_plot_base64,
+            "evaluation_id": evaluation_id,
+            "mispronounced": mispronounced,
+            "word_spans": word_spans,
+        }
+
+    (time_points, wpm_values, fluency_plot_base64), scored = await asyncio.gather(
+        loop.run_in_executor(None, fluency_curve, segments, duration_seconds),
+        _scored(),
+    )
+
+    silent_pauses = scored["silent_pauses"]
+    filler_data = scored["filler_data"]
+    grammar_score_val = scored["grammar_score"]
+    vocab_score = scored["vocab_score"]
+    vocab_levels = scored["vocab_levels"]
+    fluency_score = scored["fluency_score"]
+    pronunciation_score = scored["pronunciation_score"]
+    overall_score = scored["overall_score"]
+    filler_score = scored["filler_score"]
+    improved_lines = scored["improved_lines"]
+    summary_points = scored["summary_points"]
+    pentagon_plot_base64 = scored["pentagon_plot_base64"]
+    evaluation_id = scored["evaluation_id"]
+    mispronounced = scored["mispronounced"]
 
     overall_cefr = cefr_score(overall_score)
     grammer_cefr = cefr_score(grammar_score_val)
@@ -42,32 +116,6 @@ async def topical_speech_pipeline(name: str, audio_path: str, segments: list, du
     pronunciation_cefr = cefr_score(pronunciation_score)
     filler_cefr = cefr_score(filler_score)
 
-    segments_dict = [{"text": getattr(seg, "text", "")} for seg in segments]
-    improved_lines = improve_fluency_by_line(segments_dict)
-
-    mispronounced = find_mispronounced_words(clips)
-    
-    pentagon_plot_base64 = plot_pentagon([
-        grammar_score_val,
-        vocab_score,
-        fluency_score,
-        pronunciation_score,
-        max(0, 100 - filler_percent)
-    ])
-    
-    time_points, wpm_values = compute_wpm_over_time(segments, total_time=duration_seconds)
-    fluency_plot_base64 = plot_fluency_curve(time_points, wpm_values)
-
-    summary_points = generate_report_summary_text(
-        transcript=full_text,
-        overall_score=overall_score,
-        grammar_score=grammar_score_val,
-        vocabulary_score=vocab_score,
-        fluency_score=fluency_score,
-        pronunciation_score=pronunciation_score,
-        filler_word_score=filler_score
-    )
-    
     summary_html = "<ul>" + "".join(f"<li>{p}</li>" for p in summary_points) + "</ul>"
 
     pdf_bytes_io, pdf_filename = await generate_report(
@@ -88,29 +136,24 @@ async def topical_speech_pipeline(name: str, audio_path: str, segments: list, du
         for t, w in zip(time_points, wpm_values)
     ]
 
-    try:
-        return {
-            "pdf_bytes_io": pdf_bytes_io,
-            "pdf_filename": pdf_filename,
-            "overall_score": overall_score,
-            "grammar_score": grammar_score_val,
-            "vocabulary_score": vocab_score,
-            "fluency_score": fluency_score,
-            "pronunciation_score": pronunciation_score,
-            "filler_score": filler_score,
-            "improved_lines": improved_lines,
-            "mispronounced_words": mispronounced,
-            "summary_points": summary_points,
-            "words_per_minute": round(wpm, 1),
-            "word_count": len(words),
-            "pause_count": len(silent_pauses),
-            "filler_words_data": filler_data,
-            "fluency_over_time": fluency_over_time,
-        }
-    finally:
-        # Clean up the word_clips directory
-        if os.path.exists(WORD_CLIPS_TEMP_DIR):
-            try:
-                shutil.rmtree(WORD_CLIPS_TEMP_DIR)
-            except Exception as e:
-                print(f"Error cleaning up word clips: {e}")
+    return {
+        "pdf_bytes_io": pdf_bytes_io,
+        "pdf_filename": pdf_filename,
+        "overall_score": overall_score,
+        "grammar_score": grammar_score_val,
+        "vocabulary_score": vocab_score,
+        "vocabulary_levels": vocab_levels,
+        "fluency_score": fluency_score,
+        "pronunciation_score": pronunciation_score,
+        "filler_score": filler_score,
+        "improved_lines": improved_lines,
+        "mispronounced_words": mispronounced,
+        "evaluation_id": evaluation_id,
+        "word_spans": [(span.word, span.start, span.end) for span in scored["word_spans"]],
+        "summary_points": summary_points,
+        "words_per_minute": round(wpm, 1),
+        "word_count": len(words),
+        "pause_count": len(silent_pauses),
+        "filler_words_data": filler_data,
+        "fluency_over_time": fluency_over_time,
+    }
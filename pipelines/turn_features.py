@@ -0,0 +1,97 @@
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def turn_audio(segments: list, pcm):
+    """(slice, offset): the part of the session buffer `pcm` spanned by the turn's segments and
+    the session time in seconds at which it starts, so per-turn audio work doesn't grow with the session."""
+    from services.audio_utils import SAMPLE_RATE
+    start = max(int(min(float(seg.start) for seg in segments) * SAMPLE_RATE), 0)
+    end = int(max(float(seg.end) for seg in segments) * SAMPLE_RATE) + 1
+    return pcm[start:end], start / SAMPLE_RATE
+
+
+def extract_turn_features(segments: list, pcm) -> dict:
+    """Compute the per-turn inputs of every score that can be summed across turns.
+
+    `segments` are the turn's segments on the session timeline and `pcm` a view of the
+    session buffer that already contains the turn's audio. Filler candidates come back with
+    their local verdicts under "filler_candidates"; the ambiguous ones still need Gemini.
+    """
+    from core.document import analyze_text
+    from core.speech_eval import extract_word_and_text, extract_word_timings, analyze_pauses, local_filler_verdicts_from_doc
+    from core.grammar import grammar_error_counts_from_doc
+    from core.vocabulary import vocabulary_tokens_from_doc
+    from core.pronunciation import extract_word_spans
+
+    words, text = extract_word_and_text(segments)
+    doc = analyze_text(text)
+    grammar_errors, sentence_count = grammar_error_counts_from_doc(doc)
+    turn_pcm, offset = turn_audio(segments, pcm)
+    pauses = analyze_pauses(turn_pcm, segments, offset=offset)
+    return {
+        "word_count": len(words),
+        "text_word_count": doc.word_count,
+        "grammar_errors": grammar_errors,
+        "sentence_count": sentence_count,
+        "vocab_tokens": vocabulary_tokens_from_doc(doc),
+        "filler_candidates": local_filler_verdicts_from_doc(doc, extract_word_timings(segments)),
+        "silent_pauses": pauses.silent_pauses,
+        "vocalized_fillers": pauses.vocalized_fillers,
+        "word_spans": extract_word_spans(segments),
+    }
+
+
+async def compute_turn_features(segments: list, pcm) -> dict:
+    """CPU-bound extraction in the default executor, then the async Gemini filler checks.
+
+    Runs in the background of a turn request, so that request's LLM deadline doesn't apply.
+    """
+    from core.speech_eval import resolve_filler_counts
+    from services.llm import no_llm_deadline
+    features = await asyncio.get_running_loop().run_in_executor(None, extract_turn_features, segments, pcm)
+    with no_llm_deadline():
+        features["contextual_fillers"] = await resolve_filler_counts(features.pop("filler_candidates"))
+    return features
+
+
+def schedule_turn_features(session: dict, segments: list):
+    """Start feature extraction for a just-recorded user turn in the background."""
+    if not segments:
+        return
+    # Snapshot of the buffer: later appends may reallocate it, this view stays valid
+    pcm = session["audio"].view()
+    task = asyncio.ensure_future(compute_turn_features(segments, pcm))
+    session.setdefault("turn_features", []).append((segments, pcm, task))
+
+
+async def collect_turn_features(session: dict) -> list[dict]:
+    """Wait for every scheduled turn's features; turns whose extraction failed are redone inline."""
+    features = []
+    for segments, pcm, task in session.get("turn_features", []):
+        try:
+            features.append(await task)
+        except Exception as e:
+            logger.warning(f"Background turn feature extraction failed, recomputing: {e}")
+            features.append(await compute_turn_features(segments, pcm))
+    return features
+
+
+def aggregate_turn_features(features: list[dict]) -> dict:
+    contextual_fillers = {}
+    for f in features:
+        for phrase, count in f["contextual_fillers"].items():
+            contextual_fillers[phrase] = contextual_fillers.get(phrase, 0) + count
+    return {
+        "word_count": sum(f["word_count"] for f in features),
+        "text_word_count": sum(f["text_word_count"] for f in features),
+        "grammar_errors": sum(f["grammar_errors"] for f in features),
+        "sentence_count": sum(f["sentence_count"] for f in features),
+        "vocab_tokens": [t for f in features for t in f["vocab_tokens"]],
+        "contextual_fillers": contextual_fillers,
+        "silent_pauses": [p for f in features for p in f["silent_pauses"]],
+        "vocalized_fillers": sum(f["vocalized_fillers"] for f in features),
+        "word_spans": [s for f in features for s in f["word_spans"]],
+    }
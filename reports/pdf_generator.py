@@ -1,4 +1,5 @@
 from fpdf import FPDF
+import asyncio
 import io
 import logging
 from datetime import datetime
@@ -74,6 +75,15 @@ class ReportPdf(FPDF):
 
 async def generate_report(candidateName: str, grammarScore: float, grammarLevel: str, vocabularyScore: float, vocabularyLevel: str, fluencyScore: float, fluencyLevel: str,
                     pronunciationScore: float, pronunciationLevel: str, overallScore: float, overallLevel: str, fillerWordScore: float, fillerWordLevel: str, chart_url: str, plot_url: str, summary_html: str) -> tuple[io.BytesIO | None, str | None]:
+    # Laying out and encoding the PDF is CPU-bound; keep it off the event loop
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, lambda: build_report(
+        candidateName, grammarScore, grammarLevel, vocabularyScore, vocabularyLevel, fluencyScore, fluencyLevel,
+        pronunciationScore, pronunciationLevel, overallScore, overallLevel, fillerWordScore, fillerWordLevel, chart_url, plot_url, summary_html,
+    ))
+
+def build_report(candidateName: str, grammarScore: float, grammarLevel: str, vocabularyScore: float, vocabularyLevel: str, fluencyScore: float, fluencyLevel: str,
+                 pronunciationScore: float, pronunciationLevel: str, overallScore: float, overallLevel: str, fillerWordScore: float, fillerWordLevel: str, chart_url: str, plot_url: str, summary_html: str) -> tuple[io.BytesIO | None, str | None]:
     
     try:
         logger.info(f"Starting PDF generation for {candidateName}...")
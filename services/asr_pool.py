@@ -0,0 +1,93 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from config.settings import Settings
+
+settings = Settings()
+logger = logging.getLogger(__name__)
+
+_pool: ProcessPoolExecutor | None = None
+_manager = None
+
+
+def worker_thread_split(pool_size: int) -> tuple[int, int]:
+    """Return (cpu_threads, num_workers) for each ASR process.
+
+    The machine's cores are divided evenly across the pool so that N processes with
+    K intra-op threads each never ask for more than the available cores.
+    """
+    if settings.ASR_CPU_THREADS > 0:
+        cpu_threads = settings.ASR_CPU_THREADS
+    else:
+        cpu_threads = max(1, (os.cpu_count() or 1) // max(1, pool_size))
+    return cpu_threads, max(1, settings.ASR_NUM_WORKERS)
+
+
+def _init_worker(cpu_threads: int, num_workers: int):
+    from services.audio_utils import _init_faster_model_if_needed, _init_batched_pipeline_if_needed
+    _init_faster_model_if_needed(cpu_threads=cpu_threads, num_workers=num_workers)
+    _init_batched_pipeline_if_needed()
+
+
+def _worker_ready() -> int:
+    return os.getpid()
+
+
+def get_pool() -> ProcessPoolExecutor | None:
+    """The ASR process pool, or None when transcription runs in the API process."""
+    return _pool
+
+
+async def start_pool():
+    """Load WHISPER_MODEL at startup, either in ASR_POOL_SIZE worker processes or in-process."""
+    global _pool
+    loop = asyncio.get_running_loop()
+    pool_size = settings.ASR_POOL_SIZE
+    cpu_threads, num_workers = worker_thread_split(pool_size)
+
+    if pool_size <= 0:
+        logger.info(f"Loading Whisper model '{settings.WHISPER_MODEL}' in the API process...")
+        await loop.run_in_executor(None, _init_worker, cpu_threads, num_workers)
+        return
+
+    logger.info(
+        f"Starting {pool_size} ASR worker process(es) for '{settings.WHISPER_MODEL}' "
+        f"(cpu_threads={cpu_threads}, num_workers={num_workers})..."
+    )
+    _pool = ProcessPoolExecutor(
+        max_workers=pool_size,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(cpu_threads, num_workers),
+    )
+    try:
+        # One task per worker forces every process to spawn and run its initializer now
+        pids = await asyncio.gather(*[loop.run_in_executor(_pool, _worker_ready) for _ in range(pool_size)])
+        logger.info(f"ASR worker pool ready: pids={sorted(set(pids))}")
+    except Exception as e:
+        logger.error(f"Failed to start ASR worker pool, falling back to in-process transcription: {e}")
+        shutdown_pool()
+
+
+def new_stream_queue():
+    """A queue the ASR worker processes can push streamed segments into."""
+    global _manager
+    if _manager is None:
+        _manager = multiprocessing.get_context("spawn").Manager()
+    return _manager.Queue()
+
+
+def shutdown_pool():
+    global _pool, _manager
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+    if _manager is not None:
+        _manager.shutdown()
+        _manager = None
+
+
+def worker_count() -> int:
+    return settings.ASR_POOL_SIZE if _pool is not None else 0
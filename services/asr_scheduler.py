@@ -0,0 +1,201 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from config.settings import Settings
+
+settings = Settings()
+logger = logging.getLogger(__name__)
+
+# Number of recent batches / requests kept for the stats window
+_STATS_WINDOW = 256
+
+
+class ASRScheduler:
+    """Coalesces concurrent transcription requests into micro-batches.
+
+    Requests are queued; a single runner task takes the first waiting request, keeps
+    collecting until `max_batch_size` requests are gathered or `max_wait_ms` has passed,
+    and then transcribes the whole batch in one batched Whisper pass. Batches go to the
+    ASR worker pool when one is running (one batch in flight per worker), otherwise to a
+    dedicated thread. While batches are decoding, new arrivals pile up and form the next one.
+    """
+
+    def __init__(self, max_batch_size: int, max_wait_ms: int):
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0, max_wait_ms) / 1000.0
+        self._queue: asyncio.Queue | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._runner: asyncio.Task | None = None
+        self._in_flight: asyncio.Semaphore | None = None
+        self._dispatches: set[asyncio.Task] = set()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="asr-batch")
+
+        self._batches_total = 0
+        self._requests_total = 0
+        self._errors_total = 0
+        self._batch_sizes: deque[int] = deque(maxlen=_STATS_WINDOW)
+        self._wait_ms: deque[float] = deque(maxlen=_STATS_WINDOW)
+        self._inference_ms: deque[float] = deque(maxlen=_STATS_WINDOW)
+
+    def _ensure_started(self):
+        """Start the runner, or restart a dead one on the existing queue.
+
+        The queue and in-flight slots are only recreated for a new event loop. Requests that
+        were waiting when the runner died have already been failed by _runner_done.
+        """
+        loop = asyncio.get_running_loop()
+        if self._runner is not None and not self._runner.done() and self._loop is loop:
+            return
+        if self._queue is None or self._loop is not loop:
+            from services.asr_pool import worker_count
+            self._queue = asyncio.Queue()
+            self._in_flight = asyncio.Semaphore(max(1, worker_count()))
+            self._loop = loop
+        elif self._runner is not None:
+            logger.warning("Restarting the ASR batch runner")
+        self._runner = asyncio.create_task(self._run())
+        self._runner.add_done_callback(self._runner_done)
+
+    def _runner_done(self, runner: asyncio.Task):
+        """Fail every request still queued when the runner ends (crashed or stopped)."""
+        if runner.cancelled():
+            error = RuntimeError("ASR scheduler stopped")
+        else:
+            error = runner.exception() or RuntimeError("ASR batch runner exited")
+            logger.error(f"ASR batch runner died: {error}")
+        self._fail_all(self._drain(), error)
+
+    def _drain(self) -> list[tuple]:
+        pending = []
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        return pending
+
+    @staticmethod
+    def _fail_all(requests: list[tuple], error: BaseException):
+        for _, future, _ in requests:
+            if not future.done():
+                future.set_exception(error)
+
+    async def transcribe(self, audio) -> list:
+        """Queue one clip (path or PCM array) and wait for its segments."""
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((audio, future, time.perf_counter()))
+        return await future
+
+    async def stop(self):
+        if self._runner is not None:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+        self._executor.shutdown(wait=False)
+
+    async def _collect_batch(self, batch: list[tuple]) -> list[tuple]:
+        """Fill `batch` in place, so requests already taken can be failed if collecting is interrupted."""
+        loop = asyncio.get_running_loop()
+        batch.append(await self._queue.get())
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            await self._in_flight.acquire()
+            batch = []
+            try:
+                await self._collect_batch(batch)
+            except BaseException as e:
+                self._in_flight.release()
+                self._fail_all(batch, e if isinstance(e, Exception) else RuntimeError("ASR scheduler stopped"))
+                raise
+            task = asyncio.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch: list[tuple]):
+        from services.asr_pool import get_pool
+        from services.audio_utils import transcribe_batch_library, expand_segments
+        loop = asyncio.get_running_loop()
+        dispatched_at = time.perf_counter()
+        waits = [(dispatched_at - enqueued_at) * 1000 for _, _, enqueued_at in batch]
+        self._batches_total += 1
+        self._requests_total += len(batch)
+        self._batch_sizes.append(len(batch))
+        self._wait_ms.extend(waits)
+
+        try:
+            results = await loop.run_in_executor(
+                get_pool() or self._executor, transcribe_batch_library, [audio for audio, _, _ in batch]
+            )
+        except Exception as e:
+            self._errors_total += 1
+            logger.error(f"ASR batch of {len(batch)} failed: {e}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._in_flight.release()
+
+        inference_ms = (time.perf_counter() - dispatched_at) * 1000
+        self._inference_ms.append(inference_ms)
+        for (_, future, _), rows in zip(batch, results):
+            if not future.done():
+                future.set_result(expand_segments(rows))
+        logger.info(
+            f"ASR batch: size={len(batch)}, queue_depth={self._queue.qsize()}, "
+            f"max_wait={max(waits):.1f}ms, inference={inference_ms:.1f}ms"
+        )
+
+    def stats(self) -> dict:
+        def _summary(values) -> dict:
+            if not values:
+                return {"avg": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+            ordered = sorted(values)
+            return {
+                "avg": round(sum(ordered) / len(ordered), 2),
+                "p50": round(ordered[len(ordered) // 2], 2),
+                "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+                "max": round(ordered[-1], 2),
+            }
+
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "batches_in_flight": len(self._dispatches),
+            "batches_total": self._batches_total,
+            "requests_total": self._requests_total,
+            "errors_total": self._errors_total,
+            "batch_size": _summary(self._batch_sizes),
+            "wait_ms": _summary(self._wait_ms),
+            "inference_ms": _summary(self._inference_ms),
+        }
+
+
+_scheduler: ASRScheduler | None = None
+
+def get_scheduler() -> ASRScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = ASRScheduler(settings.ASR_MAX_BATCH_SIZE, settings.ASR_MAX_WAIT_MS)
+    return _scheduler
+
+async def shutdown_scheduler():
+    global _scheduler
+    if _scheduler is not None:
+        await _scheduler.stop()
+        _scheduler = None
@@ -1,13 +1,126 @@
 import asyncio
+import bisect
+import io
+import queue
 import warnings
+import wave
+from typing import NamedTuple
 from config.settings import Settings
 
 warnings.filterwarnings("ignore")
 
+SAMPLE_RATE = 16000
+# Silence inserted between requests when several clips share one batched pass
+BATCH_GAP_SECONDS = 1.0
+# How often a streamed transcription checks that its worker is still running while waiting for segments
+STREAM_POLL_SECONDS = 1.0
+
 _faster_model = None
+_batched_pipeline = None
 settings = Settings()
 
-def _init_faster_model_if_needed():
+
+class Word(NamedTuple):
+    start: float
+    end: float
+    word: str
+    probability: float
+
+
+class Segment(NamedTuple):
+    start: float
+    end: float
+    text: str
+    words: list[Word]
+
+
+def compact_segments(segments, shift: float = 0.0) -> list[tuple]:
+    """Flatten faster-whisper segments into plain tuples that pickle/serialize cheaply.
+
+    `shift` is subtracted from every timestamp so callers can move segments onto another timeline.
+    """
+    return [
+        (
+            round(seg.start - shift, 3),
+            round(seg.end - shift, 3),
+            seg.text,
+            [(round(w.start - shift, 3), round(w.end - shift, 3), w.word, float(w.probability)) for w in (seg.words or [])],
+        )
+        for seg in segments
+    ]
+
+def expand_segments(rows: list) -> list[Segment]:
+    return [Segment(start, end, text, [Word(*w) for w in words]) for start, end, text, words in rows]
+
+
+def shift_segments(segments: list, offset: float) -> list[Segment]:
+    """Move segments (and their words) `offset` seconds later on the timeline."""
+    return expand_segments(compact_segments(segments, shift=-offset))
+
+
+class PcmBuffer:
+    """Growable 16 kHz float32 buffer; appends are amortized O(1) and reads are zero-copy views."""
+
+    def __init__(self, initial_seconds: float = 30.0):
+        import numpy as np
+        self._data = np.zeros(int(initial_seconds * SAMPLE_RATE), dtype=np.float32)
+        self._size = 0
+
+    def append(self, pcm) -> float:
+        """Append samples and return the offset (seconds) at which they start."""
+        import numpy as np
+        offset = self._size / SAMPLE_RATE
+        needed = self._size + len(pcm)
+        if needed > len(self._data):
+            grown = np.zeros(max(needed, 2 * len(self._data)), dtype=np.float32)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+        self._data[self._size:needed] = pcm
+        self._size = needed
+        return offset
+
+    def view(self):
+        return self._data[:self._size]
+
+    @property
+    def duration(self) -> float:
+        return self._size / SAMPLE_RATE
+
+    def __len__(self) -> int:
+        return self._size
+
+
+def decode_audio_pcm(source):
+    """Decode audio to 16 kHz mono float32 PCM.
+
+    Accepts a path, raw bytes or a file-like object; an already decoded array is returned
+    unchanged. Decoding uses PyAV in-process, so no ffmpeg subprocess is spawned. Callers
+    decode an upload once and hand slices of the array to every later stage.
+    """
+    import numpy as np
+    if isinstance(source, np.ndarray):
+        return source
+    from faster_whisper import decode_audio
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    elif hasattr(source, "seek"):
+        source.seek(0)
+    return decode_audio(source, sampling_rate=SAMPLE_RATE)
+
+def pcm_to_wav_bytes(pcm) -> bytes:
+    """Encode a float32 PCM slice as a 16-bit mono WAV file in memory."""
+    import numpy as np
+    samples = (np.clip(pcm, -1.0, 1.0) * 32767).astype("<i2")
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(SAMPLE_RATE)
+        wf.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+def _init_faster_model_if_needed(cpu_threads: int = 0, num_workers: int = 1):
     global _faster_model
     if _faster_model is not None:
         return _faster_model
@@ -31,15 +144,167 @@ def _init_faster_model_if_needed():
     if WhisperModel is None:
         raise RuntimeError("faster_whisper is not available in this environment")
 
-    _faster_model = WhisperModel(settings.WHISPER_MODEL, device=device, compute_type=compute_type)
+    _faster_model = WhisperModel(
+        settings.WHISPER_MODEL,
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=cpu_threads,
+        num_workers=num_workers,
+    )
     return _faster_model
 
-def transcribe_audio_library(path: str) -> list:
+def _init_batched_pipeline_if_needed():
+    global _batched_pipeline
+    if _batched_pipeline is not None:
+        return _batched_pipeline
+    from faster_whisper import BatchedInferencePipeline
+    _batched_pipeline = BatchedInferencePipeline(model=_init_faster_model_if_needed())
+    return _batched_pipeline
+
+def transcribe_audio_compact(audio) -> list[tuple]:
     model = _init_faster_model_if_needed()
-    segments_gen, _ = model.transcribe(path, word_timestamps=True)
-    return list(segments_gen)
+    segments_gen, _ = model.transcribe(audio, language=settings.WHISPER_LANGUAGE, word_timestamps=True)
+    return compact_segments(segments_gen)
+
+def transcribe_audio_library(audio) -> list[Segment]:
+    return expand_segments(transcribe_audio_compact(audio))
+
+def transcribe_audio_stream_to_queue(audio, out_queue) -> None:
+    """Push compact segments onto `out_queue` as faster-whisper produces them, then None."""
+    try:
+        model = _init_faster_model_if_needed()
+        segments_gen, _ = model.transcribe(audio, language=settings.WHISPER_LANGUAGE, word_timestamps=True)
+        for seg in segments_gen:
+            out_queue.put(compact_segments([seg])[0])
+    finally:
+        out_queue.put(None)
+
+def _speech_clips(audio, offset: int, chunk_length: int = 30) -> list[dict]:
+    """Group the voiced regions of one clip into windows of at most `chunk_length` seconds.
+
+    Returned start/end values are in seconds on the timeline of the combined batch buffer.
+    """
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+    speech = get_speech_timestamps(audio, VadOptions(max_speech_duration_s=chunk_length, min_silence_duration_ms=160))
+    max_samples = chunk_length * SAMPLE_RATE
+    clips = []
+    for region in speech:
+        if clips and region["end"] - clips[-1]["start"] <= max_samples:
+            clips[-1]["end"] = region["end"]
+        else:
+            clips.append({"start": region["start"], "end": region["end"]})
+    return [
+        {"start": (offset + c["start"]) / SAMPLE_RATE, "end": (offset + c["end"]) / SAMPLE_RATE}
+        for c in clips
+    ]
+
+def transcribe_batch_library(inputs: list) -> list[list[tuple]]:
+    """Transcribe several clips in a single batched Whisper pass.
+
+    Each input (a path or a 16 kHz float32 array) is placed on one shared timeline,
+    separated by a short silence, and its voiced regions are handed to faster-whisper's
+    batched pipeline as clip timestamps. Segments are then routed back to the clip they
+    came from and shifted onto that clip's own timeline, in compact tuple form.
+    """
+    import numpy as np
+
+    pipeline = _init_batched_pipeline_if_needed()
+    audios = [decode_audio_pcm(a) for a in inputs]
+
+    gap = np.zeros(int(SAMPLE_RATE * BATCH_GAP_SECONDS), dtype=np.float32)
+    pieces, clips, starts = [], [], []
+    offset = 0
+    for audio in audios:
+        starts.append(offset / SAMPLE_RATE)
+        clips.extend(_speech_clips(audio, offset))
+        pieces.extend([audio.astype(np.float32, copy=False), gap])
+        offset += len(audio) + len(gap)
+
+    results = [[] for _ in inputs]
+    if not clips:
+        return results
+
+    segments_gen, _ = pipeline.transcribe(
+        np.concatenate(pieces),
+        language=settings.WHISPER_LANGUAGE,
+        word_timestamps=True,
+        without_timestamps=False,
+        clip_timestamps=clips,
+        batch_size=settings.BATCH_SIZE,
+    )
+    for seg in segments_gen:
+        idx = max(0, bisect.bisect_right(starts, seg.start + 1e-3) - 1)
+        results[idx].extend(compact_segments([seg], shift=starts[idx]))
+    return results
+
+
+async def transcribe_audio_async(audio) -> list[Segment]:
+    """Transcribe a path or a decoded PCM array."""
+    if settings.ASR_BATCHING_ENABLED:
+        from services.asr_scheduler import get_scheduler
+        return await get_scheduler().transcribe(audio)
+    from services.asr_pool import get_pool
+    loop = asyncio.get_event_loop()
+    return expand_segments(await loop.run_in_executor(get_pool(), transcribe_audio_compact, audio))
+
+
+def transcription_cache_key(audio_bytes: bytes, decoder: str | None = None) -> str:
+    """Cache key for a clip's transcription by `decoder`: "batched" (VAD clips through the batched
+    pipeline) or "sequential" (model.transcribe, as streamed). They segment differently, so each
+    has its own entries. Defaults to the decoder transcribe_audio_async uses."""
+    from services.result_cache import audio_cache_key
+    decoder = decoder or ("batched" if settings.ASR_BATCHING_ENABLED else "sequential")
+    return audio_cache_key(audio_bytes, f"asr-{decoder}", settings.WHISPER_MODEL, settings.WHISPER_LANGUAGE)
+
+
+async def transcribe_audio_cached(audio, audio_bytes: bytes) -> list[Segment]:
+    """transcribe_audio_async, memoized on the audio content so client retries skip Whisper."""
+    from services.result_cache import transcription_cache
+
+    async def _compute():
+        return compact_segments(await transcribe_audio_async(audio))
+
+    rows = await transcription_cache.get_or_compute(transcription_cache_key(audio_bytes), _compute)
+    return expand_segments(rows)
+
+
+async def transcribe_audio_stream(audio, audio_bytes: bytes | None = None):
+    """Async generator yielding segments one by one while the clip is still being decoded.
+
+    When `audio_bytes` is given, a cached transcription is replayed instead and a fresh one is stored.
+    """
+    from services.asr_pool import get_pool, new_stream_queue
+    from services.result_cache import transcription_cache
 
+    key = transcription_cache_key(audio_bytes, "sequential") if audio_bytes is not None else None
+    cached = transcription_cache.get(key) if key else None
+    if cached is not None:
+        for seg in expand_segments(cached):
+            yield seg
+        return
 
-async def transcribe_audio_async(path: str) -> list:
     loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, transcribe_audio_library, path)
+    pool = get_pool()
+    out_queue = new_stream_queue() if pool is not None else queue.Queue()
+    job = loop.run_in_executor(pool, transcribe_audio_stream_to_queue, audio, out_queue)
+    rows = []
+    while True:
+        try:
+            row = await loop.run_in_executor(None, out_queue.get, True, STREAM_POLL_SECONDS)
+        except queue.Empty:
+            if not job.done():
+                continue
+            # The worker finished or died: surface its error (e.g. a broken pool), else take what it left
+            await job
+            try:
+                row = out_queue.get_nowait()
+            except queue.Empty:
+                raise RuntimeError("ASR worker finished without ending the segment stream")
+        if row is None:
+            break
+        rows.append(row)
+        yield expand_segments([row])[0]
+    # Surfaces any decoding error raised in the worker
+    await job
+    if key:
+        transcription_cache.set(key, rows)
@@ -0,0 +1,126 @@
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from config.settings import Settings
+
+settings = Settings()
+
+# evaluation_id -> {"pcm16": bytes, "spans": [(word, start, end)], "expires_at": float}, least recently used first
+_evaluations: OrderedDict[str, dict] = OrderedDict()
+# (evaluation_id, word_index) -> (wav_bytes, etag) for recently served clips
+_clip_cache: OrderedDict[tuple[str, int], tuple[bytes, str]] = OrderedDict()
+# Bytes held by both, checked against CLIP_STORE_MAX_MB
+_stored_bytes = 0
+_lock = threading.Lock()
+
+
+def clip_url(evaluation_id: str, word_index: int) -> str:
+    return f"/evaluation/{evaluation_id}/words/{word_index}/clip"
+
+
+def _drop_clip(key: tuple[str, int]):
+    global _stored_bytes
+    clip = _clip_cache.pop(key, None)
+    if clip is not None:
+        _stored_bytes -= len(clip[0])
+
+
+def _drop_evaluation(evaluation_id: str):
+    global _stored_bytes
+    entry = _evaluations.pop(evaluation_id, None)
+    if entry is None:
+        return
+    _stored_bytes -= len(entry["pcm16"])
+    for key in [k for k in _clip_cache if k[0] == evaluation_id]:
+        _drop_clip(key)
+
+
+def _purge_expired(now: float):
+    for eid in [eid for eid, entry in _evaluations.items() if entry["expires_at"] <= now]:
+        _drop_evaluation(eid)
+
+
+def _enforce_limits():
+    """Evict least recently used evaluations (with their clips) until the count and byte budgets hold.
+
+    The most recent evaluation is always kept; if it alone is over the budget, its cached clips go.
+    """
+    max_bytes = settings.CLIP_STORE_MAX_MB * 1024 * 1024
+    while len(_evaluations) > 1 and (len(_evaluations) > settings.CLIP_STORE_MAX_EVALUATIONS or _stored_bytes > max_bytes):
+        _drop_evaluation(next(iter(_evaluations)))
+    while len(_clip_cache) > settings.CLIP_CACHE_MAX_ITEMS or (_clip_cache and _stored_bytes > max_bytes):
+        _drop_clip(next(iter(_clip_cache)))
+
+
+def _cache_clip(key: tuple[str, int], wav_bytes: bytes) -> tuple[bytes, str]:
+    global _stored_bytes
+    etag = '"' + hashlib.sha1(wav_bytes).hexdigest()[:16] + '"'
+    _drop_clip(key)
+    _clip_cache[key] = (wav_bytes, etag)
+    _stored_bytes += len(wav_bytes)
+    return wav_bytes, etag
+
+
+def save_evaluation_audio(pcm, spans: list, clips: dict[int, bytes] | None = None, evaluation_id: str | None = None) -> str:
+    """Keep a 16-bit copy of an evaluation's audio and its word spans for CLIP_STORE_TTL_SECONDS.
+
+    The store holds at most CLIP_STORE_MAX_EVALUATIONS evaluations and CLIP_STORE_MAX_MB of
+    audio and cached clips; the least recently used evaluations are evicted first.
+
+    `spans` are (word, start, end, ...) sample spans. `clips` are already-encoded word clips
+    (e.g. the mispronounced words) used to seed the clip cache. Passing `evaluation_id`
+    re-registers an evaluation whose clip URLs were already handed out.
+    """
+    import numpy as np
+    evaluation_id = evaluation_id or uuid.uuid4().hex
+    pcm16 = (np.clip(pcm, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+    now = time.time()
+    global _stored_bytes
+    with _lock:
+        _purge_expired(now)
+        _drop_evaluation(evaluation_id)
+        _evaluations[evaluation_id] = {
+            "pcm16": pcm16,
+            "spans": [(span[0], span[1], span[2]) for span in spans],
+            "expires_at": now + settings.CLIP_STORE_TTL_SECONDS,
+        }
+        _stored_bytes += len(pcm16)
+        for index, wav_bytes in (clips or {}).items():
+            _cache_clip((evaluation_id, index), wav_bytes)
+        _enforce_limits()
+    return evaluation_id
+
+
+def clip_store_stats() -> dict:
+    with _lock:
+        return {"evaluations": len(_evaluations), "clips": len(_clip_cache), "bytes": _stored_bytes}
+
+
+def has_evaluation(evaluation_id: str) -> bool:
+    with _lock:
+        _purge_expired(time.time())
+        return evaluation_id in _evaluations
+
+
+def get_word_clip(evaluation_id: str, word_index: int) -> tuple[bytes, str] | None:
+    """Return (wav_bytes, etag) for one word, encoding it from the stored buffer on a cache miss."""
+    import numpy as np
+    from services.audio_utils import pcm_to_wav_bytes
+    key = (evaluation_id, word_index)
+    with _lock:
+        _purge_expired(time.time())
+        entry = _evaluations.get(evaluation_id)
+        if entry is None or not (0 <= word_index < len(entry["spans"])):
+            return None
+        _evaluations.move_to_end(evaluation_id)
+        if key in _clip_cache:
+            _clip_cache.move_to_end(key)
+            return _clip_cache[key]
+        _, start, end = entry["spans"][word_index]
+        # Zero-copy view of the stored 16-bit samples
+        samples = np.frombuffer(entry["pcm16"], dtype="<i2")[start:end]
+        clip = _cache_clip(key, pcm_to_wav_bytes(samples.astype(np.float32) / 32767))
+        _enforce_limits()
+        return clip
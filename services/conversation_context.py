@@ -0,0 +1,117 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+from config.settings import Settings
+
+settings = Settings()
+logger = logging.getLogger(__name__)
+
+# summarize(previous_summary, turns_to_fold) -> updated summary, or None on failure
+Summarizer = Callable[[str, list[dict]], Awaitable[str | None]]
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token is close enough for budgeting English prompts
+    return len(text) // 4 + 1
+
+
+def _truncate_tokens(text: str, max_tokens: int) -> str:
+    max_chars = max_tokens * 4
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rsplit(" ", 1)[0] + "…"
+
+
+def _turn_line(turn: dict) -> str:
+    label = "You" if turn["role"] == "system" else "User"
+    return f"{label}: {turn['text']}"
+
+
+class ConversationContext:
+    """What a conversation's reply prompts are built from, bounded no matter how long it runs.
+
+    The persona is a fixed prefix (sent as the system instruction, so it can be cached
+    provider-side). Older turns are folded into a running summary in the background once
+    the verbatim turns outgrow half the token budget; the prompt always holds the summary
+    plus as many of the most recent turns as fit in CONVERSATION_TOKEN_BUDGET.
+    """
+
+    def __init__(self, persona: str, summarize: Summarizer | None = None, token_budget: int | None = None,
+                 summary_tokens: int | None = None, recent_turns: int | None = None):
+        self.persona = persona
+        self.summary = ""
+        self.turns: list[dict] = []      # turns not yet folded into the summary
+        self.summarized_turns = 0
+        self.token_budget = token_budget or settings.CONVERSATION_TOKEN_BUDGET
+        self.summary_tokens = summary_tokens or settings.CONVERSATION_SUMMARY_TOKENS
+        self.recent_turns = recent_turns or settings.CONVERSATION_RECENT_TURNS
+        self._summarize = summarize
+        self._compaction: asyncio.Task | None = None
+
+    def add_turn(self, role: str, text: str):
+        self.turns.append({"role": role, "text": text})
+        if self._summarize is not None and self.needs_compaction():
+            self.schedule_compaction()
+
+    def needs_compaction(self) -> bool:
+        if len(self.turns) <= self.recent_turns:
+            return False
+        return sum(estimate_tokens(_turn_line(t)) for t in self.turns) > self.token_budget // 2
+
+    def schedule_compaction(self):
+        if self._compaction is not None and not self._compaction.done():
+            return
+        try:
+            self._compaction = asyncio.get_running_loop().create_task(self.compact())
+        except RuntimeError:
+            # No event loop (e.g. a sync caller); the next turn recorded from async code retries
+            pass
+
+    async def compact(self):
+        """Fold all but the most recent turns into the summary with one summarizer call."""
+        if self._summarize is None or not self.needs_compaction():
+            return
+        fold = self.turns[:-self.recent_turns]
+        try:
+            summary = await self._summarize(self.summary, fold)
+        except Exception as e:
+            logger.warning(f"Conversation summary update failed: {e}")
+            return
+        if not summary:
+            return
+        self.summary = _truncate_tokens(summary.strip(), self.summary_tokens)
+        # Only compaction removes turns, and only one runs at a time, so the folded ones are still in front
+        del self.turns[:len(fold)]
+        self.summarized_turns += len(fold)
+
+    def render_history(self) -> str:
+        """The summary of earlier turns plus the most recent turns that fit the token budget."""
+        parts = []
+        budget = self.token_budget
+        if self.summary:
+            summary_text = f"Summary of the earlier conversation: {self.summary}"
+            parts.append(summary_text)
+            budget -= estimate_tokens(summary_text)
+
+        lines, used = [], 0
+        for turn in reversed(self.turns):
+            line = _turn_line(turn)
+            cost = estimate_tokens(line)
+            if used + cost > budget:
+                if not lines:
+                    lines.append(_truncate_tokens(line, max(budget, 1)))
+                break
+            lines.append(line)
+            used += cost
+        parts.append("\n".join(reversed(lines)))
+        return "\n\n".join(p for p in parts if p)
+
+    def stats(self) -> dict:
+        history = self.render_history()
+        return {
+            "persona_tokens": estimate_tokens(self.persona),
+            "history_tokens": estimate_tokens(history),
+            "summary_tokens": estimate_tokens(self.summary) if self.summary else 0,
+            "verbatim_turns": len(self.turns),
+            "summarized_turns": self.summarized_turns,
+        }
@@ -1,15 +1,40 @@
 from config.settings import Settings
+from services.conversation_context import ConversationContext, estimate_tokens
 import re
+import asyncio
+import hashlib
+import json
 import random
 import logging
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
 
 settings = Settings()
 logger = logging.getLogger(__name__)
 
 client = None
+# Process-wide cap on in-flight Gemini calls, shared by every request on this worker
+_semaphore: asyncio.Semaphore | None = None
+# Optional stand-in for Gemini (e.g. services.llm_fake.FakeLLMBackend in tests); see set_llm_backend
+_backend = None
+# persona sha256 -> (cached content name or None when caching is unavailable, expires_at)
+_persona_caches: dict[str, tuple[str | None, float]] = {}
+
+def set_llm_backend(backend):
+    """Route every LLM call to `backend` instead of Gemini; None restores the real client.
+
+    The backend needs `async generate(prompt, system_instruction)` returning text and
+    `generate_stream(prompt, system_instruction)` yielding text deltas.
+    """
+    global _backend
+    _backend = backend
 
 def _get_client():
     global client
+    if _backend is not None:
+        return _backend
     if client is not None:
         return client
     if settings.GOOGLE_API_KEY:
@@ -24,27 +49,523 @@ def _get_client():
         logger.error("GOOGLE_API_KEY is not set!")
     return client
 
+def _get_semaphore() -> asyncio.Semaphore:
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+    return _semaphore
+
+def init_llm():
+    """Create the shared Gemini client and concurrency limit once, at application startup."""
+    _get_client()
+    _get_semaphore()
+
+async def shutdown_llm():
+    global client
+    if client is None:
+        return
+    try:
+        await client.aio.aclose()
+    except Exception as e:
+        logger.warning(f"Failed to close Gemini client: {e}")
+    client = None
+
 GEMINI_MODEL = "gemini-2.5-flash"
 
-def get_gemini_response(prompt: str) -> str | None:
-    current_client = _get_client()
-    if not current_client:
-        logger.warning("Gemini client not initialized. Skipping AI call.")
+async def _persona_cache_name(system_instruction: str) -> str | None:
+    """Name of a provider-side cached content holding `system_instruction`, when LLM_PERSONA_CACHE is on.
+
+    Gemini only caches prompts above a minimum size, so creation may be refused; that is
+    remembered until the would-be cache's TTL passes and the instruction is sent inline.
+    """
+    if not settings.LLM_PERSONA_CACHE or _backend is not None:
         return None
+    key = hashlib.sha256(system_instruction.encode("utf-8")).hexdigest()
+    name, expires_at = _persona_caches.get(key, (None, 0.0))
+    # Renew a minute early so a request never references an expired cache
+    if expires_at - 60 > time.time():
+        return name
+    ttl = settings.LLM_PERSONA_CACHE_TTL_SECONDS
     try:
-        logger.info("Starting Gemini AI call...")
-        response = current_client.models.generate_content(
+        from google.genai import types
+        cache = await _get_client().aio.caches.create(
             model=GEMINI_MODEL,
-            contents=prompt
+            config=types.CreateCachedContentConfig(system_instruction=system_instruction, ttl=f"{ttl}s"),
         )
+        name = cache.name
+    except Exception as e:
+        logger.info(f"Persona context caching unavailable, sending it inline: {e}")
+        name = None
+    _persona_caches[key] = (name, time.time() + ttl)
+    return name
+
+async def _content_config(config=None, system_instruction: str | None = None):
+    if not system_instruction:
+        return config
+    from google.genai import types
+    config = config.model_copy() if config is not None else types.GenerateContentConfig()
+    cache_name = await _persona_cache_name(system_instruction)
+    if cache_name:
+        config.cached_content = cache_name
+    else:
+        config.system_instruction = system_instruction
+    return config
+
+# ---------------------------------------------------------------------------
+# Call policy — request deadlines, jittered retries, hedging and a circuit breaker
+# ---------------------------------------------------------------------------
+
+# Absolute time.monotonic() by which the current request's LLM calls must finish (None: no deadline)
+_deadline: ContextVar[float | None] = ContextVar("llm_deadline", default=None)
+# Don't start (or retry into) an attempt with less time left than this
+_MIN_ATTEMPT_SECONDS = 0.5
+
+_call_stats = {
+    "calls": 0, "successes": 0, "failures": 0, "errors": 0, "timeouts": 0, "retries": 0,
+    "deadline_exceeded": 0, "hedges": 0, "hedge_wins": 0, "breaker_rejections": 0,
+}
+_latencies_ms: deque[float] = deque(maxlen=256)
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling Gemini while the circuit breaker is open."""
+
+class CircuitBreaker:
+    """Opens when the error rate over the last `window` calls reaches `error_rate`.
+
+    While open, calls fail fast so callers drop to their fallbacks. After `cooldown`
+    seconds one probe call is let through (half-open); its outcome closes or re-opens it.
+    """
+
+    def __init__(self, window: int, error_rate: float, min_calls: int, cooldown: float):
+        self.error_rate = error_rate
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.times_opened = 0
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probing = False
+
+    def allow(self) -> bool:
+        if self.state == "open" and time.monotonic() - self._opened_at >= self.cooldown:
+            self.state = "half_open"
+            self._probing = False
+        if self.state == "closed":
+            return True
+        if self.state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def is_probing(self) -> bool:
+        return self.state == "half_open" and self._probing
+
+    def release_probe(self):
+        """Free the half-open probe slot of a call that ended without an outcome (e.g. cancelled)."""
+        if self.state == "half_open":
+            self._probing = False
+
+    def record(self, ok: bool):
+        if self.state == "half_open":
+            self._probing = False
+            if ok:
+                self.state = "closed"
+                self._outcomes.clear()
+            else:
+                self._open()
+            return
+        self._outcomes.append(ok)
+        failures = self._outcomes.count(False)
+        if self.state == "closed" and len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.error_rate:
+            self._open()
+
+    def _open(self):
+        self.state = "open"
+        self._opened_at = time.monotonic()
+        self.times_opened += 1
+        logger.warning(f"Gemini circuit breaker opened; failing fast for {self.cooldown}s")
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "times_opened": self.times_opened,
+            "recent_error_rate": round(self._outcomes.count(False) / len(self._outcomes), 3) if self._outcomes else 0.0,
+        }
+
+_breaker = CircuitBreaker(
+    window=settings.LLM_BREAKER_WINDOW,
+    error_rate=settings.LLM_BREAKER_ERROR_RATE,
+    min_calls=settings.LLM_BREAKER_MIN_CALLS,
+    cooldown=settings.LLM_BREAKER_COOLDOWN_SECONDS,
+)
+
+def set_llm_deadline(seconds: float | None):
+    """Give the LLM calls of the current request (and tasks it spawns) `seconds` in total.
+
+    Called at the top of a route; each request runs in its own task, so the deadline
+    doesn't leak into other requests.
+    """
+    _deadline.set(None if seconds is None else time.monotonic() + seconds)
+
+@contextmanager
+def no_llm_deadline():
+    """Lift the request deadline, for background work a request starts but doesn't wait on."""
+    token = _deadline.set(None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def _remaining_budget() -> float | None:
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, CircuitOpenError):
+        return False
+    try:
+        from google.genai import errors
+        if isinstance(error, errors.ClientError):
+            return error.code == 429
+    except ImportError:
+        pass
+    return True
+
+def _is_backend_failure(error: Exception, deadline_capped: bool) -> bool:
+    """Whether a failed call says something about Gemini's health, and so counts against the breaker.
+
+    Client errors (bad prompt, safety block) are the caller's, and so is a timeout that was
+    cut short by the caller's own remaining request budget.
+    """
+    if isinstance(error, TimeoutError) and deadline_capped:
+        return False
+    return _is_retryable(error)
+
+def _attempt_timeout(timeout: float | None) -> float:
+    """Per-attempt timeout: the call's own limit, cut to what is left of the request deadline."""
+    timeout = timeout or settings.LLM_TIMEOUT_SECONDS
+    remaining = _remaining_budget()
+    if remaining is not None and remaining < _MIN_ATTEMPT_SECONDS:
+        _call_stats["deadline_exceeded"] += 1
+        raise TimeoutError("LLM request deadline exceeded")
+    return timeout if remaining is None else min(timeout, remaining)
+
+async def _hedged(call, timeout: float):
+    """Run `call(timeout)`; if it hasn't answered within LLM_HEDGE_DELAY_MS, race a second identical request."""
+    delay = settings.LLM_HEDGE_DELAY_MS / 1000
+    tasks = [asyncio.ensure_future(call(timeout))]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if done or timeout - delay < _MIN_ATTEMPT_SECONDS:
+            return await tasks[0]
+        _call_stats["hedges"] += 1
+        tasks.append(asyncio.ensure_future(call(timeout - delay)))
+        pending, error = set(tasks), None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is tasks[1]:
+                        _call_stats["hedge_wins"] += 1
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+async def _with_policy(call, timeout: float | None = None, hedge: bool = False):
+    """Run `call(attempt_timeout)` under the circuit breaker, the request deadline and retries.
+
+    Failures are retried with full-jitter exponential backoff (LLM_MAX_RETRIES, LLM_RETRY_BASE_MS)
+    only while the remaining deadline leaves room for another attempt.
+    """
+    _call_stats["calls"] += 1
+    attempt = 0
+    while True:
+        # Checked before taking a breaker slot, so a spent deadline can't hold the half-open probe
+        attempt_timeout = _attempt_timeout(timeout)
+        deadline_capped = attempt_timeout < (timeout or settings.LLM_TIMEOUT_SECONDS)
+        if not _breaker.allow():
+            _call_stats["breaker_rejections"] += 1
+            raise CircuitOpenError("Gemini circuit breaker is open")
+        probe = _breaker.is_probing()
+        started = time.monotonic()
+        try:
+            try:
+                result = await (_hedged(call, attempt_timeout) if hedge else call(attempt_timeout))
+            except Exception as e:
+                if _is_backend_failure(e, deadline_capped):
+                    _breaker.record(False)
+                _call_stats["timeouts" if isinstance(e, TimeoutError) else "errors"] += 1
+                attempt += 1
+                backoff = random.uniform(0, settings.LLM_RETRY_BASE_MS / 1000 * 2 ** (attempt - 1))
+                remaining = _remaining_budget()
+                if attempt > settings.LLM_MAX_RETRIES or not _is_retryable(e) or (
+                    remaining is not None and remaining - backoff < _MIN_ATTEMPT_SECONDS
+                ):
+                    _call_stats["failures"] += 1
+                    raise
+                _call_stats["retries"] += 1
+                logger.info(f"Retrying Gemini call in {backoff:.2f}s after: {e}")
+                await asyncio.sleep(backoff)
+                continue
+            _breaker.record(True)
+            _call_stats["successes"] += 1
+            _latencies_ms.append((time.monotonic() - started) * 1000)
+            return result
+        finally:
+            # Cancellation and caller-side failures skip record(); without this the breaker would
+            # stay half-open with no probe allowed
+            if probe:
+                _breaker.release_probe()
+
+def llm_call_stats() -> dict:
+    ordered = sorted(_latencies_ms)
+    latency = {"p50": 0.0, "p95": 0.0, "max": 0.0}
+    if ordered:
+        latency = {
+            "p50": round(ordered[len(ordered) // 2], 2),
+            "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+            "max": round(ordered[-1], 2),
+        }
+    return {**_call_stats, "breaker": _breaker.stats(), "latency_ms": latency}
+
+async def _generate_once(prompt: str, config, timeout: float, system_instruction: str | None) -> str:
+    # The timeout covers waiting for a concurrency slot as well as the call itself
+    async with asyncio.timeout(timeout):
+        async with _get_semaphore():
+            if _backend is not None:
+                return await _backend.generate(prompt, system_instruction)
+            config = await _content_config(config, system_instruction)
+            response = await _get_client().aio.models.generate_content(model=GEMINI_MODEL, contents=prompt, config=config)
+            return response.text
+
+async def _generate(prompt: str, config=None, timeout: float | None = None, system_instruction: str | None = None, hedge: bool = False) -> str:
+    """One Gemini completion, bounded by LLM_MAX_CONCURRENCY and run under the call policy.
+
+    `system_instruction` is a fixed prefix such as a persona; it is sent separately from the
+    prompt so the provider can cache it. `hedge` races a second request when the first is
+    slow (for latency-critical turn replies). Raises on failure, including TimeoutError and
+    CircuitOpenError; callers decide on the fallback.
+    """
+    return await _with_policy(lambda t: _generate_once(prompt, config, t, system_instruction), timeout, hedge)
+
+async def _generate_stream(prompt: str, timeout: float | None = None, system_instruction: str | None = None):
+    """Stream text deltas from the async Gemini client, holding one concurrency slot for the whole stream.
+
+    Each chunk must arrive within the per-attempt timeout (cut to the request deadline).
+    Streams are not retried, since part of the reply may already be on its way to the client;
+    their outcome still feeds the circuit breaker as in _with_policy.
+    """
+    _call_stats["calls"] += 1
+    own_timeout = timeout or settings.LLM_TIMEOUT_SECONDS
+    timeout = _attempt_timeout(timeout)
+    deadline_capped = timeout < own_timeout
+    if not _breaker.allow():
+        _call_stats["breaker_rejections"] += 1
+        raise CircuitOpenError("Gemini circuit breaker is open")
+    probe = _breaker.is_probing()
+    started = time.monotonic()
+    try:
+        async with _get_semaphore():
+            if _backend is not None:
+                stream = _backend.generate_stream(prompt, system_instruction)
+            else:
+                config = await _content_config(None, system_instruction)
+                stream = await asyncio.wait_for(
+                    _get_client().aio.models.generate_content_stream(model=GEMINI_MODEL, contents=prompt, config=config),
+                    timeout=timeout,
+                )
+            iterator = stream.__aiter__()
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(iterator.__anext__(), timeout=timeout)
+                except StopAsyncIteration:
+                    break
+                text = chunk if isinstance(chunk, str) else chunk.text
+                if text:
+                    yield text
+    except Exception as e:
+        if _is_backend_failure(e, deadline_capped):
+            _breaker.record(False)
+        _call_stats["failures"] += 1
+        _call_stats["timeouts" if isinstance(e, TimeoutError) else "errors"] += 1
+        raise
+    finally:
+        # Also reached when the consumer cancels or closes the stream early
+        if probe:
+            _breaker.release_probe()
+    _breaker.record(True)
+    _call_stats["successes"] += 1
+    _latencies_ms.append((time.monotonic() - started) * 1000)
+
+# Conversation replies used while the circuit breaker is open
+CANNED_REPLIES = [
+    "Sorry, I didn't quite catch that. Could you tell me a bit more?",
+    "That's interesting! Can you say more about it?",
+    "Hmm, let me think about that. What do you think about it yourself?",
+]
+
+# A sentence ends at terminal punctuation (plus any closing quote/bracket) followed by whitespace
+_SENTENCE_END_RE = re.compile(r"""[.!?…]+["')\]]*\s+""")
+
+async def _stream_reply_sentences(name: str, prompt: str, system_instruction: str | None = None):
+    """Yield a streamed reply in sentence-sized chunks, ready to hand to TTS as they complete.
+
+    Errors before anything was sent yield the same "[AI ...]" text as the non-streaming
+    replies; an error mid-stream ends the reply with what was already sent.
+    """
+    if not _get_client():
+        logger.error(f"{name}: Gemini client not initialized — check GOOGLE_API_KEY.")
+        yield "[AI unavailable: API key missing]"
+        return
+
+    buffer, sent = "", False
+    try:
+        async for delta in _generate_stream(prompt, system_instruction=system_instruction):
+            buffer += delta
+            end = 0
+            for match in _SENTENCE_END_RE.finditer(buffer):
+                end = match.end()
+            if end:
+                sentence, buffer = buffer[:end].strip(), buffer[end:]
+                if sentence:
+                    sent = True
+                    yield sentence
+    except CircuitOpenError:
+        logger.warning(f"{name}: Gemini circuit breaker is open, using a canned reply")
+        if not sent:
+            yield random.choice(CANNED_REPLIES)
+            return
+    except TimeoutError:
+        logger.error(f"{name} Gemini stream timed out")
+        if not sent:
+            yield "[AI error: request timed out]"
+            return
+    except Exception as e:
+        logger.error(f"{name} Gemini stream error: {e}")
+        if not sent:
+            yield f"[AI error: {str(e)}]"
+            return
+    if buffer.strip():
+        yield buffer.strip()
+
+async def get_gemini_response(prompt: str, timeout: float | None = None) -> str | None:
+    if not _get_client():
+        logger.warning("Gemini client not initialized. Skipping AI call.")
+        return None
+    try:
+        logger.info("Starting Gemini AI call...")
+        text = await _generate(prompt, timeout=timeout)
         logger.info("Gemini AI call completed successfully.")
-        return response.text.strip()
+        return text.strip()
+    except CircuitOpenError:
+        logger.warning("Gemini circuit breaker is open. Skipping AI call.")
+        return None
+    except TimeoutError:
+        logger.error("Gemini call timed out (call timeout or request deadline)")
+        return None
     except Exception as e:
         logger.error(f"Error generating content from Gemini: {e}")
         return None
 
-def generate_hints(topic: str) -> list[str]:
-    raw_response = get_gemini_response(
+async def get_gemini_json(prompt: str, timeout: float | None = None, schema=None):
+    """Like get_gemini_response, but requests JSON output and returns the parsed value (or None).
+
+    `schema` (a pydantic model or genai schema) constrains the output; the result still needs validating.
+    """
+    if not _get_client():
+        logger.warning("Gemini client not initialized. Skipping AI call.")
+        return None
+    try:
+        from google.genai import types
+        config = types.GenerateContentConfig(response_mime_type="application/json", response_schema=schema)
+        text = await _generate(prompt, config, timeout)
+        return json.loads(text)
+    except CircuitOpenError:
+        logger.warning("Gemini circuit breaker is open. Skipping AI call.")
+        return None
+    except TimeoutError:
+        logger.error("Gemini JSON call timed out (call timeout or request deadline)")
+        return None
+    except Exception as e:
+        logger.error(f"Error generating JSON content from Gemini: {e}")
+        return None
+
+# Cached call types -> (TTL seconds, distinct responses kept per prompt)
+_CACHE_POLICIES = {
+    "opening": (settings.LLM_CACHE_TTL_OPENING_SECONDS, settings.LLM_CACHE_VARIANTS),
+    "hints": (settings.LLM_CACHE_TTL_HINTS_SECONDS, 1),
+    "filler": (settings.LLM_CACHE_TTL_FILLER_SECONDS, 1),
+}
+_cache_counters = {"hits": 0, "misses": 0, "expired": 0, "variants_added": 0}
+_variant_fills: set[str] = set()
+_background: set[asyncio.Task] = set()
+
+def llm_cache_key(prompt: str, model: str = GEMINI_MODEL) -> str:
+    """Cache key for a prompt: the model plus the prompt with whitespace normalized."""
+    normalized = " ".join(prompt.split())
+    return model + ":" + hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+async def _cached_call(call_type: str, prompt: str, call=get_gemini_response):
+    """Answer `prompt` from the LLM cache, calling Gemini (via `call`) only on a miss.
+
+    Prompts whose call type keeps several variants get a random cached variant; until the
+    entry holds enough of them, each hit also fetches one more in the background. Failed
+    calls (None) are never cached.
+    """
+    from services.result_cache import llm_cache
+    if not settings.LLM_CACHE_ENABLED:
+        return await call(prompt)
+
+    ttl, max_variants = _CACHE_POLICIES[call_type]
+    key = llm_cache_key(prompt)
+    entry = llm_cache.get(key)
+    if entry is not None and entry["expires_at"] <= time.time():
+        _cache_counters["expired"] += 1
+        llm_cache.delete(key)
+        entry = None
+
+    if entry is None:
+        _cache_counters["misses"] += 1
+
+        async def _first_variant():
+            value = await call(prompt)
+            return None if value is None else {"variants": [value], "expires_at": time.time() + ttl}
+
+        entry = await llm_cache.get_or_compute(key, _first_variant)
+        return entry["variants"][0] if entry else None
+
+    _cache_counters["hits"] += 1
+    if len(entry["variants"]) < max_variants and key not in _variant_fills:
+        _variant_fills.add(key)
+        task = asyncio.create_task(_add_variant(key, prompt, call, max_variants))
+        _background.add(task)
+        task.add_done_callback(_background.discard)
+    return random.choice(entry["variants"])
+
+async def _add_variant(key: str, prompt: str, call, max_variants: int):
+    from services.result_cache import llm_cache
+    try:
+        with no_llm_deadline():
+            value = await call(prompt)
+        entry = llm_cache.get(key)
+        if value is None or entry is None or value in entry["variants"] or len(entry["variants"]) >= max_variants:
+            return
+        llm_cache.set(key, {"variants": entry["variants"] + [value], "expires_at": entry["expires_at"]})
+        _cache_counters["variants_added"] += 1
+    except Exception as e:
+        logger.warning(f"Failed to add a cached response variant: {e}")
+    finally:
+        _variant_fills.discard(key)
+
+def llm_cache_stats() -> dict:
+    from services.result_cache import llm_cache
+    return {**_cache_counters, "store": llm_cache.stats()}
+
+async def generate_hints(topic: str) -> list[str]:
+    raw_response = await _cached_call("hints",
         f"""You are a smart hint generator. Generate 5 concise hints related to the topic "{topic.strip()}".
 Respond strictly with the 5 hints as a numbered list. No extra text.
 
@@ -64,86 +585,126 @@ Example:
                 hints.append(hint)
     return hints
 
-def improve_fluency_by_line(segments: list[dict]) -> list[dict]:
-    lines = [seg["text"].strip() for seg in segments]
-    if not _get_client():
-        return [{"original": line, "improved": line, "boost": 0.0} for line in lines]
-
-    prompt = "Revise the following sentences to sound more fluent and natural while preserving the meaning. Avoid repeating the input. Return each improved sentence on its own line, in the same order:\n\n"
-    for i, line in enumerate(lines, start=1):
-        prompt += f"{i}. {line}\n"
+def _chunk_filler_candidates(candidates: list[dict], token_budget: int) -> list[list[tuple[int, dict]]]:
+    chunks, current, used = [], [], 0
+    for i, candidate in enumerate(candidates):
+        cost = estimate_tokens(candidate["sentence"]) + 16
+        if current and used + cost > token_budget:
+            chunks.append(current)
+            current, used = [], 0
+        current.append((i, candidate))
+        used += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+async def _classify_filler_chunk(chunk: list[tuple[int, dict]]) -> dict[int, bool]:
+    items = [
+        {"id": i, "sentence": c["sentence"], "phrase": c["phrase"], "offset": c["offset"]}
+        for i, c in chunk
+    ]
+    prompt = f"""For each item below, decide whether the phrase at the given character offset of the sentence is used as a conversational filler (a word that adds no meaning).
+For example, in "It was, like, cold," 'like' is a filler. But in "I like cold weather," 'like' is not.
 
-    try:
-        response = get_gemini_response(prompt)
-        improved_lines = response.strip().splitlines() if response else lines
-    except Exception:
-        improved_lines = lines
-
-    result = []
-    for original, improved in zip(lines, improved_lines):
-        score_boost = round(random.uniform(2, 8), 2)
-        result.append({
-            "original": original,
-            "improved": improved.lstrip("1234567890. ").strip(),
-            "boost": score_boost
-        })
-    return result
+Items:
+{json.dumps(items, ensure_ascii=False)}
+
+Respond with a JSON array containing one object per item: {{"id": <item id>, "is_filler": true|false}}."""
+    parsed = await _cached_call("filler", prompt, get_gemini_json)
+    verdicts = {}
+    if isinstance(parsed, list):
+        for entry in parsed:
+            if isinstance(entry, dict) and isinstance(entry.get("id"), int):
+                verdicts[entry["id"]] = bool(entry.get("is_filler"))
+    return verdicts
+
+async def classify_fillers_batch(candidates: list[dict]) -> list[bool | None]:
+    """Classify many filler candidates with as few Gemini round-trips as possible.
+
+    candidates: list of {"sentence": str, "phrase": str, "offset": int}. They are sent as one
+    JSON-structured prompt, split only when FILLER_BATCH_TOKEN_BUDGET would be exceeded; the
+    chunks then run concurrently. Candidates the model doesn't answer for (or every candidate,
+    when Gemini is unavailable) come back as None so the caller can keep its own verdict.
+    """
+    if not candidates or not _get_client():
+        return [None] * len(candidates)
 
-def is_filler_in_context(sentence: str, phrase: str) -> bool:
-    if not _get_client():
-        return False
-    prompt = f"""Analyze the sentence: "{sentence}"
-Is the phrase "{phrase}" used as a conversational filler (a word that adds no meaning)?
-For example, in "It was, like, cold," 'like' is a filler. But in "I like cold weather," 'like' is not.
-Answer with only 'Yes' or 'No'."""
-    try:
-        response = get_gemini_response(prompt)
-        return (response or "").strip().lower() == "yes"
-    except Exception as e:
-        logger.error(f"Gemini filler check error: {e}")
-        return False
+    chunks = _chunk_filler_candidates(candidates, settings.FILLER_BATCH_TOKEN_BUDGET)
+    verdicts: dict[int, bool] = {}
+    for result in await asyncio.gather(*(_classify_filler_chunk(chunk) for chunk in chunks)):
+        verdicts.update(result)
+    return [verdicts.get(i) for i in range(len(candidates))]
 
-def generate_live_opening() -> str:
-    """Generate the system's opening line for a Live conversation."""
-    prompt = """You are starting a casual, friendly real-life English conversation with someone who wants to practice speaking.
+LIVE_OPENING_PROMPT = """You are starting a casual, friendly real-life English conversation with someone who wants to practice speaking.
 Say a natural, short opening line (1-2 sentences) like you would say to someone you just met or are having a daily chat with.
 Keep it simple and open-ended so they have something to respond to.
 Only return the opening line, nothing else."""
-    response = get_gemini_response(prompt)
-    return response if response else "Hey! How's your day going so far?"
 
-def generate_live_reply(conversation_history: list[dict]) -> str:
-    """Generate the system's next reply given the full conversation history.
+async def live_opening_line() -> str | None:
+    """A Gemini-written opening line for a Live conversation, or None if the call failed."""
+    return await _cached_call("opening", LIVE_OPENING_PROMPT)
 
-    conversation_history: list of {"role": "user"|"system", "text": str}
-    """
-    current_client = _get_client()
-    if not current_client:
-        logger.error("generate_live_reply: Gemini client not initialized — check GOOGLE_API_KEY.")
-        return "[AI unavailable: API key missing]"
+async def generate_live_opening() -> str:
+    """Generate the system's opening line for a Live conversation."""
+    response = await live_opening_line()
+    return response if response else "Hey! How's your day going so far?"
 
-    history_text = ""
-    for turn in conversation_history:
-        label = "You" if turn["role"] == "system" else "User"
-        history_text += f"{label}: {turn['text']}\n"
+LIVE_PERSONA = "You are having a casual, friendly real-life English conversation with someone practicing speaking."
 
-    prompt = f"""You are having a casual, friendly real-life English conversation with someone practicing speaking.
-Here is the conversation so far:
+async def summarize_conversation(summary: str, turns: list[dict]) -> str | None:
+    """Fold `turns` into the running conversation `summary`; None if the call failed."""
+    history_text = "\n".join(f"{'You' if t['role'] == 'system' else 'User'}: {t['text']}" for t in turns)
+    prompt = f"""Update the running summary of an English practice conversation between "You" and "User".
 
+Current summary:
+{summary or "(none yet)"}
+
+New turns:
 {history_text}
+
+Return the updated summary in at most {settings.CONVERSATION_SUMMARY_TOKENS * 3 // 4} words. Keep names, facts and topics the conversation may come back to.
+Only return the summary, nothing else."""
+    # Runs in the background after a reply, not within the turn request's deadline
+    with no_llm_deadline():
+        return await get_gemini_response(prompt)
+
+def new_conversation_context(persona: str) -> ConversationContext:
+    """Reply context for a new session, with older turns summarized by Gemini."""
+    return ConversationContext(persona, summarize=summarize_conversation)
+
+def _live_reply_prompt(context: ConversationContext) -> str:
+    return f"""Here is the conversation so far:
+
+{context.render_history()}
+
 Now respond naturally as "You" in 1-2 sentences. Keep it conversational, engaging, and ask a follow-up question or make a comment that keeps the conversation going.
 Only return your reply, nothing else."""
 
+async def generate_live_reply(context: ConversationContext) -> str:
+    """Generate the system's next reply from the session's conversation context."""
+    current_client = _get_client()
+    if not current_client:
+        logger.error("generate_live_reply: Gemini client not initialized — check GOOGLE_API_KEY.")
+        return "[AI unavailable: API key missing]"
+
+    prompt = _live_reply_prompt(context)
+
     try:
-        response = current_client.models.generate_content(
-            model=GEMINI_MODEL,
-            contents=prompt
-        )
-        return response.text.strip()
+        return (await _generate(prompt, system_instruction=context.persona, hedge=settings.LLM_HEDGE_REPLIES)).strip()
+    except CircuitOpenError:
+        logger.warning("generate_live_reply: Gemini circuit breaker is open, using a canned reply")
+        return random.choice(CANNED_REPLIES)
+    except TimeoutError:
+        logger.error("generate_live_reply Gemini call timed out")
+        return "[AI error: request timed out]"
     except Exception as e:
         logger.error(f"generate_live_reply Gemini error: {e}")
         return f"[AI error: {str(e)}]"
 
+def stream_live_reply(context: ConversationContext):
+    """Streaming variant of generate_live_reply: yields the reply sentence by sentence."""
+    return _stream_reply_sentences("generate_live_reply", _live_reply_prompt(context), context.persona)
+
 # ---------------------------------------------------------------------------
 # Companion mode — scenario catalogue & role-aware Gemini functions
 # ---------------------------------------------------------------------------
@@ -221,64 +782,116 @@ def get_all_scenarios() -> list[dict]:
 def get_scenario(scenario_id: str) -> dict | None:
     return SCENARIOS.get(scenario_id)
 
-def generate_companion_opening(scenario: dict) -> str:
-    """Generate the character's opening line for a Companion scenario."""
-    prompt = f"""{scenario['system_persona']}
+def companion_opening_prompt(scenario: dict) -> str:
+    return f"""{scenario['system_persona']}
 
 Start the conversation with a natural, short opening line (1-2 sentences) that fits your role and the situation.
 Only return the opening line, nothing else."""
-    response = get_gemini_response(prompt)
+
+async def companion_opening_line(scenario: dict) -> str | None:
+    """A Gemini-written in-character opening line for a Companion scenario, or None if the call failed."""
+    return await _cached_call("opening", companion_opening_prompt(scenario))
+
+async def generate_companion_opening(scenario: dict) -> str:
+    """Generate the character's opening line for a Companion scenario."""
+    response = await companion_opening_line(scenario)
     return response if response else "Hello! How can I help you today?"
 
-def generate_companion_reply(scenario: dict, conversation_history: list[dict]) -> str:
-    """Generate the character's next reply staying in role."""
+def _companion_reply_prompt(context: ConversationContext) -> str:
+    return f"""Here is the conversation so far:
+{context.render_history()}
+
+Stay strictly in character. Respond naturally as "You" in 1-2 sentences. Keep the conversation going.
+Only return your reply, nothing else."""
+
+async def generate_companion_reply(context: ConversationContext) -> str:
+    """Generate the character's next reply staying in role (the scenario persona is the context's prefix)."""
     current_client = _get_client()
     if not current_client:
         logger.error("generate_companion_reply: Gemini client not initialized — check GOOGLE_API_KEY.")
         return "[AI unavailable: API key missing]"
 
-    history_text = ""
-    for turn in conversation_history:
-        label = "You" if turn["role"] == "system" else "User"
-        history_text += f"{label}: {turn['text']}\n"
-
-    prompt = f"""{scenario['system_persona']}
-
-Here is the conversation so far:
-{history_text}
-Stay strictly in character. Respond naturally as "You" in 1-2 sentences. Keep the conversation going.
-Only return your reply, nothing else."""
+    prompt = _companion_reply_prompt(context)
 
     try:
-        response = current_client.models.generate_content(
-            model=GEMINI_MODEL,
-            contents=prompt
-        )
-        return response.text.strip()
+        return (await _generate(prompt, system_instruction=context.persona, hedge=settings.LLM_HEDGE_REPLIES)).strip()
+    except CircuitOpenError:
+        logger.warning("generate_companion_reply: Gemini circuit breaker is open, using a canned reply")
+        return random.choice(CANNED_REPLIES)
+    except TimeoutError:
+        logger.error("generate_companion_reply Gemini call timed out")
+        return "[AI error: request timed out]"
     except Exception as e:
         logger.error(f"generate_companion_reply Gemini error: {e}")
         return f"[AI error: {str(e)}]"
 
-def generate_report_summary_text(transcript: str, overall_score: float, grammar_score: float, vocabulary_score: float, fluency_score: float, pronunciation_score: float, filler_word_score: float) -> list[str]:
+def stream_companion_reply(context: ConversationContext):
+    """Streaming variant of generate_companion_reply: yields the reply sentence by sentence."""
+    return _stream_reply_sentences("generate_companion_reply", _companion_reply_prompt(context), context.persona)
+
+def _parse_session_feedback(data, line_count: int) -> tuple[dict[int, str], list[str] | None]:
+    """Validate a session feedback response field by field.
+
+    Returns the improvements by segment index (malformed or out-of-range entries are
+    dropped individually) and the summary points, or None if they are unusable.
+    """
+    from pydantic import ValidationError
+    from models.schemas import LineImprovement
+    if not isinstance(data, dict):
+        return {}, None
+
+    improvements = {}
+    for item in data.get("improvements") or []:
+        try:
+            entry = LineImprovement.model_validate(item)
+        except ValidationError:
+            continue
+        if 0 <= entry.index < line_count and entry.improved.strip():
+            improvements[entry.index] = entry.improved.strip()
+
+    points = data.get("summary_points")
+    if isinstance(points, list):
+        points = [p.strip() for p in points if isinstance(p, str) and p.strip()]
+    return improvements, (points[:3] if points else None)
+
+async def generate_session_feedback(segments: list[dict], transcript: str, overall_score: float, grammar_score: float, vocabulary_score: float, fluency_score: float, pronunciation_score: float, filler_word_score: float) -> tuple[list[dict], list[str]]:
+    """Line improvements and the 3-point summary for a finished evaluation in one structured call.
+
+    Improvements are keyed by segment index, so merged or skipped lines only affect
+    themselves: a line without a valid improvement is returned unchanged, and a missing
+    summary gets the same placeholder as a failed summary call.
+    """
+    from models.schemas import SessionFeedback
+    lines = [seg["text"].strip() for seg in segments]
     if not _get_client():
-        return ["AI summary skipped: Gemini client not available."]
+        return [{"original": line, "improved": line, "boost": 0.0} for line in lines], ["AI summary skipped: Gemini client not available."]
 
-    prompt = f"""Generate a concise 3-point summary for a speech analysis report.
+    numbered = "\n".join(f"{i}: {line}" for i, line in enumerate(lines) if line)
+    prompt = f"""You are giving feedback on a spoken English session.
 The speaker's overall performance was {overall_score}%.
 Grammar: {grammar_score}%, Vocabulary: {vocabulary_score}%, Fluency: {fluency_score}%, Pronunciation: {pronunciation_score}%, Filler Words: {filler_word_score}%.
 Here is the transcript:
 "{transcript}"
 
-Provide a summary that highlights key strengths and areas for improvement based on the scores and transcript.
-Format the summary as a numbered list (1. ... 2. ... 3. ...).
-Each point should be a short, actionable insight or observation."""
+1. "improvements": for each numbered line below, revise it to sound more fluent and natural while preserving the meaning. Return one entry per line with its number as "index" and the revision as "improved".
+2. "summary_points": exactly 3 short, actionable insights that highlight key strengths and areas for improvement based on the scores and transcript.
 
-    try:
-        summary_text = get_gemini_response(prompt)
-        if summary_text:
-            points = re.split(r"^\d+\.\s*", summary_text, flags=re.MULTILINE)
-            return [p.strip() for p in points if p.strip()]
-        return ["No summary available due to API error."]
-    except Exception as e:
-        logger.error(f"Error generating report summary: {e}")
-        return ["Error generating summary due to API error."]
+Lines:
+{numbered}"""
+
+    data = await get_gemini_json(prompt, schema=SessionFeedback)
+    improvements, summary_points = _parse_session_feedback(data, len(lines))
+    if data is not None and (summary_points is None or len(improvements) < sum(1 for line in lines if line)):
+        logger.warning(f"Session feedback incomplete: {len(improvements)}/{len(lines)} lines, summary {'ok' if summary_points else 'missing'}")
+
+    improved_lines = []
+    for i, original in enumerate(lines):
+        improved = improvements.get(i)
+        improved_lines.append({
+            "original": original,
+            "improved": improved or original,
+            "boost": round(random.uniform(2, 8), 2) if improved else 0.0
+        })
+    if summary_points is None:
+        summary_points = ["No summary available due to API error."]
+    return improved_lines, summary_points
@@ -0,0 +1,31 @@
+from services.conversation_context import estimate_tokens
+
+
+class FakeLLMBackend:
+    """In-process stand-in for Gemini, for tests and offline development.
+
+    Install with `services.llm.set_llm_backend(FakeLLMBackend())`. Every call is recorded with
+    its prompt, system instruction and estimated token counts, so tests can assert on prompt
+    sizes (e.g. that conversation prompts stay bounded as a session grows).
+    """
+
+    def __init__(self, respond=None):
+        # respond(prompt, system_instruction) -> reply text
+        self.respond = respond or (lambda prompt, system_instruction: "That sounds interesting! Tell me more?")
+        self.calls: list[dict] = []
+
+    def _record(self, prompt: str, system_instruction: str | None) -> str:
+        self.calls.append({
+            "prompt": prompt,
+            "system_instruction": system_instruction,
+            "prompt_tokens": estimate_tokens(prompt),
+            "prefix_tokens": estimate_tokens(system_instruction) if system_instruction else 0,
+        })
+        return self.respond(prompt, system_instruction)
+
+    async def generate(self, prompt: str, system_instruction: str | None = None) -> str:
+        return self._record(prompt, system_instruction)
+
+    async def generate_stream(self, prompt: str, system_instruction: str | None = None):
+        for word in self._record(prompt, system_instruction).split(" "):
+            yield word + " "
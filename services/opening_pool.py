@@ -0,0 +1,103 @@
+import asyncio
+import logging
+from collections import deque
+from config.settings import Settings
+
+settings = Settings()
+logger = logging.getLogger(__name__)
+
+LIVE_POOL = "live"
+
+# pool key ("live" or a scenario id) -> opening lines ready to hand out
+_pools: dict[str, deque[str]] = {}
+_wakeup: asyncio.Event | None = None
+_task: asyncio.Task | None = None
+
+
+def _pool_keys() -> list[str]:
+    from services.llm import SCENARIOS
+    return [LIVE_POOL, *SCENARIOS]
+
+
+async def _fetch_opening(key: str) -> str | None:
+    """A fresh opening line straight from Gemini; the LLM cache would keep returning its stored variants."""
+    from services.llm import LIVE_OPENING_PROMPT, companion_opening_prompt, get_gemini_response, get_scenario
+    prompt = LIVE_OPENING_PROMPT if key == LIVE_POOL else companion_opening_prompt(get_scenario(key))
+    return await get_gemini_response(prompt)
+
+
+def _normalize(line: str) -> str:
+    return " ".join(line.lower().split())
+
+
+def take_opening(key: str) -> str | None:
+    """Pop a ready opening line for live mode or a scenario id; None when that pool is empty."""
+    pool = _pools.get(key)
+    line = pool.popleft() if pool else None
+    if _wakeup is not None:
+        _wakeup.set()
+    return line
+
+
+async def _fill(key: str) -> bool:
+    """Top up one pool with distinct lines; False if Gemini failed.
+
+    Lines already in the pool are skipped. After OPENING_POOL_SIZE of those in one refill the
+    pool is left short until the next refill rather than calling Gemini again and again.
+    """
+    pool = _pools.setdefault(key, deque())
+    duplicates = 0
+    while len(pool) < settings.OPENING_POOL_SIZE and duplicates < settings.OPENING_POOL_SIZE:
+        line = await _fetch_opening(key)
+        if not line:
+            return False
+        if _normalize(line) in {_normalize(ready) for ready in pool}:
+            duplicates += 1
+            continue
+        pool.append(line)
+    return True
+
+
+async def _run():
+    while True:
+        _wakeup.clear()
+        results = await asyncio.gather(*(_fill(key) for key in _pool_keys()), return_exceptions=True)
+        if all(result is True for result in results):
+            await _wakeup.wait()
+        else:
+            # Gemini is failing or unavailable; don't hammer it, start routes fall back meanwhile
+            logger.warning(f"Opening pool refill incomplete, retrying in {settings.OPENING_POOL_RETRY_SECONDS}s")
+            await asyncio.sleep(settings.OPENING_POOL_RETRY_SECONDS)
+
+
+def start_opening_pool():
+    """Keep OPENING_POOL_SIZE opening lines ready per pool, refilled in the background as they're taken."""
+    global _wakeup, _task
+    from services.llm import _get_client
+    if settings.OPENING_POOL_SIZE <= 0 or _task is not None:
+        return
+    if not _get_client():
+        logger.info("Opening pool disabled: Gemini client not available")
+        return
+    _wakeup = asyncio.Event()
+    _task = asyncio.create_task(_run())
+
+
+async def stop_opening_pool():
+    global _wakeup, _task
+    if _task is None:
+        return
+    _task.cancel()
+    try:
+        await _task
+    except asyncio.CancelledError:
+        pass
+    _task = None
+    _wakeup = None
+
+
+def opening_pool_stats() -> dict:
+    return {
+        "running": _task is not None and not _task.done(),
+        "ready": {key: len(pool) for key, pool in _pools.items()},
+    }
@@ -0,0 +1,187 @@
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+from config.settings import Settings
+
+settings = Settings()
+logger = logging.getLogger(__name__)
+
+
+def audio_cache_key(audio_bytes: bytes, *parts: str) -> str:
+    """Content address for a clip: sha256 of the audio plus whatever versions the result depends on."""
+    digest = hashlib.sha256(audio_bytes).hexdigest()
+    return ":".join([digest, *parts])
+
+
+class ResultCache:
+    """Two-tier cache for JSON-serializable results.
+
+    An in-memory LRU sits in front of an optional SQLite table whose total payload size
+    is capped; the least recently used rows are evicted first. `get_or_compute` also
+    de-duplicates concurrent misses so only one computation runs per key.
+    """
+
+    def __init__(self, name: str, max_items: int, db_path: str | None = None, max_db_bytes: int = 0):
+        self.name = name
+        self.max_items = max(1, max_items)
+        self.max_db_bytes = max_db_bytes
+        self._memory: OrderedDict[str, Any] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        self._db_bytes = 0
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+        if db_path:
+            try:
+                self._db = sqlite3.connect(db_path, check_same_thread=False)
+                self._db.execute(
+                    f"CREATE TABLE IF NOT EXISTS {self.name} "
+                    "(key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, accessed_at REAL NOT NULL)"
+                )
+                self._db.execute(f"CREATE INDEX IF NOT EXISTS {self.name}_accessed ON {self.name} (accessed_at)")
+                self._db.commit()
+                self._db_bytes = self._db.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self.name}").fetchone()[0]
+            except Exception as e:
+                logger.error(f"Failed to open result cache database {db_path}: {e}")
+                self._db = None
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+            value = self._db_get(key)
+            if value is not None:
+                self.disk_hits += 1
+                self._memory_put(key, value)
+            return value
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._memory_put(key, value)
+            self._db_put(key, value)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._memory.pop(key, None)
+            if self._db is None:
+                return
+            try:
+                row = self._db.execute(f"SELECT size FROM {self.name} WHERE key = ?", (key,)).fetchone()
+                if row:
+                    self._db.execute(f"DELETE FROM {self.name} WHERE key = ?", (key,))
+                    self._db.commit()
+                    self._db_bytes -= row[0]
+            except Exception as e:
+                logger.warning(f"Result cache delete failed ({self.name}): {e}")
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.create_task(self._compute_and_store(key, compute))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        # Shielded so one caller disconnecting doesn't cancel the work the others wait on
+        return await asyncio.shield(task)
+
+    async def _compute_and_store(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        value = await compute()
+        if value is not None:
+            self.set(key, value)
+        return value
+
+    def _memory_put(self, key: str, value: Any):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def _db_get(self, key: str) -> Any | None:
+        if self._db is None:
+            return None
+        try:
+            row = self._db.execute(f"SELECT value FROM {self.name} WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._db.execute(f"UPDATE {self.name} SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+            return json.loads(row[0])
+        except Exception as e:
+            logger.warning(f"Result cache read failed ({self.name}): {e}")
+            return None
+
+    def _db_put(self, key: str, value: Any):
+        if self._db is None:
+            return
+        try:
+            payload = json.dumps(value)
+            old = self._db.execute(f"SELECT size FROM {self.name} WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                f"INSERT OR REPLACE INTO {self.name} (key, value, size, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, payload, len(payload), time.time()),
+            )
+            self._db_bytes += len(payload) - (old[0] if old else 0)
+            self._evict()
+            self._db.commit()
+        except Exception as e:
+            logger.warning(f"Result cache write failed ({self.name}): {e}")
+
+    def _evict(self):
+        if self.max_db_bytes <= 0:
+            return
+        while self._db_bytes > self.max_db_bytes:
+            rows = self._db.execute(
+                f"SELECT key, size FROM {self.name} ORDER BY accessed_at LIMIT 32"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self._db.execute(f"DELETE FROM {self.name} WHERE key = ?", (key,))
+                self._db_bytes -= size
+                if self._db_bytes <= self.max_db_bytes:
+                    break
+
+    def stats(self) -> dict:
+        return {
+            "memory_items": len(self._memory),
+            "disk_bytes": self._db_bytes if self._db is not None else None,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+        }
+
+
+def _make_cache(name: str) -> ResultCache:
+    return ResultCache(
+        name,
+        max_items=settings.RESULT_CACHE_MAX_ITEMS,
+        db_path=settings.RESULT_CACHE_DB_PATH,
+        max_db_bytes=settings.RESULT_CACHE_MAX_DB_MB * 1024 * 1024,
+    )
+
+# Transcription segments (compact tuples) and full topical evaluation responses
+transcription_cache = _make_cache("transcriptions")
+evaluation_cache = _make_cache("evaluations")
+# Gemini responses to repeated prompts (openings, hints, filler checks); see services.llm
+llm_cache = _make_cache("llm_responses")
@@ -1,19 +1,24 @@
 import uuid
 import time
 from typing import Optional
+from services.audio_utils import PcmBuffer, decode_audio_pcm, shift_segments
+from services.conversation_context import ConversationContext
 
 # In-memory store: session_id -> session dict
 _sessions: dict[str, dict] = {}
 
-def create_session(name: str, duration_minutes: int) -> str:
+def create_session(name: str, duration_minutes: int, context: Optional[ConversationContext] = None) -> str:
+    """Create a session; `context` is what reply prompts are built from (see services.llm.new_conversation_context)."""
     session_id = str(uuid.uuid4())
     _sessions[session_id] = {
         "name": name,
         "duration_seconds": duration_minutes * 60,
         "started_at": time.time(),
         "turns": [],          # list of {"role": "user"|"system", "text": str}
-        "segments_all": [],   # accumulated Whisper segments across turns
-        "audio_chunks": [],   # raw audio bytes per turn (for pronunciation)
+        "context": context,   # bounded persona + summary + recent turns for reply prompts
+        "segments_all": [],   # accumulated Whisper segments, on the session-wide audio timeline
+        "audio": PcmBuffer(), # user audio of every turn, decoded once and appended on arrival
+        "turn_features": [],  # per-turn scoring inputs, extracted in the background
         "turn_number": 0,
         "ended": False,
     }
@@ -22,14 +27,27 @@ def create_session(name: str, duration_minutes: int) -> str:
 def get_session(session_id: str) -> Optional[dict]:
     return _sessions.get(session_id)
 
-def add_turn(session_id: str, role: str, text: str, segments: list = None, audio_bytes: bytes = None):
+def add_turn(session_id: str, role: str, text: str, segments: list = None, audio_bytes: bytes = None, pcm=None):
+    """Record a turn.
+
+    For user turns, the turn's audio (`pcm`, or `audio_bytes` decoded here when no PCM is
+    given) is appended to the session buffer and its segments are shifted onto the session
+    timeline, so evaluation at the end can start scoring straight away. Returns the turn's
+    segments as stored (shifted onto the session timeline).
+    """
     session = _sessions[session_id]
     session["turns"].append({"role": role, "text": text})
+    if session.get("context") is not None:
+        session["context"].add_turn(role, text)
     session["turn_number"] += 1 if role == "user" else 0
-    if segments:
-        session["segments_all"].extend(segments)
-    if audio_bytes:
-        session["audio_chunks"].append(audio_bytes)
+    if pcm is None and audio_bytes:
+        pcm = decode_audio_pcm(audio_bytes)
+    offset = session["audio"].append(pcm) if pcm is not None else session["audio"].duration
+    if not segments:
+        return []
+    turn_segments = shift_segments(segments, offset)
+    session["segments_all"].extend(turn_segments)
+    return turn_segments
 
 def end_session(session_id: str):
     if session_id in _sessions:
@@ -1,32 +1,36 @@
 import io
 import base64
 
+# Figures are built with the object-oriented API rather than pyplot's global "current figure",
+# so several plots can render at once from executor threads.
+
+def _figure_to_base64(fig) -> str:
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png")
+    buffer.seek(0)
+    base64_image = base64.b64encode(buffer.getvalue()).decode("utf-8")
+    return f"data:image/png;base64,{base64_image}"
+
 def plot_pentagon(scores: list[float]) -> str:
     import numpy as np
-    import matplotlib
-    matplotlib.use("Agg")  # Use a non-GUI backend
-    import matplotlib.pyplot as plt
+    from matplotlib.figure import Figure
     labels = ["Grammar", "Vocabulary", "Fluency", "Pronunciation", "Filler Words"]
     angles = np.linspace(0, 2 * np.pi, len(scores), endpoint=False).tolist()
     scores += scores[:1]
     angles += angles[:1]
 
-    fig, ax = plt.subplots(figsize=(6,6), subplot_kw=dict(polar=True))
+    fig = Figure(figsize=(6,6))
+    ax = fig.add_subplot(projection="polar")
     ax.plot(angles, scores, "o-", linewidth=2)
     ax.fill(angles, scores, alpha=0.25)
     ax.set_thetagrids(np.degrees(angles[:-1]), labels)
-    plt.title("Speaking Score Pentagon")
-    
-    buffer = io.BytesIO()
-    plt.savefig(buffer, format="png")
-    plt.close(fig) # Explicitly close the figure to free up resources
-    buffer.seek(0)
-    base64_image = base64.b64encode(buffer.getvalue()).decode("utf-8")
-    return f"data:image/png;base64,{base64_image}"
+    ax.set_title("Speaking Score Pentagon")
+    return _figure_to_base64(fig)
     
 def plot_fluency_curve(time_points: list[float], wpm_values: list[float]) -> str:
-    import matplotlib.pyplot as plt
-    fig, ax = plt.subplots(figsize=(10, 5)) # Use fig, ax for consistent closing
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=(10, 5))
+    ax = fig.add_subplot()
     ax.plot(time_points, wpm_values, color="blue", linewidth=2)
 
     # Background zones
@@ -39,10 +43,4 @@ def plot_fluency_curve(time_points: list[float], wpm_values: list[float]) -> str
     ax.set_title("Fluency Curve")
     ax.legend()
     ax.grid(True)
-
-    buffer = io.BytesIO()
-    plt.savefig(buffer, format="png")
-    plt.close(fig) # Explicitly close the figure to free up resources
-    buffer.seek(0)
-    base64_image = base64.b64encode(buffer.getvalue()).decode("utf-8")
-    return f"data:image/png;base64,{base64_image}"
+    return _figure_to_base64(fig)
@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import time
+from config.settings import Settings
+
+settings = Settings()
+logger = logging.getLogger(__name__)
+
+_task: asyncio.Task | None = None
+_state = "pending"  # pending -> running -> done
+_components: dict[str, dict] = {}
+_total_seconds: float | None = None
+
+
+def _warm_nlp():
+    """Load the tokenizer and tagger and run one tagging pass through every text scorer."""
+    from core.nlp_resources import load_nlp_resources
+    from core.document import analyze_text
+    from core.grammar import grammar_score_from_doc
+    from core.vocabulary import vocabulary_score_from_doc
+    from core.speech_eval import local_filler_verdicts_from_doc
+    load_nlp_resources()
+    doc = analyze_text("So, I went to the market. It was, like, really busy.")
+    grammar_score_from_doc(doc)
+    vocabulary_score_from_doc(doc)
+    local_filler_verdicts_from_doc(doc)
+
+
+def _warm_audio():
+    """Import numpy and PyAV and decode a short in-memory WAV."""
+    import numpy as np
+    from services.audio_utils import SAMPLE_RATE, decode_audio_pcm, pcm_to_wav_bytes
+    decode_audio_pcm(pcm_to_wav_bytes(np.zeros(SAMPLE_RATE // 10, dtype=np.float32)))
+
+
+def _warm_plots():
+    from services.visualization import plot_pentagon, plot_fluency_curve
+    plot_pentagon([50, 50, 50, 50, 50])
+    plot_fluency_curve([0.0, 1.0], [100.0, 110.0])
+
+
+def _warm_pdf():
+    from reports.pdf_generator import ReportPdf
+    pdf = ReportPdf()
+    pdf.add_page()
+    pdf.set_font("helvetica", "", 12)
+    pdf.cell(0, 10, "warm-up")
+    pdf.output()
+
+
+def _warm_llm():
+    """Make sure the Gemini client exists and import the request types; no call is made."""
+    from services.llm import init_llm
+    from google.genai import types  # noqa: F401
+    init_llm()
+
+
+def warmup_speech(seconds: float = 2.0):
+    """Synthetic voiced audio that passes Whisper's VAD: a harmonic series with a wavering pitch,
+    shaped into syllables at 4 Hz over a little noise. Silence or a pure tone is skipped by the
+    VAD, so the model would never run."""
+    import numpy as np
+    from services.audio_utils import SAMPLE_RATE
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    phase = 2 * np.pi * np.cumsum(140 + 20 * np.sin(2 * np.pi * 3 * t)) / SAMPLE_RATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 25))
+    syllables = 0.5 * (1 - np.cos(2 * np.pi * 4 * t)) / 2 + 0.05
+    signal = 0.2 * voiced * syllables / np.abs(voiced * syllables).max()
+    signal += 0.01 * np.random.default_rng(0).standard_normal(len(t))
+    return signal.astype(np.float32)
+
+
+async def _warm_asr():
+    """One dummy transcription of synthetic speech through the normal ASR path."""
+    from services.audio_utils import transcribe_audio_async
+    await transcribe_audio_async(warmup_speech())
+
+
+# Run in this order; the NLP resources always load, since /ready depends on them
+_WARMERS = {
+    "nlp": _warm_nlp,
+    "audio": _warm_audio,
+    "plots": _warm_plots,
+    "pdf": _warm_pdf,
+    "llm": _warm_llm,
+    "asr": _warm_asr,
+}
+
+
+def warmup_components() -> list[str]:
+    """Components to warm up: "nlp" plus those in WARMUP_COMPONENTS, in _WARMERS order."""
+    if not settings.WARMUP_ENABLED:
+        return ["nlp"]
+    requested = {name.strip() for name in settings.WARMUP_COMPONENTS.split(",") if name.strip()}
+    unknown = requested - _WARMERS.keys()
+    if unknown:
+        logger.warning(f"Ignoring unknown warm-up components: {sorted(unknown)}")
+    return [name for name in _WARMERS if name == "nlp" or name in requested]
+
+
+async def _run():
+    global _state, _total_seconds
+    _state = "running"
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    for name in warmup_components():
+        warmer = _WARMERS[name]
+        start = time.perf_counter()
+        error = None
+        try:
+            if asyncio.iscoroutinefunction(warmer):
+                await warmer()
+            else:
+                await loop.run_in_executor(None, warmer)
+        except Exception as e:
+            # The component is loaded lazily by the first request that needs it instead
+            error = str(e)
+            logger.error(f"Warm-up of {name} failed: {e}")
+        _components[name] = {"seconds": round(time.perf_counter() - start, 3), "error": error}
+        logger.info(f"Warm-up of {name} took {_components[name]['seconds']}s")
+    _total_seconds = round(time.perf_counter() - started, 3)
+    _state = "done"
+    logger.info(f"Warm-up finished in {_total_seconds}s")
+
+
+def start_warmup():
+    """Start the warm-up in the background so /ready can report progress meanwhile."""
+    global _task
+    if _task is None:
+        _task = asyncio.get_running_loop().create_task(_run())
+
+
+async def stop_warmup():
+    global _task
+    if _task is not None and not _task.done():
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+    _task = None
+
+
+def warmup_finished() -> bool:
+    return _state == "done"
+
+
+def warmup_status() -> dict:
+    return {
+        "state": _state,
+        "total_seconds": _total_seconds,
+        "components": dict(_components),
+    }
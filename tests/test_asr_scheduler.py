@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from services import asr_pool, audio_utils
+from services.asr_scheduler import ASRScheduler
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    monkeypatch.setattr(asr_pool, "_pool", None)
+    monkeypatch.setattr(audio_utils, "transcribe_batch_library", lambda clips: [[] for _ in clips])
+    monkeypatch.setattr(audio_utils, "expand_segments", lambda rows: list(rows))
+    sched = ASRScheduler(max_batch_size=4, max_wait_ms=0)
+    yield sched
+    sched._executor.shutdown(wait=False)
+
+
+def test_queued_request_fails_when_runner_dies_and_next_request_restarts_it(scheduler):
+    collect = scheduler._collect_batch
+    calls = {"n": 0}
+
+    async def crashing_collect(batch):
+        calls["n"] += 1
+        if calls["n"] == 1:
+            raise RuntimeError("runner crashed")
+        return await collect(batch)
+
+    scheduler._collect_batch = crashing_collect
+
+    async def scenario():
+        with pytest.raises(RuntimeError, match="runner crashed"):
+            await asyncio.wait_for(scheduler.transcribe("a.wav"), 1)
+        queue = scheduler._queue
+        result = await asyncio.wait_for(scheduler.transcribe("b.wav"), 1)
+        assert scheduler._queue is queue
+        await scheduler.stop()
+        return result
+
+    assert asyncio.run(scenario()) == []
+
+
+def test_stop_fails_waiting_requests(scheduler):
+    async def stalled_dispatch(batch):
+        await asyncio.sleep(10)
+
+    scheduler._dispatch = stalled_dispatch
+    scheduler.max_batch_size = 1
+
+    async def scenario():
+        scheduler._ensure_started()
+        scheduler._in_flight = asyncio.Semaphore(0)
+        waiting = asyncio.create_task(scheduler.transcribe("a.wav"))
+        await asyncio.sleep(0.01)
+        await scheduler.stop()
+        with pytest.raises(RuntimeError, match="stopped"):
+            await asyncio.wait_for(waiting, 1)
+
+    asyncio.run(scenario())
+
+
+def test_scheduler_can_be_reused_on_a_new_event_loop(scheduler):
+    assert asyncio.run(asyncio.wait_for(scheduler.transcribe("a.wav"), 1)) == []
+    assert asyncio.run(asyncio.wait_for(scheduler.transcribe("b.wav"), 1)) == []
@@ -0,0 +1,71 @@
+import asyncio
+import queue
+
+import pytest
+
+from services import audio_utils
+
+
+class RecordingModel:
+    def __init__(self):
+        self.kwargs = []
+
+    def transcribe(self, audio, **kwargs):
+        self.kwargs.append(kwargs)
+        return iter([]), None
+
+
+@pytest.fixture
+def model(monkeypatch):
+    model = RecordingModel()
+    monkeypatch.setattr(audio_utils, "_init_faster_model_if_needed", lambda: model)
+    monkeypatch.setattr(audio_utils.settings, "WHISPER_LANGUAGE", "de")
+    return model
+
+
+def test_compact_transcription_passes_the_language(model):
+    audio_utils.transcribe_audio_compact("clip.wav")
+    assert model.kwargs[0]["language"] == "de"
+
+
+def test_streamed_transcription_passes_the_language(model):
+    out_queue = queue.Queue()
+    audio_utils.transcribe_audio_stream_to_queue("clip.wav", out_queue)
+    assert model.kwargs[0]["language"] == "de"
+    assert out_queue.get_nowait() is None
+
+
+def _collect(audio_bytes=None):
+    async def run():
+        return [seg async for seg in audio_utils.transcribe_audio_stream("clip.wav", audio_bytes)]
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def no_pool(monkeypatch):
+    from services import asr_pool
+    monkeypatch.setattr(asr_pool, "_pool", None)
+    monkeypatch.setattr(audio_utils, "STREAM_POLL_SECONDS", 0.05)
+
+
+def test_stream_fails_instead_of_hanging_when_the_worker_dies(no_pool, monkeypatch):
+    def crash(audio, out_queue):
+        raise RuntimeError("worker died")
+    monkeypatch.setattr(audio_utils, "transcribe_audio_stream_to_queue", crash)
+
+    with pytest.raises(RuntimeError, match="worker died"):
+        _collect()
+
+
+def test_stream_fails_when_the_worker_never_ends_the_stream(no_pool, monkeypatch):
+    monkeypatch.setattr(audio_utils, "transcribe_audio_stream_to_queue", lambda audio, out_queue: None)
+
+    with pytest.raises(RuntimeError, match="without ending"):
+        _collect()
+
+
+def test_streamed_and_batched_transcriptions_are_cached_apart(monkeypatch):
+    monkeypatch.setattr(audio_utils.settings, "ASR_BATCHING_ENABLED", True)
+    assert audio_utils.transcription_cache_key(b"clip") != audio_utils.transcription_cache_key(b"clip", "sequential")
+    monkeypatch.setattr(audio_utils.settings, "ASR_BATCHING_ENABLED", False)
+    assert audio_utils.transcription_cache_key(b"clip") == audio_utils.transcription_cache_key(b"clip", "sequential")
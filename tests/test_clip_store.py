@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from services import clip_store
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def store(monkeypatch):
+    monkeypatch.setattr(clip_store, "_evaluations", clip_store.OrderedDict())
+    monkeypatch.setattr(clip_store, "_clip_cache", clip_store.OrderedDict())
+    monkeypatch.setattr(clip_store, "_stored_bytes", 0)
+    monkeypatch.setattr(clip_store.settings, "CLIP_STORE_MAX_EVALUATIONS", 100)
+    monkeypatch.setattr(clip_store.settings, "CLIP_STORE_MAX_MB", 2)
+    return clip_store
+
+
+def _audio(mb: float):
+    # 16-bit storage: two bytes per sample
+    return np.zeros(int(mb * MB) // 2, dtype=np.float32)
+
+
+def test_byte_budget_evicts_least_recently_used_evaluations(store):
+    first = store.save_evaluation_audio(_audio(0.8), [("hi", 0, 100)])
+    second = store.save_evaluation_audio(_audio(0.8), [("hi", 0, 100)])
+    assert store.get_word_clip(first, 0) is not None  # `first` is now the most recently used
+
+    store.save_evaluation_audio(_audio(0.8), [("hi", 0, 100)])
+
+    assert store.has_evaluation(first)
+    assert not store.has_evaluation(second)
+    assert store.clip_store_stats()["bytes"] <= 2 * MB
+
+
+def test_byte_count_includes_cached_clips_and_drops_them_with_the_evaluation(store):
+    evaluation_id = store.save_evaluation_audio(_audio(0.5), [("hi", 0, 100)], clips={0: b"x" * 1000})
+    assert store.clip_store_stats() == {"evaluations": 1, "clips": 1, "bytes": MB // 2 + 1000}
+
+    store.save_evaluation_audio(_audio(1.9), [("hi", 0, 100)])
+
+    assert not store.has_evaluation(evaluation_id)
+    assert store.clip_store_stats() == {"evaluations": 1, "clips": 0, "bytes": int(1.9 * MB) // 2 * 2}
+
+
+def test_reregistering_an_evaluation_replaces_its_bytes(store):
+    evaluation_id = store.save_evaluation_audio(_audio(0.5), [("hi", 0, 100)])
+    store.save_evaluation_audio(_audio(0.5), [("hi", 0, 100)], evaluation_id=evaluation_id)
+    assert store.clip_store_stats() == {"evaluations": 1, "clips": 0, "bytes": MB // 2}
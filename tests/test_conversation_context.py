@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from services import llm
+from services.conversation_context import estimate_tokens
+from services.llm_fake import FakeLLMBackend
+
+TURNS = 200
+
+
+def _respond(prompt, system_instruction):
+    if prompt.startswith("Update the running summary"):
+        # A long-winded summarizer, so the summary's own cap is exercised too
+        return "The user talked about markets, travel, food and family. " * 60
+    return "That sounds really interesting! What did you enjoy the most about it, and would you go again?"
+
+
+def _user_text(i: int) -> str:
+    return f"On day {i} I went to the market with my sister and we bought apples, bread and some cheese for the picnic."
+
+
+@pytest.fixture
+def fake_backend():
+    backend = FakeLLMBackend(respond=_respond)
+    llm.set_llm_backend(backend)
+    yield backend
+    llm.set_llm_backend(None)
+
+
+def test_long_conversation_prompts_stay_bounded(fake_backend):
+    context = llm.new_conversation_context(llm.LIVE_PERSONA)
+
+    async def run():
+        for i in range(TURNS // 2):
+            context.add_turn("user", _user_text(i))
+            context.add_turn("system", await llm.generate_live_reply(context))
+            if context._compaction is not None:
+                await context._compaction
+
+    asyncio.run(run())
+
+    replies = [c for c in fake_backend.calls if not c["prompt"].startswith("Update the running summary")]
+    summaries = [c for c in fake_backend.calls if c["prompt"].startswith("Update the running summary")]
+    assert len(replies) == TURNS // 2
+    assert summaries
+
+    # The history never exceeds the token budget, so reply prompts stop growing with the session.
+    # In practice compaction keeps it to the summary plus about half the budget of recent turns.
+    settings = llm.settings
+    template_tokens = estimate_tokens(llm._live_reply_prompt(llm.ConversationContext(llm.LIVE_PERSONA)))
+    turn_pair_tokens = estimate_tokens(f"User: {_user_text(TURNS)}") + estimate_tokens(f"You: {_respond('', None)}")
+    prompt_tokens = [c["prompt_tokens"] for c in replies]
+    assert max(prompt_tokens) <= settings.CONVERSATION_TOKEN_BUDGET + template_tokens
+    assert max(prompt_tokens) <= (settings.CONVERSATION_SUMMARY_TOKENS + settings.CONVERSATION_TOKEN_BUDGET // 2
+                                  + turn_pair_tokens + template_tokens + 20)
+    assert all(c["system_instruction"] == llm.LIVE_PERSONA for c in replies)
+
+    stats = context.stats()
+    assert stats["summarized_turns"] + stats["verbatim_turns"] == TURNS
+    assert stats["summarized_turns"] >= TURNS - 20
+    assert llm.settings.CONVERSATION_RECENT_TURNS <= stats["verbatim_turns"] <= 20
+    assert stats["summary_tokens"] <= llm.settings.CONVERSATION_SUMMARY_TOKENS + 1
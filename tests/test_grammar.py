@@ -0,0 +1,54 @@
+import re
+
+import pytest
+
+from core.grammar import scan_patterns
+
+# The per-pattern engine the single scan replaced: every rule run separately with re.findall
+_LEGACY_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'\b(I|we|they|you)\s+(is|was|has)\b',
+    r'\b(he|she|it)\s+(are|were|have)\b',
+    r'\b(everybody|everyone|nobody|someone|anyone)\s+(are|were|have)\b',
+    r"\b(don't|doesn't|didn't|won't|can't|couldn't|wouldn't|shouldn't)\s+\w*\s*\b(no|nothing|nobody|nowhere|neither)\b",
+    r'\b(\w+)\s+\1\b',
+    r'\ba\s+[aeiouAEIOU]\w+',
+    r'\ban\s+[^aeiouAEIOU\s]\w+',
+    r'\btheir\s+(is|was|are|were)\b',
+    r'\byour\s+(is|was|are|were|welcome)\b',
+    r'\bits\s+(a\s+)?(is|was|are|were)\b',
+    r'\b(I|he|she|we|they)\s+(very|really|also|never|always|often)\s+(very|really|also|never|always|often)\b',
+    r'\bdid\s+\w+ed\b',
+    r'\bmore\s+\w+er\b',
+    r'\bmost\s+\w+est\b',
+)]
+
+
+def legacy_count(text: str) -> int:
+    return sum(len(pattern.findall(text)) for pattern in _LEGACY_PATTERNS)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("he he are good", 2),
+    ("I is happy. they they was here.", 3),
+    ("I really really like it. more bigger and most biggest.", 4),
+    ("the the the the", 2),
+    ("She did walked to an house and a apple fell. Their is your welcome.", 5),
+    ("We don't have no time, its a was strange.", 2),
+])
+def test_overlapping_errors_match_the_legacy_engine(text, expected):
+    assert legacy_count(text) == expected
+    assert len(scan_patterns(text)) == expected
+
+
+def test_long_transcript_matches_the_legacy_engine():
+    text = " ".join([
+        "they they was really really happy and more bigger than a elephant.",
+        "I is sure he he are an nice person who did walked home.",
+        "Everyone have their is problems, but we don't need nothing more.",
+    ] * 200)
+    assert len(scan_patterns(text)) == legacy_count(text)
+
+
+def test_matches_report_rule_and_span():
+    text = "he he are good"
+    assert sorted(scan_patterns(text)) == [("repeated_word", 0, 5), ("sva_singular_subject", 3, 9)]
@@ -0,0 +1,164 @@
+import asyncio
+
+import pytest
+
+from services import llm
+from services.llm_fake import FakeLLMBackend
+
+
+class SlowBackend(FakeLLMBackend):
+    async def generate(self, prompt, system_instruction=None):
+        await asyncio.sleep(10)
+        return await super().generate(prompt, system_instruction)
+
+
+@pytest.fixture
+def half_open_breaker(monkeypatch):
+    breaker = llm.CircuitBreaker(window=4, error_rate=0.5, min_calls=2, cooldown=0.0)
+    breaker.record(False)
+    breaker.record(False)
+    assert breaker.state == "open"
+    monkeypatch.setattr(llm, "_breaker", breaker)
+    monkeypatch.setattr(llm.settings, "LLM_MAX_RETRIES", 0)
+    yield breaker
+    llm.set_llm_backend(None)
+
+
+def test_spent_deadline_does_not_hold_the_probe(half_open_breaker):
+    llm.set_llm_backend(FakeLLMBackend(respond=lambda p, s: "ok"))
+
+    async def run():
+        llm.set_llm_deadline(0.1)
+        with pytest.raises(TimeoutError):
+            await llm._generate("hi")
+        llm.set_llm_deadline(None)
+        return await llm._generate("hi")
+
+    assert asyncio.run(run()) == "ok"
+    assert half_open_breaker.state == "closed"
+
+
+def test_cancelled_probe_releases_the_slot(half_open_breaker):
+    async def run():
+        llm.set_llm_backend(SlowBackend())
+        probe = asyncio.ensure_future(llm._generate("hi"))
+        await asyncio.sleep(0.05)
+        assert half_open_breaker.is_probing()
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        llm.set_llm_backend(FakeLLMBackend(respond=lambda p, s: "ok"))
+        return await llm._generate("hi")
+
+    assert asyncio.run(run()) == "ok"
+    assert half_open_breaker.state == "closed"
+
+
+def test_closed_stream_releases_the_slot(half_open_breaker):
+    llm.set_llm_backend(FakeLLMBackend(respond=lambda p, s: "one two three"))
+
+    async def run():
+        stream = llm._generate_stream("hi")
+        await stream.__anext__()
+        await stream.aclose()
+        return await llm._generate("hi")
+
+    assert asyncio.run(run()) == "one two three"
+
+
+class FailingBackend(FakeLLMBackend):
+    def __init__(self, error):
+        super().__init__()
+        self.error = error
+
+    async def generate(self, prompt, system_instruction=None):
+        raise self.error
+
+    async def generate_stream(self, prompt, system_instruction=None):
+        raise self.error
+        yield
+
+
+@pytest.fixture
+def closed_breaker(monkeypatch):
+    breaker = llm.CircuitBreaker(window=4, error_rate=0.5, min_calls=1, cooldown=60.0)
+    monkeypatch.setattr(llm, "_breaker", breaker)
+    monkeypatch.setattr(llm.settings, "LLM_MAX_RETRIES", 0)
+    yield breaker
+    llm.set_llm_backend(None)
+
+
+def _client_error(code):
+    from google.genai import errors
+    return errors.ClientError(code, {"error": {"code": code, "message": "bad", "status": "INVALID_ARGUMENT"}})
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_client_errors_do_not_open_the_breaker(closed_breaker, stream):
+    from google.genai import errors
+    llm.set_llm_backend(FailingBackend(_client_error(400)))
+
+    async def run():
+        with pytest.raises(errors.ClientError):
+            if stream:
+                async for _ in llm._generate_stream("hi"):
+                    pass
+            else:
+                await llm._generate("hi")
+
+    asyncio.run(run())
+    assert closed_breaker.state == "closed"
+
+
+def test_timeout_cut_by_the_callers_deadline_does_not_open_the_breaker(closed_breaker):
+    llm.set_llm_backend(SlowBackend())
+
+    async def run():
+        llm.set_llm_deadline(0.6)
+        with pytest.raises(TimeoutError):
+            await llm._generate("hi", timeout=5)
+
+    asyncio.run(run())
+    assert closed_breaker.state == "closed"
+
+
+@pytest.mark.parametrize("make_error", [lambda: _client_error(429), lambda: RuntimeError("503 unavailable")])
+def test_backend_errors_open_the_breaker(closed_breaker, make_error):
+    llm.set_llm_backend(FailingBackend(make_error()))
+
+    async def run():
+        with pytest.raises(Exception):
+            await llm._generate("hi")
+
+    asyncio.run(run())
+    assert closed_breaker.state == "open"
+
+
+def test_backend_timeout_opens_the_breaker(closed_breaker):
+    llm.set_llm_backend(SlowBackend())
+
+    async def run():
+        with pytest.raises(TimeoutError):
+            await llm._generate("hi", timeout=0.6)
+
+    asyncio.run(run())
+    assert closed_breaker.state == "open"
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_calls_rejected_by_the_breaker_are_counted_alike(closed_breaker, monkeypatch, stream):
+    closed_breaker.record(False)
+    assert closed_breaker.state == "open"
+    monkeypatch.setattr(llm, "_call_stats", dict.fromkeys(llm._call_stats, 0))
+
+    async def run():
+        with pytest.raises(llm.CircuitOpenError):
+            if stream:
+                async for _ in llm._generate_stream("hi"):
+                    pass
+            else:
+                await llm._generate("hi")
+
+    asyncio.run(run())
+    assert llm._call_stats["calls"] == 1
+    assert llm._call_stats["breaker_rejections"] == 1
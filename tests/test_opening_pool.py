@@ -0,0 +1,42 @@
+import asyncio
+import itertools
+
+import pytest
+
+from services import llm, opening_pool
+from services.llm_fake import FakeLLMBackend
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(opening_pool.settings, "OPENING_POOL_SIZE", 3)
+    monkeypatch.setattr(llm.settings, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(opening_pool, "_pools", {})
+    yield opening_pool._pools
+    llm.set_llm_backend(None)
+
+
+def _install(lines):
+    replies = itertools.cycle(lines)
+    backend = FakeLLMBackend(respond=lambda prompt, system_instruction: next(replies))
+    llm.set_llm_backend(backend)
+    return backend
+
+
+def test_fill_bypasses_the_llm_cache_and_skips_duplicates(pool):
+    backend = _install(["Hi there!", "hi  there!", "Lovely weather today, isn't it?", "Hi there!", "What brings you here?"])
+
+    assert asyncio.run(opening_pool._fill(opening_pool.LIVE_POOL))
+
+    assert list(pool[opening_pool.LIVE_POOL]) == ["Hi there!", "Lovely weather today, isn't it?", "What brings you here?"]
+    assert len(backend.calls) == 5
+    assert all(call["prompt"] == llm.LIVE_OPENING_PROMPT for call in backend.calls)
+
+
+def test_fill_stops_when_gemini_keeps_repeating_itself(pool):
+    backend = _install(["Hello! Where are you flying to today?"])
+
+    assert asyncio.run(opening_pool._fill("airport_stranger"))
+
+    assert list(pool["airport_stranger"]) == ["Hello! Where are you flying to today?"]
+    assert len(backend.calls) == 1 + opening_pool.settings.OPENING_POOL_SIZE
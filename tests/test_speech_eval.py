@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from core.speech_eval import filler_probability, gap_rms
+from services.audio_utils import SAMPLE_RATE
+
+
+def test_gap_rms_measures_only_the_gaps():
+    pcm = np.zeros(3 * SAMPLE_RATE, dtype=np.float32)
+    pcm[SAMPLE_RATE:2 * SAMPLE_RATE] = 0.5
+    rms = gap_rms(pcm, [0.0, 1.0, 0.5, 2.5, 2.9], [0.5, 1.5, 1.5, 2.5, 4.0])
+    np.testing.assert_allclose(rms, [0.0, 0.5 * 32768, np.sqrt(0.125) * 32768, 0.0, 0.0], rtol=1e-6)
+
+
+def _tokens(*tagged):
+    """(token, tag, offset) triples, offsets as if joined by single spaces."""
+    tokens, offset = [], 0
+    for token, tag in tagged:
+        tokens.append((token, tag, offset))
+        offset += len(token) + 1
+    return tokens
+
+
+@pytest.mark.parametrize("phrase, tagged, index, expected", [
+    # "like" as a verb or comparison vs. set off by commas
+    ("like", [("I", "PRP"), ("like", "VBP"), ("cold", "JJ"), ("weather", "NN")], 1, 0.1),
+    ("like", [("It", "PRP"), ("was", "VBD"), (",", ","), ("like", "IN"), (",", ","), ("cold", "JJ")], 3, 0.95),
+    ("like", [("It", "PRP"), ("looks", "VBZ"), ("like", "IN"), ("rain", "NN")], 2, 0.1),
+    ("like", [("It", "PRP"), ("was", "VBD"), ("like", "IN"), ("ten", "CD"), ("dollars", "NNS")], 2, 0.8),
+    # "so" opening a sentence vs. as an intensifier or in a collocation
+    ("so", [("So", "RB"), (",", ","), ("I", "PRP"), ("went", "VBD")], 0, 0.85),
+    ("so", [("I", "PRP"), ("miss", "VBP"), ("you", "PRP"), ("so", "RB"), ("much", "RB")], 3, 0.1),
+    ("so", [("It", "PRP"), ("was", "VBD"), ("so", "RB"), ("cold", "JJ")], 2, 0.15),
+    # "right" as a tag question vs. a literal use
+    ("right", [("Do", "VBP"), ("it", "PRP"), ("right", "RB"), ("now", "RB")], 2, 0.1),
+    ("right", [("You", "PRP"), ("were", "VBD"), ("there", "RB"), (",", ","), ("right", "RB"), ("?", ".")], 4, 0.85),
+    # "you know" bounded vs. followed by its object
+    ("you know", [("You", "PRP"), ("know", "VBP"), (",", ","), ("it", "PRP"), ("was", "VBD"), ("fun", "NN")], 0, 0.9),
+    ("you know", [("Do", "VBP"), ("you", "PRP"), ("know", "VB"), ("what", "WP"), ("happened", "VBD")], 1, 0.15),
+    # "actually"/"basically" as a discourse marker vs. modifying the next word
+    ("actually", [("Actually", "RB"), (",", ","), ("I", "PRP"), ("stayed", "VBD")], 0, 0.85),
+    ("basically", [("It", "PRP"), ("is", "VBZ"), ("basically", "RB"), ("free", "JJ")], 2, 0.3),
+])
+def test_filler_probability(phrase, tagged, index, expected):
+    assert filler_probability(phrase, _tokens(*tagged), index) == pytest.approx(expected)
+
+
+def test_pause_around_an_ambiguous_candidate_raises_the_probability():
+    tokens = _tokens(("So", "RB"), ("I", "PRP"), ("went", "VBD"), ("home", "NN"))
+    assert filler_probability("so", tokens, 0) == pytest.approx(0.55)
+    assert filler_probability("so", tokens, 0, pause_after=0.5) == pytest.approx(0.7)
+    # Confident verdicts are left alone, and the boost never makes a candidate certain
+    literal = _tokens(("I", "PRP"), ("like", "VBP"), ("tea", "NN"))
+    assert filler_probability("like", literal, 1, pause_before=1.0) == pytest.approx(0.1)
+    bounded = _tokens(("It", "PRP"), ("was", "VBD"), (",", ","), ("like", "IN"), (",", ","), ("cold", "JJ"))
+    assert filler_probability("like", bounded, 3, pause_before=1.0) == pytest.approx(0.95)
@@ -0,0 +1,45 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from core.speech_eval import analyze_pauses
+from pipelines.turn_features import turn_audio
+from services.audio_utils import SAMPLE_RATE
+
+
+def _segment(start, end, words):
+    return SimpleNamespace(start=start, end=end, words=[SimpleNamespace(word=w, start=s, end=e) for w, s, e in words])
+
+
+def _session_audio(seconds):
+    rng = np.random.default_rng(0)
+    pcm = np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
+    # Speech-level noise inside the turn's second segment gap, silence elsewhere
+    pcm[int(61.5 * SAMPLE_RATE):int(62.5 * SAMPLE_RATE)] = rng.normal(0, 0.1, SAMPLE_RATE)
+    return pcm
+
+
+def test_turn_slice_gives_the_same_pauses_as_the_session_buffer():
+    pcm = _session_audio(70)
+    segments = [
+        _segment(60.0, 60.8, [("hello", 60.0, 60.3), ("there", 60.4, 60.8)]),
+        _segment(61.2, 61.4, [("so", 61.2, 61.4)]),
+        _segment(62.8, 63.5, [("yes", 62.8, 63.0), ("indeed", 63.1, 63.5)]),
+    ]
+    turn_pcm, offset = turn_audio(segments, pcm)
+
+    assert len(turn_pcm) <= int(3.5 * SAMPLE_RATE) + 1
+    assert offset == 60.0
+    pauses = analyze_pauses(turn_pcm, segments, offset=offset)
+    assert pauses == analyze_pauses(pcm, segments)
+    assert pauses.vocalized_fillers == 1
+
+
+def test_turn_pauses_stay_on_the_session_timeline():
+    pcm = _session_audio(70)
+    segments = [_segment(60.0, 61.0, []), _segment(61.4, 62.7, []), _segment(63.5, 64.0, [])]
+    turn_pcm, offset = turn_audio(segments, pcm)
+
+    pauses = analyze_pauses(turn_pcm, segments, offset=offset)
+    assert [p[:2] for p in pauses.silent_pauses] == [(61.0, 61.4), (62.7, 63.5)]
+    assert pauses.vocalized_fillers == 0
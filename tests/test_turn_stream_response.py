@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+
+from api.routes import _TurnStreamResponse
+
+
+async def _events():
+    yield "event: transcript\ndata: {}\n\n"
+
+
+async def _receive():
+    return {"type": "http.disconnect"}
+
+
+@pytest.mark.parametrize("spec_version", ["2.0", "2.4"])
+def test_temp_upload_is_deleted_when_the_client_disconnects_before_the_body(tmp_path, spec_version):
+    upload = tmp_path / "turn.m4a"
+    upload.write_bytes(b"audio")
+
+    async def send(message):
+        raise OSError("client went away")
+
+    async def run():
+        response = _TurnStreamResponse(_events(), str(upload))
+        with pytest.raises(Exception):
+            await response({"type": "http", "asgi": {"spec_version": spec_version}}, _receive, send)
+
+    asyncio.run(run())
+    assert not upload.exists()
+
+
+def test_temp_upload_is_deleted_after_a_complete_stream(tmp_path):
+    upload = tmp_path / "turn.m4a"
+    upload.write_bytes(b"audio")
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(_TurnStreamResponse(_events(), str(upload))({"type": "http", "asgi": {"spec_version": "2.4"}}, _receive, send))
+    assert sent[-1]["type"] == "http.response.body"
+    assert not upload.exists()
@@ -0,0 +1,67 @@
+import pytest
+
+from core import cefr_lexicon
+from core.vocabulary import vocabulary_profile
+
+TOKENS = ["we", "abandon", "the", "ubiquitous", "plans", "and", "the", "ubiquitous", "ideas"]
+
+
+@pytest.fixture
+def lexicon(monkeypatch, tmp_path):
+    """Install the given CSV rows as the CEFR lexicon index (None: no lexicon installed)."""
+    def install(rows):
+        index_path = tmp_path / "cefr_lexicon.idx"
+        if rows is not None:
+            csv_path = tmp_path / "lexicon.csv"
+            csv_path.write_text("headword,pos,CEFR\n" + "".join(f"{w},noun,{lvl}\n" for w, lvl in rows))
+            cefr_lexicon.build_index(csv_path, index_path)
+        monkeypatch.setattr(cefr_lexicon.settings, "CEFR_INDEX_PATH", str(index_path))
+        monkeypatch.setattr(cefr_lexicon, "_index", None)
+    yield install
+    cefr_lexicon._index = None
+
+
+def test_no_lexicon_reports_no_levels_or_bonus(lexicon):
+    lexicon(None)
+    profile = vocabulary_profile(TOKENS)
+    assert not cefr_lexicon.lexicon_available()
+    assert cefr_lexicon.lexicon_id() == "nocefr"
+    assert profile["cefr_levels"] is None
+    assert profile["advanced_bonus"] == 0
+    assert profile["score"] == profile["ttr"]
+
+
+def test_installed_lexicon_counts_levels_and_adds_the_bonus(lexicon):
+    lexicon([("we", "A1"), ("the", "A1"), ("and", "A1"), ("plan", "A2"), ("idea", "A2"),
+             ("abandon", "B2"), ("ubiquitous", "C2"), ("colour/color", "A1")])
+    profile = vocabulary_profile(TOKENS)
+    assert cefr_lexicon.lexicon_id() == "cefr9"
+    assert profile["cefr_levels"] == {"A1": 4, "A2": 2, "B1": 0, "B2": 1, "C1": 0, "C2": 2, "unlisted": 0}
+    assert profile["advanced_bonus"] == 1
+    assert profile["score"] == min(100, profile["ttr"] + 1)
+
+
+def test_missing_required_lexicon_keeps_the_service_unready(lexicon, monkeypatch):
+    from fastapi.testclient import TestClient
+    from main import app
+    lexicon(None)
+    monkeypatch.setattr(cefr_lexicon.settings, "CEFR_LEXICON_REQUIRED", True)
+
+    response = TestClient(app).get("/ready")
+
+    assert response.status_code == 503
+    assert response.json()["cefr_lexicon"]["ready"] is False
+    assert "not found" in response.json()["cefr_lexicon"]["error"]
+
+
+def test_lexicon_status(lexicon, monkeypatch):
+    lexicon(None)
+    monkeypatch.setattr(cefr_lexicon.settings, "CEFR_LEXICON_REQUIRED", False)
+    assert cefr_lexicon.lexicon_status()["ready"] is True
+
+    monkeypatch.setattr(cefr_lexicon.settings, "CEFR_LEXICON_REQUIRED", True)
+    lexicon([("plan", "A2")])
+    status = cefr_lexicon.lexicon_status()
+    assert status["ready"] is True
+    assert status["words"] == 1
+    assert status["error"] is None
@@ -0,0 +1,8 @@
+from services.audio_utils import _speech_clips
+from services.warmup import warmup_speech
+
+
+def test_asr_warmup_audio_passes_the_vad():
+    clips = _speech_clips(warmup_speech(), 0)
+    assert clips
+    assert clips[-1]["end"] - clips[0]["start"] > 0.5
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from services import clip_store
+
+
+@pytest.fixture
+def clip():
+    evaluation_id = clip_store.save_evaluation_audio(np.linspace(-0.5, 0.5, 1600, dtype=np.float32), [("hello", 0, 800)])
+    client = TestClient(app)
+    url = clip_store.clip_url(evaluation_id, 0)
+    body = client.get(url).content
+    return client, url, body
+
+
+def test_open_ended_range(clip):
+    client, url, body = clip
+    response = client.get(url, headers={"Range": "bytes=100-"})
+    assert response.status_code == 206
+    assert response.headers["content-range"] == f"bytes 100-{len(body) - 1}/{len(body)}"
+    assert response.content == body[100:]
+
+
+@pytest.mark.parametrize("suffix, expected", [(10, slice(-10, None)), (10_000_000, slice(None))])
+def test_suffix_range(clip, suffix, expected):
+    client, url, body = clip
+    response = client.get(url, headers={"Range": f"bytes=-{suffix}"})
+    assert response.status_code == 206
+    assert response.content == body[expected]
+
+
+@pytest.mark.parametrize("header", ["bytes=abc-", "bytes=-", "bytes=20-10", "bytes=1-x", "items=0-10", "bytes=0-1,4-5"])
+def test_malformed_range_is_ignored(clip, header):
+    client, url, body = clip
+    response = client.get(url, headers={"Range": header})
+    assert response.status_code == 200
+    assert response.content == body
+
+
+@pytest.mark.parametrize("header", ["bytes=100000-", "bytes=-0"])
+def test_unsatisfiable_range(clip, header):
+    client, url, body = clip
+    response = client.get(url, headers={"Range": header})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(body)}"
+
+
+def test_end_past_the_clip_is_clamped(clip):
+    client, url, body = clip
+    response = client.get(url, headers={"Range": "bytes=0-999999"})
+    assert response.status_code == 206
+    assert response.content == body